@@ -5,7 +5,10 @@ import pyperclip
 import time
 import threading
 import json
-import os
+import config_store
+from clipboard_monitor import ClipboardMonitor
+from paste_verify import CaptureError, PasteVerifier
+from ui_queue import UiUpdateQueue
 
 # Global color scheme - Modern dark theme with good contrast
 COLORS = {
@@ -40,27 +43,60 @@ class MultiCoordinatesClicker:
         self.start_time = None
         self.completed_count = 0
         self.clipboard_monitoring_enabled = True
-        self.clipboard_monitor_timer = None
         self.last_clipboard_content = ""
-        
-        # Load or create default coordinates
+        # Checks pastes of coordinates with "verify_paste" by diffing screenshots around the target
+        self.paste_verifier = PasteVerifier()
+        
+        # The sequence thread never touches widgets; its updates are drained on the Tk thread
+        self.ui_queue = UiUpdateQueue(self.root)
+        self.ui_queue.register("status", self.update_status)
+        self.ui_queue.register("progress", lambda value: self.progress.config(value=value))
+        self.ui_queue.register("log", self.append_log_entry)
+        self.ui_queue.register("sequence_finished", self.on_sequence_finished)
+        
+        # Load or create default coordinates (the active profile of coordinates_config.json)
+        self.config = None
+        self.profile_name = None
+        self.config_source = None
+        self.config_error = None
         self.coordinates = self.load_coordinates()
         
+        # Polls every second and pauses during a sequence unless the config picks another strategy
+        monitor_error = None
+        try:
+            self.clipboard_monitor = ClipboardMonitor(self.root, self.check_clipboard_for_changes,
+                                                      self.load_monitor_settings(),
+                                                      default_strategy="paused-while-running")
+        except ValueError as e:
+            monitor_error = str(e)
+            self.clipboard_monitor = ClipboardMonitor(self.root, self.check_clipboard_for_changes,
+                                                      default_strategy="paused-while-running")
+        
         self.setup_ui()
+        if self.config_error:
+            self.log_message(f"Could not read the config ({self.config_error}); loaded the "
+                             f"{'backup' if self.config_source == 'backup' else 'default coordinates'}", "WARNING")
+        if monitor_error:
+            self.log_message(f"{monitor_error}; using the default clipboard monitoring", "WARNING")
         
         # Start clipboard monitoring
         self.start_clipboard_monitoring()
         
     def load_coordinates(self):
-        """Load coordinates from config file or create defaults"""
-        try:
-            if os.path.exists('coordinates_config.json'):
-                with open('coordinates_config.json', 'r') as f:
-                    return json.load(f)
-        except:
-            pass
-        
-        # Default coordinates
+        """Load the active profile's coordinates from the config file, or the defaults
+
+        The file may hold a plain list or the profiles object the enhanced app
+        saves; the whole config is kept so saving preserves the other keys.
+        """
+        config, self.config_source, self.config_error = config_store.recover_config()
+        if self.config_source == "defaults":
+            config = config_store.normalize_config(self.default_coordinates())
+        self.config = config
+        self.profile_name = config["active_profile"]
+        return config_store.profile_coordinates(config)
+    
+    def default_coordinates(self):
+        """Default coordinates used when no config file exists"""
         return [
             {"name": "Position 1", "x": -2658, "y": 934, "press_enter_after_paste": True, "delay_after_action": 1.0},
             {"name": "Position 2", "x": -2002, "y": 985, "press_enter_after_paste": True, "delay_after_action": 1.0},
@@ -72,11 +108,21 @@ class MultiCoordinatesClicker:
             {"name": "Position 8", "x": -75, "y": 1766, "press_enter_after_paste": True, "delay_after_action": 1.0}
         ]
     
+    def load_monitor_settings(self):
+        """Return the config file's "clipboard_monitor" settings, if it has any"""
+        return self.config.get("clipboard_monitor")
+    
     def save_coordinates(self):
-        """Save coordinates to config file"""
+        """Save coordinates into their profile, keeping the rest of the config"""
         try:
-            with open('coordinates_config.json', 'w') as f:
-                json.dump(self.coordinates, f, indent=2)
+            # Re-read so profiles and settings saved by the enhanced app meanwhile are kept
+            config, source, error = config_store.recover_config()
+            if source != "config":
+                config = self.config
+            config_store.ensure_coordinate_ids(self.coordinates)
+            config["profiles"][self.profile_name] = self.coordinates
+            config_store.save_config(config)
+            self.config = config
         except Exception as e:
             messagebox.showerror("Save Error", f"Could not save coordinates: {str(e)}")
     
@@ -406,27 +452,26 @@ class MultiCoordinatesClicker:
         
         self.log_message("Application started", "INFO")
     
+    def check_clipboard_for_changes(self):
+        """Check the clipboard once; returns True if new content was shown"""
+        try:
+            current_clipboard = pyperclip.paste()
+            # Only update if content actually changed AND is not empty
+            if (current_clipboard != self.last_clipboard_content and 
+                current_clipboard.strip() != ""):
+                # New content detected, update display
+                self.last_clipboard_content = current_clipboard
+                self.refresh_clipboard_display()
+                self.log_message(f"New clipboard content detected - {len(current_clipboard)} characters", "INFO")
+                self.update_status("📋 New clipboard content detected", "success")
+                return True
+        except Exception as e:
+            # Silently handle clipboard access errors
+            pass
+        return False
+    
     def start_clipboard_monitoring(self):
         """Start monitoring clipboard for changes"""
-        def monitor_clipboard():
-            if self.clipboard_monitoring_enabled:
-                try:
-                    current_clipboard = pyperclip.paste()
-                    # Only update if content actually changed AND is not empty
-                    if (current_clipboard != self.last_clipboard_content and 
-                        current_clipboard.strip() != ""):
-                        # New content detected, update display
-                        self.last_clipboard_content = current_clipboard
-                        self.refresh_clipboard_display()
-                        self.log_message(f"New clipboard content detected - {len(current_clipboard)} characters", "INFO")
-                        self.update_status("📋 New clipboard content detected", "success")
-                except Exception as e:
-                    # Silently handle clipboard access errors
-                    pass
-                
-                # Check again in 1 second for less frequent polling
-                self.clipboard_monitor_timer = self.root.after(1000, monitor_clipboard)
-        
         # Initialize with current clipboard content (only if not empty)
         try:
             current_clipboard = pyperclip.paste()
@@ -442,17 +487,18 @@ class MultiCoordinatesClicker:
             self.show_empty_clipboard_message()
         
         # Start monitoring
-        self.clipboard_monitor_timer = self.root.after(1000, monitor_clipboard)
+        strategy = self.clipboard_monitor.start()
+        self.log_message(f"Clipboard monitoring strategy: {strategy}", "INFO")
     
     def stop_clipboard_monitoring(self):
         """Stop clipboard monitoring"""
         self.clipboard_monitoring_enabled = False
-        if self.clipboard_monitor_timer:
-            self.root.after_cancel(self.clipboard_monitor_timer)
+        self.clipboard_monitor.stop()
     
     def toggle_clipboard_monitoring(self):
         """Toggle clipboard monitoring on/off"""
         if self.clipboard_monitoring_enabled:
+            self.log_message(f"Clipboard monitor: {self.clipboard_monitor.describe()}", "INFO")
             self.stop_clipboard_monitoring()
             self.auto_refresh_btn.config(text="👁️ Monitor: OFF")
             self.update_status("🔄 Clipboard monitoring disabled", "warning")
@@ -464,6 +510,14 @@ class MultiCoordinatesClicker:
             self.update_status("👁️ Clipboard monitoring enabled", "success")
             self.log_message("Clipboard monitoring enabled", "INFO")
     
+    def on_sequence_finished(self):
+        """Reset the controls and resume clipboard monitoring after a run (Tk thread)"""
+        self.submit_btn.config(state="normal")
+        self.stop_btn.config(state="disabled")
+        if self.clipboard_monitor.run_finished():
+            self.log_message("Clipboard monitoring resumed after execution", "INFO")
+        self.log_message(f"Clipboard monitor: {self.clipboard_monitor.describe()}", "DEBUG")
+    
     def show_empty_clipboard_message(self):
         """Show message when clipboard is empty"""
         self.clipboard_text.config(state='normal')
@@ -537,7 +591,7 @@ class MultiCoordinatesClicker:
         """Show coordinate edit dialog"""
         dialog = tk.Toplevel(self.root)
         dialog.title("Edit Coordinate" if index is not None else "Add Coordinate")
-        dialog.geometry("400x320")
+        dialog.geometry("400x360")
         dialog.transient(self.root)
         dialog.grab_set()
         dialog.configure(bg=COLORS['light'])
@@ -573,6 +627,10 @@ class MultiCoordinatesClicker:
         delay_var = tk.StringVar(value=str(self.coordinates[index]["delay_after_action"]) if index is not None else "1.0")
         ttk.Entry(fields_frame, textvariable=delay_var, width=30).grid(row=4, column=1, padx=10, pady=5)
         
+        ttk.Label(fields_frame, text="🔍 Verify paste:", background=COLORS['light'], foreground=COLORS['dark']).grid(row=5, column=0, sticky=tk.W, padx=10, pady=5)
+        verify_var = tk.BooleanVar(value=bool(self.coordinates[index].get("verify_paste")) if index is not None else False)
+        ttk.Checkbutton(fields_frame, variable=verify_var).grid(row=5, column=1, sticky=tk.W, padx=10, pady=5)
+        
         # Get current mouse position button
         def get_mouse_pos():
             try:
@@ -596,7 +654,7 @@ class MultiCoordinatesClicker:
                 dialog.deiconify()
                 messagebox.showerror("Error", f"Failed to capture position: {str(e)}")
         
-        ttk.Button(fields_frame, text="🎯 Get Current Mouse Position", command=get_mouse_pos, style='Info.TButton').grid(row=5, column=0, columnspan=2, pady=10)
+        ttk.Button(fields_frame, text="🎯 Get Current Mouse Position", command=get_mouse_pos, style='Info.TButton').grid(row=6, column=0, columnspan=2, pady=10)
         
         # Buttons Frame
         button_frame = tk.Frame(dialog, bg=COLORS['light'])
@@ -605,13 +663,19 @@ class MultiCoordinatesClicker:
         # Buttons
         def save_coordinate():
             try:
-                coord = {
+                # Keep the id and any other per-coordinate settings of an edited coordinate
+                coord = dict(self.coordinates[index]) if index is not None else {}
+                coord.update({
                     "name": name_var.get(),
                     "x": int(x_var.get()),
                     "y": int(y_var.get()),
                     "press_enter_after_paste": enter_var.get(),
                     "delay_after_action": float(delay_var.get())
-                }
+                })
+                if verify_var.get():
+                    coord["verify_paste"] = True
+                else:
+                    coord.pop("verify_paste", None)
                 
                 if index is not None:
                     self.coordinates[index] = coord
@@ -934,14 +998,16 @@ class MultiCoordinatesClicker:
                 messagebox.showerror("Invalid Input", "Name cannot be empty.")
                 return
             
-            # Update coordinate
-            self.coordinates[index] = {
+            # Update coordinate (the id and per-coordinate settings are kept)
+            coord = dict(self.coordinates[index])
+            coord.update({
                 "name": name,
                 "x": x,
                 "y": y,
                 "press_enter_after_paste": self.quick_enter_var.get(),
                 "delay_after_action": delay
-            }
+            })
+            self.coordinates[index] = coord
             
             self.populate_coordinates()
             self.save_coordinates()
@@ -1004,18 +1070,28 @@ class MultiCoordinatesClicker:
             self.log_message(f"Clipboard refresh error: {str(e)}", "ERROR")
     
     def update_status(self, message, status_type="info"):
-        """Update status with colors"""
+        """Update status with colors (safe to call from any thread)"""
+        if threading.current_thread() is not threading.main_thread():
+            self.ui_queue.post_latest("status", message, status_type)
+            return
         colors = {'success': COLORS['success'], 'error': COLORS['danger'], 'warning': COLORS['warning'], 'info': COLORS['info']}
         color = colors.get(status_type, COLORS['secondary'])
         self.status_container.config(bg=color)
         self.status_label.config(text=message, bg=color, fg=COLORS['dark'])
     
     def log_message(self, message, level="INFO"):
-        """Add message to logs"""
+        """Add message to logs (safe to call from any thread)"""
         import datetime
         timestamp = datetime.datetime.now().strftime("%H:%M:%S")
         log_entry = f"[{timestamp}] {level}: {message}\n"
         
+        if threading.current_thread() is not threading.main_thread():
+            self.ui_queue.post("log", log_entry)
+        else:
+            self.append_log_entry(log_entry)
+    
+    def append_log_entry(self, log_entry):
+        """Append a formatted line to the Logs tab (Tk thread)"""
         # Only log if logs_text widget exists (logs tab has been created)
         if hasattr(self, 'logs_text') and self.logs_text:
             self.logs_text.config(state=tk.NORMAL)
@@ -1047,11 +1123,16 @@ class MultiCoordinatesClicker:
         self.is_running = True
         self.submit_btn.config(state="disabled")
         self.stop_btn.config(state="normal")
+        self.progress.config(maximum=len(self.coordinates), value=0)
         self.start_time = time.time()
         self.completed_count = 0
         
         self.log_message(f"Starting sequence with {len(self.coordinates)} coordinates", "INFO")
         
+        # Pause clipboard monitoring during execution to prevent interference (if configured)
+        if self.clipboard_monitor.run_started():
+            self.log_message("Clipboard monitoring paused during execution", "INFO")
+        
         self.current_thread = threading.Thread(target=self.execute_sequence)
         self.current_thread.daemon = True
         self.current_thread.start()
@@ -1064,18 +1145,31 @@ class MultiCoordinatesClicker:
         self.update_status("🛑 Sequence stopped", "warning")
         self.log_message("Sequence stopped by user", "WARNING")
     
+    def verify_paste(self, coord):
+        """Wait for the paste at coord to change the screen, pasting again while nothing changed"""
+        verifier = self.paste_verifier
+        for attempt in range(1, verifier.attempts + 1):
+            if attempt > 1:
+                self.log_message(f"No change after pasting at {coord['name']}; pasting again "
+                                 f"(attempt {attempt}/{verifier.attempts})", "WARNING")
+                pyautogui.hotkey('ctrl', 'v')
+                time.sleep(0.3)
+            deadline = time.monotonic() + verifier.timeout
+            while self.is_running:
+                if verifier.changed(coord["x"], coord["y"]):
+                    self.log_message(f"Paste verified at {coord['name']} (attempt {attempt}, "
+                                     f"{verifier.last_fraction:.1%} of the region changed)", "DEBUG")
+                    return True
+                if time.monotonic() >= deadline:
+                    break
+                time.sleep(verifier.poll_interval)
+        return False
+    
     def execute_sequence(self):
         """Execute the pasting sequence"""
-        # DISABLE clipboard monitoring during execution to prevent interference
-        monitoring_was_enabled = self.clipboard_monitoring_enabled
-        if monitoring_was_enabled:
-            self.stop_clipboard_monitoring()
-            self.log_message("Clipboard monitoring disabled during execution", "INFO")
-        
         try:
             
             total_coords = len(self.coordinates)
-            self.progress.config(maximum=total_coords)
             
             # Initial delay
             for i in range(3, 0, -1):
@@ -1104,30 +1198,41 @@ class MultiCoordinatesClicker:
                 pyautogui.click(coord["x"], coord["y"])
                 time.sleep(0.5)  # More time for focus
                 
-                # Paste with retry logic
-                paste_success = False
-                for attempt in range(3):  # Try up to 3 times
+                # Paste; hotkey() cannot tell whether the paste landed, so verified
+                # coordinates compare screenshots and paste again while nothing changed
+                verify = coord.get("verify_paste", False)
+                capture_error = None
+                if verify:
                     try:
-                        pyautogui.hotkey('ctrl', 'v')
-                        time.sleep(0.3)  # Wait for paste to complete
-                        paste_success = True
-                        self.log_message(f"Paste successful at {coord['name']} (attempt {attempt + 1})", "DEBUG")
-                        break
-                    except Exception as e:
-                        self.log_message(f"Paste attempt {attempt + 1} failed at {coord['name']}: {str(e)}", "WARNING")
-                        time.sleep(0.2)
+                        self.paste_verifier.capture_before(coord["x"], coord["y"])
+                    except CaptureError as e:
+                        capture_error = e
+                pyautogui.hotkey('ctrl', 'v')
+                time.sleep(0.3)  # Wait for paste to complete
+                paste_success = True
+                if verify and capture_error is None:
+                    try:
+                        paste_success = self.verify_paste(coord)
+                    except CaptureError as e:
+                        capture_error = e
+                if not self.is_running:
+                    return
                 
-                if not paste_success:
-                    self.log_message(f"All paste attempts failed at {coord['name']}", "ERROR")
+                # A failed capture leaves the paste unverified; Enter is still pressed as configured
+                if capture_error is not None:
+                    self.log_message(f"Could not verify the paste at {coord['name']}: {capture_error}", "WARNING")
+                elif not paste_success:
+                    self.log_message(f"Paste not visible at {coord['name']} after "
+                                     f"{self.paste_verifier.attempts} attempts", "ERROR")
                 
-                # Press Enter if configured
-                if coord["press_enter_after_paste"]:
+                # Press Enter if configured (not after a paste that never showed up)
+                if coord["press_enter_after_paste"] and paste_success:
                     time.sleep(0.2)  # More time before enter
                     pyautogui.press('enter')
                     self.log_message(f"Pressed Enter after pasting at {coord['name']}", "DEBUG")
                 
                 self.completed_count += 1
-                self.progress.config(value=index + 1)
+                self.ui_queue.post_latest("progress", index + 1)
                 self.log_message(f"Completed {coord['name']}", "SUCCESS")
                 
                 # Simple delay before next (no complex timer loop)
@@ -1145,14 +1250,9 @@ class MultiCoordinatesClicker:
             self.log_message(f"Error: {str(e)}", "ERROR")
         
         finally:
-            # RE-ENABLE clipboard monitoring if it was enabled before
-            if monitoring_was_enabled:
-                self.start_clipboard_monitoring()
-                self.log_message("Clipboard monitoring re-enabled after execution", "INFO")
-            
             self.is_running = False
-            self.submit_btn.config(state="normal")
-            self.stop_btn.config(state="disabled")
+            # Button reset and monitoring resume happen on the Tk thread
+            self.ui_queue.post("sequence_finished")
 
 def main():
     pyautogui.FAILSAFE = True
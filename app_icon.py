@@ -0,0 +1,104 @@
+"""Application icon, rendered once and cached in the user's cache directory
+
+The icon is drawn with Pillow the first time and saved as PNG (for Tk's
+iconphoto) and ICO (for Windows window icons and shortcuts). Later launches
+load the PNG with tk.PhotoImage, so Pillow is never imported on a normal
+start. Bump ICON_VERSION when the drawing changes to render a new file.
+"""
+import os
+import sys
+import tempfile
+
+APP_DIR_NAME = "MultiCoordinatesClicker"
+ICON_VERSION = 1
+
+
+def cache_dir():
+    """Return the per-user cache directory for the app (not created)"""
+    if sys.platform == 'win32':
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser(r"~\AppData\Local")
+        return os.path.join(base, APP_DIR_NAME, "Cache")
+    if sys.platform == 'darwin':
+        return os.path.join(os.path.expanduser("~/Library/Caches"), APP_DIR_NAME)
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.expanduser("~/.cache")
+    return os.path.join(base, APP_DIR_NAME)
+
+
+def icon_paths(directory=None):
+    """Return the (png, ico) paths of the cached icon"""
+    directory = directory or cache_dir()
+    stem = os.path.join(directory, f"app_icon_v{ICON_VERSION}")
+    return stem + ".png", stem + ".ico"
+
+
+def draw_icon():
+    """Draw the 32x32 app icon (needs Pillow)"""
+    from PIL import Image, ImageDraw
+
+    img = Image.new('RGBA', (32, 32), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(img)
+
+    # Draw background circle
+    draw.ellipse([2, 2, 30, 30], fill='#2C3E50', outline='#3498DB', width=2)
+
+    # Crosshair
+    draw.line([16, 8, 16, 12], fill='#FFFFFF', width=2)
+    draw.line([16, 20, 16, 24], fill='#FFFFFF', width=2)
+    draw.line([8, 16, 12, 16], fill='#FFFFFF', width=2)
+    draw.line([20, 16, 24, 16], fill='#FFFFFF', width=2)
+
+    # Center dot
+    draw.ellipse([14, 14, 18, 18], fill='#E74C3C')
+
+    return img
+
+
+def _save_atomic(image, path, **params):
+    directory = os.path.dirname(path)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".icon-", suffix=os.path.splitext(path)[1])
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            image.save(f, **params)
+        # Another instance may render at the same time; either file is complete
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def ensure_icon_files(directory=None):
+    """Return the (png, ico) paths, rendering the icon only if it is not cached yet"""
+    png_path, ico_path = icon_paths(directory)
+    if os.path.exists(png_path) and os.path.exists(ico_path):
+        return png_path, ico_path
+
+    from PIL import Image
+
+    os.makedirs(os.path.dirname(png_path), exist_ok=True)
+    icon = draw_icon()
+    _save_atomic(icon, png_path, format='PNG')
+    # Create a larger version for ICO file
+    large_icon = icon.resize((64, 64), Image.Resampling.LANCZOS)
+    _save_atomic(large_icon, ico_path, format='ICO', sizes=[(16, 16), (32, 32), (64, 64)])
+    return png_path, ico_path
+
+
+def apply_icon(root):
+    """Set the window icon of a Tk root; returns the PhotoImage (keep a reference to it)"""
+    import tkinter as tk
+
+    png_path, ico_path = ensure_icon_files()
+    photo = tk.PhotoImage(master=root, file=png_path)
+    root.iconphoto(True, photo)
+    if sys.platform == 'win32':
+        # Taskbar and title bar icon
+        root.iconbitmap(ico_path)
+    return photo
+
+
+if __name__ == "__main__":
+    # Render the cached icon ahead of time (used by the shortcut scripts)
+    print(ensure_icon_files()[1])
@@ -0,0 +1,501 @@
+"""Benchmark suite for the sequence engine, clipboard checks and coordinate table
+
+Writes machine-readable JSON so results from two versions can be compared.
+Examples:
+
+    python benchmark.py --output before.json
+    python benchmark.py --suite engine --suite clipboard --quick
+    python benchmark.py --output after.json --compare before.json
+
+Suites:
+    engine     per-step overhead of SequenceRunner with a no-op input backend
+    clipboard  change-check cost for payloads from 1 KB to 50 MB
+    treeview   coordinate table population for 10 to 50k rows
+    startup    time from a fresh interpreter to the first painted window,
+               with a cold and a warm icon cache
+
+The treeview and startup suites need a display; --xvfb starts a private Xvfb
+server when there is none.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from clipboard_digest import ClipboardTracker
+from clipboard_manager import ClipboardManager
+from execution_plan import compile_plan
+from input_backends import InputBackend
+from sequence_runner import SequenceRunner
+from timing_profiles import TimingProfile
+
+SCHEMA_VERSION = 1
+SUITES = ("engine", "clipboard", "treeview", "startup")
+DISPLAY_SUITES = ("treeview", "startup")
+
+# A timing profile with every wait at zero, so only the engine's own work is measured
+ZERO_TIMING = TimingProfile(move_duration=0.0, focus_settle=0.0, clipboard_settle=0.0, pre_enter=0.0,
+                            input_pause=0.0, move_speed=0.0)
+
+ENGINE_STEPS = (100, 1000, 10000)
+CLIPBOARD_SIZES = (1024, 64 * 1024, 1024 * 1024, 10 * 1024 * 1024, 50 * 1024 * 1024)
+TREEVIEW_ROWS = (10, 100, 1000, 10000, 50000)
+
+
+class NullBackend(InputBackend):
+    """Input backend that does nothing, so a run measures only the engine"""
+
+    name = "null"
+
+    def __init__(self):
+        self.clipboard = ""
+        self.clipboard_changes = 0
+        self.token_available = True
+
+    def move_to(self, x, y, duration=0.0, cancel_event=None):
+        pass
+
+    def click(self, x, y):
+        pass
+
+    def hotkey(self, *keys):
+        pass
+
+    def press(self, key):
+        pass
+
+    def copy_to_clipboard(self, text):
+        self.clipboard = text
+        self.clipboard_changes += 1
+
+    def read_clipboard(self):
+        # A real read returns a new string object, whose hash is not cached yet
+        return fresh_copy(self.clipboard)
+
+    def position(self):
+        return (0, 0)
+
+    def clipboard_change_token(self):
+        return self.clipboard_changes if self.token_available else None
+
+
+def fresh_copy(text):
+    """Return an equal string that is a different object (str caches its hash)"""
+    return text.encode('utf-8', 'surrogatepass').decode('utf-8', 'surrogatepass')
+
+
+def measure(function, repeat, setup=None, number=1):
+    """Time function repeat times and return the durations of one call in seconds
+
+    setup, if given, runs untimed before every sample and its result is passed
+    to function. number > 1 averages each sample over that many calls, for
+    operations too quick to time one by one.
+    """
+    durations = []
+    calls = range(number)
+    for _ in range(repeat):
+        argument = setup() if setup is not None else None
+        start = time.perf_counter_ns()
+        if setup is not None:
+            for _ in calls:
+                function(argument)
+        else:
+            for _ in calls:
+                function()
+        durations.append((time.perf_counter_ns() - start) / 1e9 / number)
+    return durations
+
+
+def result(benchmark, params, durations, per=1, per_unit=None, **extra):
+    """Build one result entry; per divides the times into per-item figures"""
+    entry = {
+        "benchmark": benchmark,
+        "params": params,
+        "unit": "s",
+        "repeat": len(durations),
+        "min": min(durations),
+        "median": statistics.median(durations),
+        "mean": statistics.fmean(durations),
+    }
+    if per > 1:
+        entry["per_" + per_unit] = entry["median"] / per
+    entry.update(extra)
+    return entry
+
+
+def make_coordinates(count):
+    """A sequence of count coordinates spread over a 1920x1080 screen"""
+    return [{"id": f"c{i:06d}", "name": f"Position {i+1}", "x": (i * 37) % 1920, "y": (i * 53) % 1080,
+             "press_enter_after_paste": i % 3 == 0, "delay_after_action": 0.0}
+            for i in range(count)]
+
+
+# --- engine ---------------------------------------------------------------
+
+def bench_engine(quick, log):
+    steps_list = ENGINE_STEPS[:2] if quick else ENGINE_STEPS
+    repeat = 5 if quick else 10
+    results = []
+    for steps in steps_list:
+        coordinates = make_coordinates(steps)
+        durations = measure(lambda: compile_plan(coordinates, ZERO_TIMING), repeat)
+        results.append(result("engine.compile_plan", {"steps": steps}, durations, steps, "step"))
+
+        plan = compile_plan(coordinates, ZERO_TIMING)
+        runner = SequenceRunner(NullBackend())
+        summaries = []
+        durations = measure(lambda: summaries.append(runner.run(plan, "payload text", countdown=0)), repeat)
+        if summaries[-1]["completed"] != steps:
+            raise RuntimeError(f"engine run completed {summaries[-1]['completed']} of {steps} steps")
+        results.append(result("engine.run", {"steps": steps}, durations, steps, "step",
+                              clipboard_writes=summaries[-1]["clipboard_writes"]))
+
+        # Batch mode: a different payload at every step
+        passes = [(tuple(f"record {p}-{i}" for i in range(steps)), steps) for p in range(2)]
+        durations = measure(lambda: runner.run(plan, None, countdown=0, passes=passes), repeat)
+        results.append(result("engine.run_batch", {"steps": steps * len(passes)}, durations,
+                              steps * len(passes), "step"))
+        log(f"engine: {steps} steps, {results[-2]['per_step'] * 1e6:.1f} us/step")
+    return results
+
+
+# --- clipboard ------------------------------------------------------------
+
+def make_payload(size):
+    """Text payload of size characters (lines of words, like pasted content)"""
+    line = "The quick brown fox jumps over the lazy dog 0123456789\n"
+    return (line * (size // len(line) + 1))[:size]
+
+
+def bench_clipboard(quick, log):
+    sizes = CLIPBOARD_SIZES[:3] if quick else CLIPBOARD_SIZES
+    results = []
+    for size in sizes:
+        payload = make_payload(size)
+        repeat = 5 if size >= 10 * 1024 * 1024 else 20
+        params = {"bytes": size}
+
+        # GUI monitor: a clipboard read that did not change (re-hash of a fresh string)
+        tracker = ClipboardTracker()
+        tracker.accept(payload)
+        durations = measure(tracker.check, repeat, setup=lambda: fresh_copy(payload))
+        results.append(result("clipboard.tracker_unchanged", params, durations))
+
+        # GUI monitor: new content (hash, strip, JSON sniff)
+        variants = iter(range(repeat))
+        durations = measure(tracker.check, repeat,
+                            setup=lambda: str(next(variants)) + payload[1:])
+        results.append(result("clipboard.tracker_changed", params, durations))
+
+        # Runner: ensure() with a change token (the normal case on Windows and X11)
+        backend = NullBackend()
+        manager = ClipboardManager(backend)
+        manager.set_payload(payload)
+        durations = measure(manager.ensure, repeat, number=1000)
+        results.append(result("clipboard.ensure_token", params, durations))
+
+        # Runner: ensure() without a token (read back and compare fingerprints)
+        backend.token_available = False
+        durations = measure(lambda: manager.ensure(force=True), repeat)
+        median = statistics.median(durations)
+        results.append(result("clipboard.ensure_compare", params, durations,
+                              mb_per_second=size / 1e6 / median if median else None))
+        log(f"clipboard: {size:,} bytes, compare {results[-1]['median'] * 1e3:.3f} ms")
+    return results
+
+
+# --- treeview -------------------------------------------------------------
+
+def find_free_display():
+    for number in range(99, 200):
+        if not os.path.exists(f"/tmp/.X11-unix/X{number}") and not os.path.exists(f"/tmp/.X{number}-lock"):
+            return number
+    return None
+
+
+def start_xvfb():
+    """Start a private Xvfb server and point DISPLAY at it; returns the process or None"""
+    xvfb = shutil.which("Xvfb")
+    number = find_free_display()
+    if xvfb is None or number is None:
+        return None
+    process = subprocess.Popen([xvfb, f":{number}", "-screen", "0", "1920x1080x24", "-nolisten", "tcp"],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        if os.path.exists(f"/tmp/.X11-unix/X{number}"):
+            os.environ["DISPLAY"] = f":{number}"
+            return process
+        if process.poll() is not None:
+            return None
+        time.sleep(0.05)
+    process.terminate()
+    return None
+
+
+def bench_treeview(quick, log):
+    import tkinter as tk
+    from tkinter import ttk
+    from tree_sync import TreeSync
+    # The same row formatting the main window uses
+    from multi_coordinates_clicker_enhanced import MultiCoordinatesClicker
+    row_values = MultiCoordinatesClicker.coordinate_row_values
+
+    row_counts = TREEVIEW_ROWS[:3] if quick else TREEVIEW_ROWS
+    root = tk.Tk()
+    root.geometry("800x600")
+    columns = ("Name", "X", "Y", "Enter", "Delay")
+    results = []
+    try:
+        for rows in row_counts:
+            repeat = 3 if rows >= 10000 else 5
+            coordinates = make_coordinates(rows)
+            params = {"rows": rows}
+
+            def build_rows():
+                return [(coord["id"], row_values(i, coord)) for i, coord in enumerate(coordinates)]
+
+            tree = ttk.Treeview(root, columns=columns, show="headings", height=20)
+            for col in columns:
+                tree.heading(col, text=col)
+            tree.pack(fill="both", expand=True)
+            sync = TreeSync(tree, tags=('coordinate_row',))
+
+            def populate(_=None):
+                sync.sync(build_rows())
+                root.update()
+
+            durations = measure(populate, repeat, setup=lambda: sync.clear() or root.update())
+            results.append(result("treeview.populate", params, durations, rows, "row"))
+
+            durations = measure(populate, repeat)
+            results.append(result("treeview.resync_unchanged", params, durations))
+
+            def edit_one():
+                coordinates[rows // 2]["x"] += 1
+
+            durations = measure(populate, repeat, setup=edit_one)
+            results.append(result("treeview.resync_one_edit", params, durations))
+
+            # Delete and re-insert every row (the table's behaviour before TreeSync)
+            def rebuild():
+                children = tree.get_children()
+                if children:
+                    tree.delete(*children)
+                for iid, values in build_rows():
+                    tree.insert("", "end", iid=iid, values=values, tags=('coordinate_row',))
+                root.update()
+
+            durations = measure(rebuild, repeat)
+            results.append(result("treeview.rebuild", params, durations, rows, "row"))
+            log(f"treeview: {rows:,} rows, populate {results[-4]['median'] * 1e3:.1f} ms")
+
+            tree.destroy()
+    finally:
+        root.destroy()
+    return results
+
+
+# --- startup --------------------------------------------------------------
+
+# Runs in a fresh interpreter; prints the phase timestamps as JSON
+STARTUP_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import tkinter as tk
+import multi_coordinates_clicker_enhanced as app_module
+imported = time.perf_counter()
+root = tk.Tk()
+app = app_module.MultiCoordinatesClicker(root)
+constructed = time.perf_counter()
+deferred = [name for name in ("pyautogui", "pyperclip", "PIL", "numpy") if name not in sys.modules]
+root.update()
+painted = time.perf_counter()
+app.stop_auto_refresh()
+app.config_watcher.stop()
+app.monitor_cache.close()
+app.config_writer.close()
+root.destroy()
+print(json.dumps({"import": imported - start, "construct": constructed - imported,
+                  "first_paint": painted - constructed, "total": painted - start,
+                  "deferred_modules": deferred}))
+"""
+
+# Modules the first window must not wait for
+DEFERRED_MODULES = ("pyautogui", "pyperclip", "PIL", "numpy")
+
+
+def run_startup(workdir, cache):
+    """Start the app once in a new interpreter; returns its phase times"""
+    env = dict(os.environ, XDG_CACHE_HOME=cache, LOCALAPPDATA=cache,
+               PYTHONPATH=os.pathsep.join(filter(None, [os.path.dirname(os.path.abspath(__file__)),
+                                                        os.environ.get("PYTHONPATH")])))
+    started = time.perf_counter()
+    output = subprocess.run([sys.executable, "-c", STARTUP_SCRIPT], cwd=workdir, env=env,
+                            capture_output=True, text=True, timeout=60)
+    elapsed = time.perf_counter() - started
+    if output.returncode != 0:
+        raise RuntimeError(f"app failed to start: {output.stderr.strip().splitlines()[-1:]}")
+    phases = json.loads(output.stdout.strip().splitlines()[-1])
+    phases["process"] = elapsed
+    return phases
+
+
+def bench_startup(quick, log):
+    repeat = 3 if quick else 7
+    results = []
+    # A scratch directory keeps the run away from the user's config and icon cache
+    with tempfile.TemporaryDirectory() as workdir:
+        cache = os.path.join(workdir, "cache")
+        cold = run_startup(workdir, cache)
+        warm = [run_startup(workdir, cache) for _ in range(repeat)]
+
+    for phase in ("import", "construct", "first_paint", "total", "process"):
+        results.append(result(f"startup.{phase}", {"icon_cache": "warm"}, [run[phase] for run in warm]))
+    results.append(result("startup.total", {"icon_cache": "cold"}, [cold["total"]]))
+
+    # Guard the deferred imports: building the window must not load them
+    loaded = [name for name in DEFERRED_MODULES if name not in warm[-1]["deferred_modules"]]
+    results.append({"benchmark": "startup.deferred_imports", "params": {}, "unit": "modules",
+                    "deferred": warm[-1]["deferred_modules"], "loaded_at_startup": loaded})
+    if loaded:
+        log(f"startup: imported at startup although deferred: {', '.join(loaded)}")
+    log(f"startup: first window in {results[3]['median'] * 1e3:.0f} ms "
+        f"(cold icon cache {cold['total'] * 1e3:.0f} ms)")
+    return results
+
+
+# --- runner ---------------------------------------------------------------
+
+def git_commit():
+    try:
+        output = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                timeout=5, cwd=os.path.dirname(os.path.abspath(__file__)))
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return output.stdout.strip() or None
+
+
+def environment():
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "commit": git_commit(),
+    }
+
+
+def run_suites(names, quick, use_xvfb, log):
+    suites = {}
+    xvfb = None
+    try:
+        for name in names:
+            if name in DISPLAY_SUITES and not os.environ.get("DISPLAY") and sys.platform != 'win32':
+                if use_xvfb and xvfb is None:
+                    xvfb = start_xvfb()
+                if not os.environ.get("DISPLAY"):
+                    reason = "no display (use --xvfb with Xvfb installed)"
+                    suites[name] = {"status": "skipped", "reason": reason}
+                    log(f"{name}: skipped, {reason}")
+                    continue
+            bench = {"engine": bench_engine, "clipboard": bench_clipboard, "treeview": bench_treeview,
+                     "startup": bench_startup}[name]
+            try:
+                suites[name] = {"status": "ok", "results": bench(quick, log)}
+            except ImportError as e:
+                suites[name] = {"status": "skipped", "reason": f"missing dependency: {e}"}
+                log(f"{name}: skipped, {e}")
+    finally:
+        if xvfb is not None:
+            xvfb.terminate()
+            xvfb.wait(timeout=5)
+    return suites
+
+
+def result_key(entry):
+    return entry["benchmark"], json.dumps(entry["params"], sort_keys=True)
+
+
+def compare(current, baseline, threshold):
+    """Print best-time ratios against a baseline report; returns the regressed entries
+
+    The best (min) time is compared because it is the least affected by
+    other load on the machine.
+    """
+    old = {}
+    for suite in baseline.get("suites", {}).values():
+        for entry in suite.get("results", ()):
+            old[result_key(entry)] = entry
+
+    regressions = []
+    print(f"{'benchmark':32} {'params':18} {'baseline':>12} {'current':>12} {'ratio':>7}")
+    for suite in current["suites"].values():
+        for entry in suite.get("results", ()):
+            before = old.get(result_key(entry))
+            if before is None or not before["min"]:
+                continue
+            ratio = entry["min"] / before["min"]
+            params = ",".join(f"{k}={v}" for k, v in entry["params"].items())
+            flag = "  slower" if ratio > threshold else ""
+            print(f"{entry['benchmark']:32} {params:18} {before['min']:12.6f} {entry['min']:12.6f} "
+                  f"{ratio:7.2f}{flag}")
+            if ratio > threshold:
+                regressions.append(entry)
+    return regressions
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Benchmark the sequence engine, clipboard checks "
+                                                 "and coordinate table")
+    parser.add_argument("--suite", action="append", choices=SUITES,
+                        help="suite to run; repeat for several (default: all)")
+    parser.add_argument("--quick", action="store_true", help="smaller sizes and fewer repeats")
+    parser.add_argument("--xvfb", action="store_true",
+                        help="start a private Xvfb server for the treeview suite when there is no display")
+    parser.add_argument("--output", help="write the JSON report to this file (default: stdout)")
+    parser.add_argument("--compare", metavar="BASELINE",
+                        help="compare against an earlier JSON report and exit 1 on regressions")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="best-time ratio that counts as a regression (default: %(default)s)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    def log(message):
+        print(message, file=sys.stderr)
+
+    report = {
+        "schema": SCHEMA_VERSION,
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "quick": args.quick,
+        "environment": environment(),
+        "suites": run_suites(args.suite or SUITES, args.quick, args.xvfb, log),
+    }
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + "\n")
+    elif not args.compare:
+        print(text)
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if compare(report, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,214 @@
+"""Headless command-line runner for coordinates_config.json
+
+Runs the same sequence as the GUI's START SEQUENCE button without building
+the Tk window. Examples:
+
+    python clicker_cli.py --payload-file message.txt
+    echo "hello" | python clicker_cli.py --stdin
+    python clicker_cli.py --clipboard --countdown 3
+    python clicker_cli.py --batch records.csv --batch-mode columns
+    python clicker_cli.py --payload-file message.txt --trace run.json
+"""
+import argparse
+import datetime
+import os
+import sys
+
+import config_store
+import payload_sources
+import timing_profiles
+from execution_plan import PlanError, compile_plan
+from input_backends import create_backend
+from job_queue import JobQueue
+from monitor_layout import MonitorLayoutCache
+from paste_verify import PasteVerifier
+from sequence_runner import SequenceRunner
+from tracing import Tracer
+
+
+def log_to_stderr(message, level="INFO"):
+    """Print a log line in the same format as the GUI Logs tab"""
+    timestamp = datetime.datetime.now().strftime("%H:%M:%S")
+    print(f"[{timestamp}] {level}: {message}", file=sys.stderr)
+
+
+def read_payload(args, backend):
+    """Read the text to paste from the selected source"""
+    if args.payload_file:
+        with open(args.payload_file, 'r', encoding=args.encoding) as f:
+            return f.read()
+    if args.stdin:
+        return sys.stdin.read()
+    return backend.read_clipboard()
+
+
+def report_resume_point(args, job):
+    """Tell the user where an interrupted batch can be resumed"""
+    if not args.batch or not job.summaries:
+        return
+    # Only whole passes count, so a resumed run repeats an interrupted pass
+    next_record = args.start_record + job.summaries[-1]["records"]
+    log_to_stderr(f"Resume with --start-record {next_record}", "WARNING")
+
+
+def write_trace(args, tracer):
+    """Export the run's spans if --trace was given"""
+    if not args.trace:
+        return
+    try:
+        tracer.write(args.trace)
+    except OSError as e:
+        log_to_stderr(f"Could not write trace {args.trace}: {e}", "ERROR")
+        return
+    if not args.quiet:
+        log_to_stderr(f"Trace written to {args.trace}: {len(tracer)} spans", "INFO")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Run a Multi Coordinates Clicker sequence without the GUI")
+    parser.add_argument("--config", default=config_store.CONFIG_FILE,
+                        help="coordinates config file (default: %(default)s)")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--payload-file", help="read the text to paste from this file")
+    source.add_argument("--stdin", action="store_true", help="read the text to paste from stdin")
+    source.add_argument("--clipboard", action="store_true", help="paste the current clipboard (default)")
+    source.add_argument("--batch", metavar="FILE",
+                        help="stream many payloads from FILE (one record per line, CSV row or JSON line)")
+    parser.add_argument("--encoding", default="utf-8", help="payload file encoding (default: %(default)s)")
+    parser.add_argument("--batch-format", choices=payload_sources.FORMATS,
+                        help="record format of --batch (default: from the file extension, else lines)")
+    parser.add_argument("--batch-mode", default="round-robin", choices=payload_sources.MAPPING_MODES,
+                        help="how records map to coordinates (default: %(default)s)")
+    parser.add_argument("--csv-header", action="store_true",
+                        help="the CSV batch file has a header row; columns map to coordinate names")
+    parser.add_argument("--indexed", action="store_true",
+                        help="memory-map the batch file and keep a line index next to it (FILE.idx)")
+    parser.add_argument("--start-record", type=int, default=0, metavar="N",
+                        help="start the batch at record N, counting from 0 (implies --indexed)")
+    parser.add_argument("--countdown", type=int, default=0,
+                        help="seconds to wait before the first click (default: %(default)s)")
+    parser.add_argument("--profile", help="coordinate profile to run (default: the config's active profile)")
+    parser.add_argument("--repeat", type=int, default=1,
+                        help="run the sequence this many times back to back (default: %(default)s)")
+    parser.add_argument("--timing", help="timing profile, e.g. safe, normal or turbo "
+                                         "(default: the config's active profile)")
+    parser.add_argument("--backend", default="pyautogui", choices=["pyautogui", "recording"],
+                        help="input backend; 'recording' only records events (default: %(default)s)")
+    parser.add_argument("--skip-monitor-check", action="store_true",
+                        help="do not check that every coordinate is on a connected monitor")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="record per-step spans and write them to FILE (Chrome trace JSON, "
+                             "or JSON Lines if FILE ends in .jsonl)")
+    parser.add_argument("--quiet", action="store_true", help="only print errors")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    try:
+        config = config_store.load_config(args.config)
+        timing = timing_profiles.get_profile(config, args.timing)
+        plan = compile_plan(config_store.profile_coordinates(config, args.profile), timing)
+    except PlanError as e:
+        log_to_stderr(f"Invalid coordinates in {args.config}: {e}", "ERROR")
+        return 1
+    except ValueError as e:
+        log_to_stderr(f"Invalid config {args.config}: {e}", "ERROR")
+        return 1
+    except Exception as e:
+        log_to_stderr(f"Could not load {args.config}: {e}", "ERROR")
+        return 1
+
+    # Fail before the countdown if a step would land off-screen
+    if args.backend != "recording" and not args.skip_monitor_check:
+        layout = MonitorLayoutCache(watch=False).get()
+        if layout is not None:
+            problems = layout.validate_plan(plan)
+            for problem in problems:
+                log_to_stderr(problem, "ERROR")
+            if problems:
+                log_to_stderr(f"Monitors: {layout.describe()} (use --skip-monitor-check to run anyway)", "ERROR")
+                return 1
+
+    backend = create_backend(args.backend)
+
+    payload = passes = source = None
+    if args.batch:
+        if args.repeat != 1:
+            log_to_stderr("--repeat cannot be combined with --batch", "ERROR")
+            return 1
+        if not os.path.isfile(args.batch):
+            log_to_stderr(f"Batch file not found: {args.batch}", "ERROR")
+            return 1
+        if args.indexed or args.start_record:
+            try:
+                source = payload_sources.MappedLineSource(args.batch, args.batch_format,
+                                                          args.encoding, args.csv_header)
+                records = source.iter_from(args.start_record)
+            except (OSError, IndexError, ValueError) as e:
+                if source is not None:
+                    source.close()
+                log_to_stderr(f"Could not open batch {args.batch}: {e}", "ERROR")
+                return 1
+            if not args.quiet:
+                action = "Built" if source.index_rebuilt else "Loaded"
+                log_to_stderr(f"{action} index {source.index_path}: {len(source)} records", "INFO")
+        else:
+            # Records are read lazily while the sequence runs
+            records = payload_sources.open_records(args.batch, args.batch_format, args.encoding, args.csv_header)
+        passes = payload_sources.map_records(records, plan, args.batch_mode)
+    else:
+        try:
+            payload = read_payload(args, backend)
+        except Exception as e:
+            log_to_stderr(f"Could not read payload: {e}", "ERROR")
+            return 1
+        if not payload.strip():
+            log_to_stderr("Payload is empty - nothing to paste", "ERROR")
+            return 1
+
+    def on_log(message, level="INFO"):
+        if not args.quiet or level == "ERROR":
+            log_to_stderr(message, level)
+
+    if args.repeat < 1:
+        log_to_stderr("--repeat must be at least 1", "ERROR")
+        return 1
+
+    tracer = Tracer() if args.trace else None
+    # The recording backend never changes the screen, so there is nothing to verify
+    verifier = PasteVerifier() if args.backend != "recording" else None
+    runner = SequenceRunner(backend, on_log=on_log, tracer=tracer, verifier=verifier)
+    jobs = JobQueue(runner)
+    on_log(f"Starting sequence with {len(plan)} coordinates", "INFO")
+    job = jobs.enqueue(args.profile or "active profile", plan, payload,
+                       repetitions=args.repeat, countdown=args.countdown, passes=passes)
+    try:
+        # Poll so Ctrl+C is delivered to the main thread promptly
+        while not jobs.wait_idle(timeout=0.2):
+            pass
+    except KeyboardInterrupt:
+        jobs.stop()
+        jobs.wait_idle(timeout=2)
+        log_to_stderr("Sequence stopped by user", "WARNING")
+        report_resume_point(args, job)
+        return 130
+    finally:
+        if source is not None and not jobs.busy:
+            source.close()
+        if tracer is not None:
+            write_trace(args, tracer)
+
+    if job.status != "done":
+        report_resume_point(args, job)
+        return 1
+    if passes is not None and not args.quiet:
+        summary = job.summaries[-1]
+        log_to_stderr(f"Batch finished: {summary['records']} records, "
+                      f"{summary['records_per_minute']:.1f} records/min", "INFO")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+"""Cheap clipboard fingerprints for change detection
+
+A fingerprint is (length, hash). Classifications (JSON or not, blank or not,
+fingerprint of the whitespace-stripped text) are cached by fingerprint, so a
+clipboard value is stripped and parsed at most once no matter how often it is
+polled.
+"""
+import json
+import re
+from collections import OrderedDict
+
+_JSON_START = re.compile(r'\s*[\[{]')
+
+
+def fingerprint(text):
+    """Return a (length, hash) fingerprint of a string"""
+    return (len(text), hash(text))
+
+
+class ClipboardSnapshot:
+    """Fingerprint and classification of one clipboard value"""
+
+    __slots__ = ("digest", "stripped_digest", "is_blank", "is_json", "length")
+
+    def __init__(self, digest, stripped_digest, is_blank, is_json):
+        self.digest = digest
+        self.stripped_digest = stripped_digest
+        self.is_blank = is_blank
+        self.is_json = is_json
+        self.length = digest[0]
+
+
+def classify(text, digest=None):
+    """Build a ClipboardSnapshot for text (strips and parses JSON once)"""
+    if digest is None:
+        digest = fingerprint(text)
+
+    # str.strip returns the same object when there is nothing to strip
+    stripped = text.strip()
+    stripped_digest = digest if stripped is text else fingerprint(stripped)
+
+    is_json = False
+    if _JSON_START.match(text):
+        try:
+            json.loads(text)
+            is_json = True
+        except ValueError:
+            pass
+
+    return ClipboardSnapshot(digest, stripped_digest, not stripped, is_json)
+
+
+class ClipboardTracker:
+    """Decides whether a clipboard value is a meaningful change from the last one
+
+    Mirrors the app's rules: JSON (our own config) is ignored, a cleared
+    clipboard does not replace real content, and whitespace-only differences
+    are not changes.
+    """
+
+    def __init__(self, cache_size=16):
+        self.cache_size = cache_size
+        self.last = None
+        self._cache = OrderedDict()
+
+    def snapshot(self, text):
+        """Return the (cached) snapshot for text"""
+        digest = fingerprint(text)
+        snapshot = self._cache.get(digest)
+        if snapshot is not None:
+            self._cache.move_to_end(digest)
+            return snapshot
+
+        snapshot = classify(text, digest)
+        self._cache[digest] = snapshot
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return snapshot
+
+    def check(self, text):
+        """Return the new snapshot if text is a meaningful change, else None"""
+        snapshot = self.snapshot(text)
+        last = self.last
+
+        if last is not None and snapshot.digest == last.digest:
+            return None
+        if snapshot.is_json:
+            return None
+        if last is not None:
+            # A cleared clipboard should not replace real content
+            if snapshot.is_blank and not last.is_blank:
+                return None
+            # Whitespace-only differences are not changes
+            if snapshot.stripped_digest == last.stripped_digest and last.length:
+                return None
+
+        self.last = snapshot
+        return snapshot
+
+    def accept(self, text):
+        """Record text as the current value regardless of the change rules"""
+        self.last = self.snapshot(text)
+        return self.last
+
+    def reset(self):
+        """Forget the last value"""
+        self.last = None
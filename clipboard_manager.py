@@ -0,0 +1,92 @@
+from clipboard_digest import fingerprint
+
+
+class ClipboardManager:
+    """Keeps the sequence payload on the clipboard for a run
+
+    The payload is written once. Before each paste ensure() checks a cheap
+    change token from the backend (clipboard sequence number on Windows,
+    selection owner on X11) and only re-reads and compares the clipboard when
+    the token moved, rewriting it only if the content really differs.
+
+    Without a token (tracking is False, e.g. Linux without the X11 libraries)
+    every read may spawn an xclip/xsel process, so ensure() compares the
+    content only every compare_every calls; holds_payload() is the final
+    check at the end of a run.
+    """
+
+    def __init__(self, backend, compare_every=10):
+        self.backend = backend
+        self.compare_every = compare_every
+        self.payload = None
+        self.writes = 0
+        self.checks = 0
+        self.tracking = True
+        self._digest = None
+        self._token = None
+        self._unchecked = 0
+
+    def begin(self):
+        """Start a new run: reset the counters and forget the previous payload"""
+        self.writes = 0
+        self.checks = 0
+        self.payload = None
+        self._digest = None
+        self._token = None
+        self._unchecked = 0
+        self.tracking = self.backend.clipboard_change_token() is not None
+
+    def set_payload(self, text):
+        """Write text to the clipboard and take ownership of it (starts a new run)"""
+        self.begin()
+        self.switch(text)
+
+    def switch(self, text):
+        """Make text the payload mid-run; returns True if the clipboard was written
+
+        Batch runs call this for every record. Switching to the payload that is
+        already set only checks the clipboard like ensure().
+        """
+        if self.payload is not None and text == self.payload:
+            return self.ensure()
+        self.payload = text
+        self._digest = fingerprint(text)
+        self._write()
+        return True
+
+    def _write(self):
+        self.backend.copy_to_clipboard(self.payload)
+        self.writes += 1
+        self._token = self.backend.clipboard_change_token()
+
+    def ensure(self, force=False):
+        """Make sure the clipboard still holds the payload; returns True if it was rewritten
+
+        force compares the content even between the periodic checks of an
+        untracked clipboard (e.g. before retrying a paste).
+        """
+        self.checks += 1
+        token = self.backend.clipboard_change_token()
+        if token is not None and token == self._token:
+            return False
+        if token is None and not force:
+            self._unchecked += 1
+            if self._unchecked < self.compare_every:
+                return False
+
+        # Ownership changed (or cannot be tracked): compare the content itself
+        self._unchecked = 0
+        if self.holds_payload():
+            self._token = token
+            return False
+
+        self._write()
+        return True
+
+    def holds_payload(self):
+        """Read the clipboard and return True if it still holds the payload"""
+        try:
+            current = self.backend.read_clipboard()
+        except Exception:
+            return False
+        return current is not None and fingerprint(current) == self._digest
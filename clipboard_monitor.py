@@ -0,0 +1,254 @@
+"""Clipboard monitoring with selectable strategies, shared by both app variants
+
+Strategies (the "strategy" setting):
+    fixed                 poll every interval_ms
+    adaptive              poll quickly after a change, back off while idle
+    event                 XFixes owner-change events (falls back to adaptive
+                          where XFixes is unavailable)
+    paused-while-running  fixed polling that stops while a sequence runs
+
+Any strategy can also be paused during runs with "pause_while_running".
+The monitor counts checks, changes and time spent checking, so the cheapest
+strategy for a machine can be picked from its metrics.
+"""
+import threading
+import time
+
+from clipboard_watch import AdaptivePoller, XFixesClipboardWatcher
+
+STRATEGIES = ("fixed", "adaptive", "event", "paused-while-running")
+
+DEFAULT_SETTINGS = {
+    "strategy": "adaptive",
+    "interval_ms": 1000,
+    "min_interval_ms": 250,
+    "max_interval_ms": 4000,
+    "backoff": 1.5,
+    "pause_while_running": None,
+}
+
+# Delay between an owner-change event and the check, so the new owner can serve the selection
+EVENT_SETTLE_MS = 50
+# Without a wake callback, the Tk thread looks for pending events this often (no clipboard access)
+EVENT_TICK_MS = 100
+
+
+def monitor_settings(values=None, default_strategy="adaptive"):
+    """Validate a "clipboard_monitor" config object and fill in the defaults"""
+    values = values or {}
+    if not isinstance(values, dict):
+        raise ValueError("'clipboard_monitor' must be an object")
+    settings = dict(DEFAULT_SETTINGS, strategy=default_strategy)
+    settings.update(values)
+
+    if settings["strategy"] not in STRATEGIES:
+        raise ValueError(f"Unknown clipboard monitor strategy: {settings['strategy']} "
+                         f"(choose from {', '.join(STRATEGIES)})")
+    for key in ("interval_ms", "min_interval_ms", "max_interval_ms"):
+        if not isinstance(settings[key], int) or isinstance(settings[key], bool) or settings[key] < 10:
+            raise ValueError(f"clipboard_monitor: '{key}' must be a whole number of milliseconds (at least 10)")
+    if settings["min_interval_ms"] > settings["max_interval_ms"]:
+        raise ValueError("clipboard_monitor: 'min_interval_ms' cannot exceed 'max_interval_ms'")
+    try:
+        settings["backoff"] = float(settings["backoff"])
+    except (TypeError, ValueError):
+        raise ValueError("clipboard_monitor: 'backoff' must be a number")
+    if settings["backoff"] < 1.0:
+        raise ValueError("clipboard_monitor: 'backoff' must be at least 1")
+    if settings["pause_while_running"] is None:
+        settings["pause_while_running"] = settings["strategy"] == "paused-while-running"
+    settings["pause_while_running"] = bool(settings["pause_while_running"])
+    return settings
+
+
+class ClipboardMonitor:
+    """Runs check() on the Tk thread according to the selected strategy
+
+    check() must return True when it found a meaningful clipboard change.
+    wake, if given, is a thread-safe callable that makes the Tk thread call
+    on_event() soon (e.g. a UI queue post); without it, owner-change events
+    are picked up by a cheap EVENT_TICK_MS timer. default_strategy applies
+    when the settings do not name one.
+    """
+
+    def __init__(self, root, check, settings=None, wake=None, default_strategy="adaptive"):
+        self.root = root
+        self.check = check
+        self.wake = wake
+        self.default_strategy = default_strategy
+        self.settings = monitor_settings(settings, default_strategy)
+        # Strategy in effect after start() ("adaptive" when event-driven is unavailable)
+        self.active_strategy = None
+        self.paused = False
+        self._poller = None
+        self._watcher = None
+        self._event_pending = threading.Event()
+        self._event_timer = None
+        self._settle_timer = None
+        self.reset_metrics()
+
+    # --- lifecycle ---------------------------------------------------------
+
+    def start(self):
+        """Start monitoring; returns the active strategy"""
+        self.stop()
+        self.paused = False
+        self._start_strategy()
+        return self.active_strategy
+
+    def stop(self):
+        """Stop monitoring (metrics are kept)"""
+        self._stop_strategy()
+        self.active_strategy = None
+        self.paused = False
+
+    @property
+    def running(self):
+        return self.active_strategy is not None
+
+    def configure(self, settings):
+        """Switch to new settings, restarting if monitoring was running; returns True if they changed"""
+        settings = monitor_settings(settings, self.default_strategy)
+        if settings == self.settings:
+            return False
+        was_paused = self.paused
+        was_running = self.running and not was_paused
+        self.stop()
+        self.settings = settings
+        if was_running:
+            self.start()
+        elif was_paused:
+            # Still mid-run: run_finished() resumes with the new settings
+            self.paused = True
+            self.active_strategy = settings["strategy"]
+        return True
+
+    def run_started(self):
+        """A sequence started; pauses monitoring if the settings ask for it"""
+        if self.settings["pause_while_running"] and self.running and not self.paused:
+            self._stop_strategy()
+            self.paused = True
+            return True
+        return False
+
+    def run_finished(self):
+        """The sequence ended; resumes monitoring paused by run_started()"""
+        if self.paused:
+            self.paused = False
+            self._start_strategy()
+            return True
+        return False
+
+    def _start_strategy(self):
+        settings = self.settings
+        strategy = settings["strategy"]
+        if strategy == "event":
+            self._watcher = XFixesClipboardWatcher(self._on_owner_change)
+            if self._watcher.start():
+                self.active_strategy = "event"
+                if self.wake is None:
+                    self._event_timer = self.root.after(EVENT_TICK_MS, self._event_tick)
+                return
+            self._watcher = None
+            strategy = "adaptive"
+
+        if strategy == "adaptive":
+            self._poller = AdaptivePoller(self.root, self.measured_check, settings["min_interval_ms"],
+                                          settings["max_interval_ms"], settings["backoff"])
+        else:
+            # A fixed interval is an adaptive poller that never changes speed
+            interval = settings["interval_ms"]
+            self._poller = AdaptivePoller(self.root, self.measured_check, interval, interval, 1.0)
+        self._poller.start()
+        self.active_strategy = strategy
+
+    def _stop_strategy(self):
+        if self._poller is not None:
+            self._poller.stop()
+            self._poller = None
+        if self._watcher is not None:
+            self._watcher.stop()
+            self._watcher = None
+        for timer in (self._event_timer, self._settle_timer):
+            if timer is not None:
+                self.root.after_cancel(timer)
+        self._event_timer = None
+        self._settle_timer = None
+        self._event_pending.clear()
+
+    # --- events ------------------------------------------------------------
+
+    def _on_owner_change(self):
+        """Watcher thread: the clipboard owner changed"""
+        self.events += 1
+        if self.wake is not None:
+            self.wake()
+        else:
+            self._event_pending.set()
+
+    def _event_tick(self):
+        self._event_timer = self.root.after(EVENT_TICK_MS, self._event_tick)
+        if self._event_pending.is_set():
+            self._event_pending.clear()
+            self.on_event()
+
+    def on_event(self):
+        """Tk thread: coalesce a burst of owner-change events into one check"""
+        if self.active_strategy != "event" or self._settle_timer is not None:
+            return
+
+        def settled():
+            self._settle_timer = None
+            if self.active_strategy == "event":
+                try:
+                    self.measured_check()
+                except Exception:
+                    pass
+
+        self._settle_timer = self.root.after(EVENT_SETTLE_MS, settled)
+
+    # --- metrics -----------------------------------------------------------
+
+    def measured_check(self):
+        """Run check() and record how long it took; returns its result"""
+        started = time.perf_counter()
+        changed = False
+        try:
+            changed = bool(self.check())
+        finally:
+            elapsed = time.perf_counter() - started
+            self.checks += 1
+            self.check_seconds += elapsed
+            self.max_check_seconds = max(self.max_check_seconds, elapsed)
+            if changed:
+                self.changes += 1
+        return changed
+
+    def reset_metrics(self):
+        self.checks = 0
+        self.changes = 0
+        self.events = 0
+        self.check_seconds = 0.0
+        self.max_check_seconds = 0.0
+        self.metrics_since = time.monotonic()
+
+    def metrics(self):
+        """Return checks per minute, time per check and changes detected since the last reset"""
+        minutes = max(time.monotonic() - self.metrics_since, 1e-9) / 60
+        return {
+            "strategy": self.active_strategy or "stopped",
+            "paused": self.paused,
+            "checks": self.checks,
+            "changes": self.changes,
+            "events": self.events,
+            "checks_per_minute": self.checks / minutes,
+            "mean_check_ms": self.check_seconds / self.checks * 1000 if self.checks else 0.0,
+            "max_check_ms": self.max_check_seconds * 1000,
+            "busy_percent": self.check_seconds / (minutes * 60) * 100,
+        }
+
+    def describe(self):
+        m = self.metrics()
+        state = f"{m['strategy']} (paused)" if m["paused"] else m["strategy"]
+        return (f"{state}: {m['checks_per_minute']:.1f} checks/min, {m['mean_check_ms']:.2f} ms/check "
+                f"(max {m['max_check_ms']:.1f} ms), {m['changes']} changes in {m['checks']} checks")
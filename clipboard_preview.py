@@ -0,0 +1,80 @@
+"""Size-bounded preview of clipboard contents
+
+The clipboard panel never receives the whole payload. It shows the first page
+and loads further pages as the user scrolls, up to max_pages; beyond that only
+a tail window is shown. Every operation here slices a bounded window out of
+the string, so the cost does not grow with the payload.
+"""
+
+PREVIEW_PAGE_CHARS = 16 * 1024
+PREVIEW_MAX_PAGES = 16
+PREVIEW_TAIL_CHARS = 4 * 1024
+# Payloads up to this size get an exact line count; larger ones are estimated
+EXACT_LINE_COUNT_LIMIT = 1024 * 1024
+
+
+class ClipboardPreview:
+    """Paged view over one clipboard value"""
+
+    def __init__(self, text, page_chars=PREVIEW_PAGE_CHARS, max_pages=PREVIEW_MAX_PAGES,
+                 tail_chars=PREVIEW_TAIL_CHARS):
+        self.text = text
+        self.length = len(text)
+        self.page_chars = page_chars
+        self.max_pages = max_pages
+        self.tail_chars = tail_chars
+        self.pages_loaded = 0
+        self._line_count = None
+
+    @property
+    def page_count(self):
+        return max(1, -(-self.length // self.page_chars))
+
+    @property
+    def is_paged(self):
+        """True if the payload does not fit on one page"""
+        return self.length > self.page_chars
+
+    @property
+    def line_count(self):
+        """Return (line_count, exact) for the payload"""
+        if self._line_count is None:
+            if self.length <= EXACT_LINE_COUNT_LIMIT:
+                self._line_count = (self.text.count('\n') + 1, True)
+            else:
+                # Estimate from a sample so huge payloads stay O(1)
+                sample = self.text[:EXACT_LINE_COUNT_LIMIT]
+                per_char = (sample.count('\n') + 1) / len(sample)
+                self._line_count = (int(per_char * self.length), False)
+        return self._line_count
+
+    def stats_line(self):
+        """Return a one-line size summary"""
+        lines, exact = self.line_count
+        approx = "" if exact else "~"
+        return f"📏 {self.length:,} characters · {approx}{lines:,} lines"
+
+    def next_page(self):
+        """Return the next page to render, or None when no more pages should be loaded"""
+        if not self.has_more_pages():
+            return None
+        start = self.pages_loaded * self.page_chars
+        self.pages_loaded += 1
+        return self.text[start:start + self.page_chars]
+
+    def has_more_pages(self):
+        """True if another page can be loaded on scroll"""
+        return self.pages_loaded < min(self.page_count, self.max_pages)
+
+    def rendered_chars(self):
+        return min(self.length, self.pages_loaded * self.page_chars)
+
+    def hidden_tail(self):
+        """Return (skipped_chars, tail_text) once the page limit is reached, else None"""
+        if self.has_more_pages():
+            return None
+        rendered = self.rendered_chars()
+        if rendered >= self.length:
+            return None
+        tail_start = max(rendered, self.length - self.tail_chars)
+        return tail_start - rendered, self.text[tail_start:]
@@ -0,0 +1,247 @@
+"""Clipboard change notification
+
+XFixesClipboardWatcher listens for X11 selection-owner changes (XFixes) on a
+background thread, so a fresh copy is noticed immediately and nothing runs
+while the clipboard is idle. AdaptivePoller is the fallback for platforms
+without XFixes: it polls quickly right after a change and backs off while
+nothing happens.
+"""
+import ctypes
+import ctypes.util
+import os
+import select
+import sys
+import threading
+
+# XFixes selection event masks and event offset (from Xfixes.h)
+XFIXES_SET_SELECTION_OWNER_NOTIFY_MASK = 1 << 0
+XFIXES_SELECTION_WINDOW_DESTROY_NOTIFY_MASK = 1 << 1
+XFIXES_SELECTION_CLIENT_CLOSE_NOTIFY_MASK = 1 << 2
+XFIXES_SELECTION_NOTIFY = 0
+
+
+class XEvent(ctypes.Union):
+    """Opaque XEvent; only the leading type field is read"""
+    _fields_ = [("type", ctypes.c_int), ("pad", ctypes.c_long * 24)]
+
+
+_x11_libs = None
+
+
+def load_x11_libraries():
+    """Load libX11 and libXfixes via ctypes, returning (xlib, xfixes) or None"""
+    global _x11_libs
+    if _x11_libs is not None:
+        return _x11_libs or None
+
+    _x11_libs = False
+    if not sys.platform.startswith('linux') or not os.environ.get('DISPLAY'):
+        return None
+    try:
+        xlib = ctypes.CDLL(ctypes.util.find_library('X11') or 'libX11.so.6')
+        xfixes = ctypes.CDLL(ctypes.util.find_library('Xfixes') or 'libXfixes.so.3')
+    except OSError:
+        return None
+
+    xlib.XOpenDisplay.argtypes = [ctypes.c_char_p]
+    xlib.XOpenDisplay.restype = ctypes.c_void_p
+    xlib.XCloseDisplay.argtypes = [ctypes.c_void_p]
+    xlib.XInternAtom.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_int]
+    xlib.XInternAtom.restype = ctypes.c_ulong
+    xlib.XDefaultRootWindow.argtypes = [ctypes.c_void_p]
+    xlib.XDefaultRootWindow.restype = ctypes.c_ulong
+    xlib.XConnectionNumber.argtypes = [ctypes.c_void_p]
+    xlib.XPending.argtypes = [ctypes.c_void_p]
+    xlib.XNextEvent.argtypes = [ctypes.c_void_p, ctypes.POINTER(XEvent)]
+    xlib.XFlush.argtypes = [ctypes.c_void_p]
+    xlib.XGetSelectionOwner.argtypes = [ctypes.c_void_p, ctypes.c_ulong]
+    xlib.XGetSelectionOwner.restype = ctypes.c_ulong
+    xfixes.XFixesQueryExtension.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_int),
+                                            ctypes.POINTER(ctypes.c_int)]
+    xfixes.XFixesSelectSelectionInput.argtypes = [ctypes.c_void_p, ctypes.c_ulong,
+                                                  ctypes.c_ulong, ctypes.c_ulong]
+
+    _x11_libs = (xlib, xfixes)
+    return _x11_libs
+
+
+class XFixesClipboardWatcher:
+    """Calls on_change() from a background thread whenever the clipboard owner changes"""
+
+    def __init__(self, on_change, selection="CLIPBOARD"):
+        self.on_change = on_change
+        self.selection = selection
+        self._thread = None
+        self._stop_pipe = None
+        self._stop_event = None
+
+    @staticmethod
+    def is_supported():
+        """Return True if XFixes selection events can be used on this machine"""
+        return load_x11_libraries() is not None
+
+    def start(self):
+        """Start watching; returns False if XFixes is not available"""
+        if self.running:
+            return True
+        libs = load_x11_libraries()
+        if libs is None:
+            return False
+
+        xlib, xfixes = libs
+        display = xlib.XOpenDisplay(None)
+        if not display:
+            return False
+        event_base, error_base = ctypes.c_int(), ctypes.c_int()
+        if not xfixes.XFixesQueryExtension(display, ctypes.byref(event_base), ctypes.byref(error_base)):
+            xlib.XCloseDisplay(display)
+            return False
+
+        atom = xlib.XInternAtom(display, self.selection.encode(), 0)
+        root = xlib.XDefaultRootWindow(display)
+        xfixes.XFixesSelectSelectionInput(display, root, atom,
+                                          XFIXES_SET_SELECTION_OWNER_NOTIFY_MASK |
+                                          XFIXES_SELECTION_WINDOW_DESTROY_NOTIFY_MASK |
+                                          XFIXES_SELECTION_CLIENT_CLOSE_NOTIFY_MASK)
+        xlib.XFlush(display)
+
+        self._stop_pipe = os.pipe()
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._event_loop,
+                                        args=(xlib, display, event_base.value,
+                                              self._stop_pipe, self._stop_event),
+                                        name="clipboard-watcher", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self):
+        """Stop watching and wait for the event thread to exit"""
+        if not self.running:
+            return
+        self._stop_event.set()
+        try:
+            os.write(self._stop_pipe[1], b"x")
+        except OSError:
+            pass
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=1.0)
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._stop_event is not None and not self._stop_event.is_set()
+
+    def _event_loop(self, xlib, display, event_base, stop_pipe, stop_event):
+        """Block on the X connection until a selection event or stop request arrives"""
+        x_fd = xlib.XConnectionNumber(display)
+        stop_fd = stop_pipe[0]
+        event = XEvent()
+        try:
+            while not stop_event.is_set():
+                readable, _, _ = select.select([x_fd, stop_fd], [], [])
+                if stop_fd in readable:
+                    break
+                changed = False
+                while xlib.XPending(display):
+                    xlib.XNextEvent(display, ctypes.byref(event))
+                    if event.type == event_base + XFIXES_SELECTION_NOTIFY:
+                        changed = True
+                if changed and not stop_event.is_set():
+                    try:
+                        self.on_change()
+                    except Exception:
+                        pass
+        finally:
+            stop_event.set()
+            xlib.XCloseDisplay(display)
+            for fd in stop_pipe:
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+
+
+class X11SelectionOwnerProbe:
+    """Returns the window that currently owns the clipboard selection
+
+    A single round trip to the X server, no subprocess. Use one probe per
+    thread (each holds its own display connection).
+    """
+
+    def __init__(self, selection="CLIPBOARD"):
+        self._display = None
+        libs = load_x11_libraries()
+        if libs is None:
+            return
+        self._xlib = libs[0]
+        self._display = self._xlib.XOpenDisplay(None)
+        if self._display:
+            self._atom = self._xlib.XInternAtom(self._display, selection.encode(), 0)
+
+    @property
+    def available(self):
+        return bool(self._display)
+
+    def owner(self):
+        """Return the owner window id (0 if nobody owns the selection)"""
+        return self._xlib.XGetSelectionOwner(self._display, self._atom)
+
+    def close(self):
+        if self._display:
+            self._xlib.XCloseDisplay(self._display)
+            self._display = None
+
+
+def win32_clipboard_sequence_number():
+    """Return the Windows clipboard sequence number, or None off Windows"""
+    if sys.platform != 'win32':
+        return None
+    try:
+        return ctypes.windll.user32.GetClipboardSequenceNumber()
+    except Exception:
+        return None
+
+
+class AdaptivePoller:
+    """Tk-scheduled polling that speeds up after a change and backs off while idle
+
+    check() is called on the Tk thread and must return True when it detected a
+    change.
+    """
+
+    def __init__(self, root, check, min_interval=250, max_interval=4000, backoff=1.5):
+        self.root = root
+        self.check = check
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.interval = min_interval
+        self._timer = None
+
+    def start(self):
+        """Start polling"""
+        self.stop()
+        self.interval = self.min_interval
+        self._timer = self.root.after(self.interval, self._tick)
+
+    def stop(self):
+        """Stop polling"""
+        if self._timer is not None:
+            self.root.after_cancel(self._timer)
+            self._timer = None
+
+    @property
+    def running(self):
+        return self._timer is not None
+
+    def _tick(self):
+        changed = False
+        try:
+            changed = self.check()
+        except Exception:
+            pass
+        if changed:
+            self.interval = self.min_interval
+        else:
+            self.interval = min(self.max_interval, int(self.interval * self.backoff))
+        self._timer = self.root.after(self.interval, self._tick)
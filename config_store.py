@@ -0,0 +1,383 @@
+"""Reading and writing coordinates_config.json
+
+The file is either a plain list of coordinates (the original format) or an
+object holding named coordinate profiles (one per target app layout):
+    {
+      "active_profile": "Default",
+      "profiles": {"Default": [...], "CRM layout": [...]},
+      "active_timing_profile": "normal",
+      "timing_profiles": {"custom": {...}}
+    }
+load_config() accepts both (and the single-list object form with a
+"coordinates" key) and always returns the profiles form. Every coordinate
+gets a stable "id" (unique within its profile) that is saved with it.
+
+Writes are atomic (temp file, fsync, rename) and keep the previous file as
+<config>.bak; loading falls back to the backup if the config is unreadable.
+ConfigWriter does the writing on a background thread, coalescing bursts of
+edits into one write. load_config_cached() validates a config once per file
+version (mtime and size) and serves repeated loads from memory.
+"""
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+
+import timing_profiles
+from execution_plan import compile_plan
+from timing_profiles import DEFAULT_PROFILE_NAME
+
+CONFIG_FILE = 'coordinates_config.json'
+
+# Profile name given to a config that has a single coordinate list
+DEFAULT_PROFILE = "Default"
+
+# Default coordinates used when no config file exists
+DEFAULT_COORDINATES = [
+    {"name": "Position 1", "x": -2658, "y": 934, "press_enter_after_paste": True, "delay_after_action": 0.5},
+    {"name": "Position 2", "x": -2002, "y": 985, "press_enter_after_paste": True, "delay_after_action": 0.5},
+    {"name": "Position 3", "x": -2644, "y": 1763, "press_enter_after_paste": True, "delay_after_action": 0.5},
+    {"name": "Position 4", "x": -1708, "y": 1664, "press_enter_after_paste": True, "delay_after_action": 0.5},
+    {"name": "Position 5", "x": -1050, "y": 1721, "press_enter_after_paste": True, "delay_after_action": 0.5},
+    {"name": "Position 6", "x": -720, "y": 1040, "press_enter_after_paste": True, "delay_after_action": 0.5},
+    {"name": "Position 7", "x": -814, "y": 1699, "press_enter_after_paste": True, "delay_after_action": 0.5},
+    {"name": "Position 8", "x": -75, "y": 1766, "press_enter_after_paste": True, "delay_after_action": 0.5}
+]
+
+
+def default_coordinates():
+    """Return a fresh copy of the default coordinates"""
+    return [dict(coord) for coord in DEFAULT_COORDINATES]
+
+
+def load_coordinates(path=CONFIG_FILE, profile=None):
+    """Load a profile's coordinate list (default: the active one; raises on missing or invalid files)"""
+    return profile_coordinates(load_config(path), profile)
+
+
+def profile_coordinates(config, profile=None):
+    """Return the coordinate list of a profile (default: the active one)"""
+    profile = profile or config["active_profile"]
+    if profile not in config["profiles"]:
+        raise ValueError(f"Unknown coordinate profile: {profile}")
+    return config["profiles"][profile]
+
+
+def load_coordinates_or_default(path=CONFIG_FILE):
+    """Load coordinates from the config file, falling back to the defaults"""
+    try:
+        if os.path.exists(path):
+            return load_coordinates(path)
+    except Exception:
+        pass
+    return default_coordinates()
+
+
+def save_coordinates(coordinates, path=CONFIG_FILE):
+    """Write the coordinate list to the config file"""
+    write_json_atomic(coordinates, path)
+
+
+def backup_path(path):
+    return path + ".bak"
+
+
+def _fsync_directory(path):
+    # Makes the rename itself durable; not possible (or needed) on Windows
+    try:
+        fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    except (OSError, AttributeError):
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def write_text_atomic(text, path):
+    """Replace path with text so readers see either the old or the new file, never a partial one
+
+    The previous file is kept as the rolling backup (path.bak).
+    """
+    temp_path = path + ".tmp"
+    try:
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+    except OSError:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+    if os.path.exists(path):
+        backup_temp = backup_path(path) + ".tmp"
+        shutil.copyfile(path, backup_temp)
+        os.replace(backup_temp, backup_path(path))
+    os.replace(temp_path, path)
+    _fsync_directory(path)
+
+
+def write_json_atomic(data, path):
+    write_text_atomic(json.dumps(data, indent=2), path)
+
+
+def new_coordinate_id():
+    """Return a fresh coordinate id"""
+    return uuid.uuid4().hex[:12]
+
+
+def derived_coordinate_id(name, occurrence):
+    """Return the id of the occurrence-th id-less coordinate called name
+
+    Files written by other tools have no ids; deriving them from the name
+    keeps a row's identity across reloads of the same file.
+    """
+    digest = hashlib.sha1(f"{occurrence}:{name}".encode("utf-8", "replace")).hexdigest()
+    return digest[:12]
+
+
+def ensure_coordinate_ids(coordinates):
+    """Give every coordinate a unique "id", keeping existing unique ones; returns the number assigned
+
+    Missing ids are derived from the coordinate's name (and how many id-less
+    coordinates before it share that name), so loading the same file twice
+    gives the same ids.
+    """
+    seen = set()
+    missing = []
+    for coord in coordinates:
+        if not isinstance(coord, dict):
+            # Left for validation to report
+            continue
+        coord_id = coord.get("id")
+        if not isinstance(coord_id, str) or not coord_id or coord_id in seen:
+            missing.append(coord)
+        else:
+            seen.add(coord_id)
+
+    occurrences = {}
+    for coord in missing:
+        name = str(coord.get("name"))
+        occurrence = occurrences.get(name, 0)
+        coord_id = derived_coordinate_id(name, occurrence)
+        while coord_id in seen:
+            occurrence += 1
+            coord_id = derived_coordinate_id(name, occurrence)
+        occurrences[name] = occurrence + 1
+        coord["id"] = coord_id
+        seen.add(coord_id)
+    return len(missing)
+
+
+def normalize_config(data):
+    """Convert loaded JSON (list or object) into the config object form"""
+    if isinstance(data, list):
+        data = {"coordinates": data}
+    if not isinstance(data, dict):
+        raise ValueError("Config must be a list of coordinates or an object")
+    config = dict(data)
+
+    # Older files hold a single list: it becomes the default profile
+    if "profiles" not in config:
+        config["profiles"] = {DEFAULT_PROFILE: config.get("coordinates", [])}
+    config.pop("coordinates", None)
+    profiles = config["profiles"]
+    if not isinstance(profiles, dict) or not all(isinstance(coords, list) for coords in profiles.values()):
+        raise ValueError("'profiles' must map profile names to coordinate lists")
+    if not profiles:
+        profiles[DEFAULT_PROFILE] = []
+    for coords in profiles.values():
+        ensure_coordinate_ids(coords)
+    if config.get("active_profile") not in profiles:
+        config["active_profile"] = next(iter(profiles))
+
+    config.setdefault("timing_profiles", {})
+    config.setdefault("active_timing_profile", DEFAULT_PROFILE_NAME)
+    return config
+
+
+def load_config(path=CONFIG_FILE):
+    """Load the full config object (raises on missing or invalid files)"""
+    with open(path, 'r') as f:
+        return normalize_config(json.load(f))
+
+
+def recover_config(path=CONFIG_FILE):
+    """Load the config, then its backup, then the defaults
+
+    Returns (config, source, error) where source is "config", "backup" or
+    "defaults" and error describes why the config file could not be used.
+    """
+    if not os.path.exists(path) and not os.path.exists(backup_path(path)):
+        return normalize_config(default_coordinates()), "defaults", None
+    try:
+        return load_config(path), "config", None
+    except Exception as e:
+        error = f"{path}: {e}"
+    try:
+        return load_config(backup_path(path)), "backup", error
+    except Exception:
+        return normalize_config(default_coordinates()), "defaults", error
+
+
+def file_key(path):
+    """Return (mtime_ns, size) of path, or None if it does not exist"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def validate_config(config):
+    """Compile every profile with its timing so a bad config is rejected before it is used
+
+    Raises PlanError (a ValueError) or ValueError naming the offending profile.
+    """
+    profiles = timing_profiles.load_profiles(config)
+    timing = timing_profiles.get_profile(config) if config.get("active_timing_profile") in profiles \
+        else profiles[DEFAULT_PROFILE_NAME]
+    for name, coords in config["profiles"].items():
+        try:
+            compile_plan(coords, timing)
+        except ValueError as e:
+            raise type(e)(f"Profile '{name}': {e}")
+    return config
+
+
+# path -> (file key, validated config)
+_config_cache = {}
+
+
+def load_config_cached(path=CONFIG_FILE):
+    """Load and validate the config, reusing the last result while the file is unchanged
+
+    Returns a private copy each call, so callers may edit it.
+    """
+    key = file_key(path)
+    cached = _config_cache.get(path)
+    if cached is not None and key is not None and cached[0] == key:
+        return snapshot_config(cached[1])
+    config = validate_config(load_config(path))
+    # Only cache if the file did not change while it was being read
+    if key is not None and file_key(path) == key:
+        _config_cache[path] = (key, config)
+    return snapshot_config(config)
+
+
+def load_config_or_default(path=CONFIG_FILE):
+    """Load the config, falling back to its backup and then the default coordinates"""
+    return recover_config(path)[0]
+
+
+def save_config(config, path=CONFIG_FILE):
+    """Write the full config object"""
+    write_json_atomic(config, path)
+
+
+def snapshot_config(config):
+    """Copy the containers of a config so it can be serialized on another thread"""
+    snapshot = dict(config)
+    snapshot["profiles"] = {name: [_copy_coordinate(coord) for coord in coords]
+                            for name, coords in config["profiles"].items()}
+    snapshot["timing_profiles"] = {name: dict(values) if isinstance(values, dict) else values
+                                   for name, values in config.get("timing_profiles", {}).items()}
+    return snapshot
+
+
+def _copy_coordinate(coord):
+    coord = dict(coord)
+    if isinstance(coord.get("timing"), dict):
+        coord["timing"] = dict(coord["timing"])
+    return coord
+
+
+class ConfigWriter:
+    """Writes the config from a background thread, coalescing rapid edits
+
+    save() takes a snapshot and returns at once; the write happens delay
+    seconds after the last save(), so a burst of edits costs one write.
+    Serializing and writing never run on the caller's thread. flush() waits
+    for the pending write (call it before exit).
+
+    on_error(message) and on_saved(path) are called on the writer thread.
+    """
+
+    def __init__(self, path=CONFIG_FILE, delay=0.5, on_error=None, on_saved=None):
+        self.path = path
+        self.delay = delay
+        self.on_error = on_error or (lambda message: None)
+        self.on_saved = on_saved or (lambda path: None)
+        self.writes = 0
+        # (mtime_ns, size) of the last file this writer produced, to recognise its own writes
+        self.last_written = None
+        self._pending = None
+        self._due = 0.0
+        self._writing = False
+        self._closed = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._worker, name="config-writer", daemon=True)
+        self._thread.start()
+
+    def save(self, config, delay=None):
+        """Schedule config to be written (replacing any write still pending)"""
+        snapshot = snapshot_config(config)
+        with self._condition:
+            self._pending = snapshot
+            self._due = time.monotonic() + (self.delay if delay is None else delay)
+            self._condition.notify()
+
+    @property
+    def pending(self):
+        with self._condition:
+            return self._pending is not None or self._writing
+
+    def flush(self, timeout=5.0):
+        """Write any pending config now and wait for it; returns False on timeout"""
+        with self._condition:
+            self._due = 0.0
+            self._condition.notify()
+            return self._condition.wait_for(lambda: self._pending is None and not self._writing, timeout)
+
+    def close(self, timeout=5.0):
+        """Flush and stop the writer thread"""
+        flushed = self.flush(timeout)
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        return flushed
+
+    def _worker(self):
+        while True:
+            with self._condition:
+                while not self._closed:
+                    if self._pending is not None:
+                        remaining = self._due - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        self._condition.wait(remaining)
+                    else:
+                        self._condition.wait()
+                if self._pending is None:
+                    return
+                config = self._pending
+                self._pending = None
+                self._writing = True
+            try:
+                write_json_atomic(config, self.path)
+                self.last_written = file_key(self.path)
+                self.writes += 1
+                self.on_saved(self.path)
+            except Exception as e:
+                self.on_error(f"Could not save {self.path}: {e}")
+            finally:
+                with self._condition:
+                    self._writing = False
+                    self._condition.notify_all()
@@ -0,0 +1,171 @@
+"""Config file change notification
+
+ConfigWatcher calls on_change() from a background thread when the config
+file is written, replaced or deleted. On Linux it uses inotify on the file's
+directory (editors and atomic writers replace the file, which a watch on the
+file itself would miss); elsewhere it polls the file's mtime and size.
+"""
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+
+from config_store import file_key
+
+# inotify flags (from sys/inotify.h)
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_MOVED_FROM | IN_CREATE | IN_DELETE | IN_ATTRIB
+
+# struct inotify_event header: wd, mask, cookie, len (the name follows)
+INOTIFY_EVENT = struct.Struct("iIII")
+
+_libc = None
+
+
+def load_inotify():
+    """Return libc with the inotify functions declared, or None where unavailable"""
+    global _libc
+    if _libc is not None:
+        return _libc or None
+
+    _libc = False
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    except (OSError, AttributeError):
+        return None
+    _libc = libc
+    return _libc
+
+
+class ConfigWatcher:
+    """Calls on_change() from a background thread whenever the watched file changes
+
+    mode is "inotify" or "polling" once started. Bursts of events from one
+    save are reported as a single call.
+    """
+
+    def __init__(self, path, on_change, poll_interval=1.0):
+        self.path = os.path.abspath(path)
+        self.on_change = on_change
+        self.poll_interval = poll_interval
+        self.mode = None
+        self._thread = None
+        self._stop_event = None
+        self._stop_pipe = None
+
+    def start(self):
+        """Start watching; returns the mode used"""
+        if self.running:
+            return self.mode
+        self._stop_event = threading.Event()
+        inotify_fd = self._open_inotify()
+        if inotify_fd is not None:
+            self.mode = "inotify"
+            self._stop_pipe = os.pipe()
+            target, args = self._inotify_loop, (inotify_fd, self._stop_pipe, self._stop_event)
+        else:
+            self.mode = "polling"
+            target, args = self._poll_loop, (self._stop_event,)
+        self._thread = threading.Thread(target=target, args=args, name="config-watcher", daemon=True)
+        self._thread.start()
+        return self.mode
+
+    def stop(self):
+        """Stop watching and wait for the watcher thread to exit"""
+        if not self.running:
+            return
+        self._stop_event.set()
+        if self._stop_pipe is not None:
+            try:
+                os.write(self._stop_pipe[1], b"x")
+            except OSError:
+                pass
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=1.0)
+        self._thread = None
+        self._stop_pipe = None
+
+    @property
+    def running(self):
+        return self._stop_event is not None and not self._stop_event.is_set()
+
+    def _open_inotify(self):
+        libc = load_inotify()
+        if libc is None:
+            return None
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            return None
+        directory = os.path.dirname(self.path)
+        if libc.inotify_add_watch(fd, os.fsencode(directory), WATCH_MASK) < 0:
+            os.close(fd)
+            return None
+        return fd
+
+    def _notify(self, stop_event):
+        if not stop_event.is_set():
+            try:
+                self.on_change()
+            except Exception:
+                pass
+
+    def _inotify_loop(self, inotify_fd, stop_pipe, stop_event):
+        """Block on the inotify descriptor until the file changes or stop is requested"""
+        name = os.fsencode(os.path.basename(self.path))
+        stop_fd = stop_pipe[0]
+        try:
+            while not stop_event.is_set():
+                readable, _, _ = select.select([inotify_fd, stop_fd], [], [])
+                if stop_fd in readable:
+                    break
+                changed = False
+                while True:
+                    try:
+                        data = os.read(inotify_fd, 65536)
+                    except BlockingIOError:
+                        break
+                    offset = 0
+                    while offset < len(data):
+                        _, _, _, length = INOTIFY_EVENT.unpack_from(data, offset)
+                        offset += INOTIFY_EVENT.size
+                        event_name = data[offset:offset + length].rstrip(b"\0")
+                        offset += length
+                        if event_name == name:
+                            changed = True
+                    # Let the rest of the writer's burst arrive before reporting
+                    if not stop_event.wait(0.05) and select.select([inotify_fd], [], [], 0)[0]:
+                        continue
+                    break
+                if changed:
+                    self._notify(stop_event)
+        finally:
+            stop_event.set()
+            for fd in (inotify_fd,) + tuple(stop_pipe):
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+
+    def _poll_loop(self, stop_event):
+        """Compare the file's mtime and size every poll_interval seconds"""
+        last = file_key(self.path)
+        while not stop_event.wait(self.poll_interval):
+            current = file_key(self.path)
+            if current != last:
+                last = current
+                self._notify(stop_event)
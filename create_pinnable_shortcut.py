@@ -3,6 +3,7 @@ import sys
 import winshell
 from win32com.client import Dispatch
 import subprocess
+import app_icon
 
 def create_pinnable_shortcut():
     """Create a Windows shortcut that can be pinned to taskbar"""
@@ -32,10 +33,11 @@ def create_pinnable_shortcut():
         shortcut.WorkingDirectory = current_dir
         shortcut.Description = "Multi Coordinates Clicker - Automated clipboard pasting tool"
         
-        # Try to set icon (will be created when app runs)
-        icon_path = os.path.join(current_dir, "temp_app_icon.ico")
-        if os.path.exists(icon_path):
-            shortcut.IconLocation = icon_path
+        # Use the app's cached icon (rendered now if the app has not run yet)
+        try:
+            shortcut.IconLocation = app_icon.ensure_icon_files()[1]
+        except Exception as e:
+            print(f"Could not create icon: {e}")
         
         shortcut.save()
         print(f"Created shortcut: {shortcut_path}")
@@ -0,0 +1,117 @@
+import math
+from array import array
+
+from timing_profiles import BUILTIN_PROFILES, DEFAULT_PROFILE_NAME, move_time, step_timing
+
+
+class PlanError(ValueError):
+    """Raised when the coordinate config cannot be compiled into a plan"""
+
+
+class ExecutionPlan:
+    """Immutable, array-backed snapshot of a coordinate sequence
+
+    Built once by compile_plan() before a run so the executor never touches
+    the live coordinate dicts (which the editor may change mid-run) and does
+    no per-step dict lookups or string formatting. The numeric fields are
+    read-only memoryviews of arrays, so a compiled plan cannot be edited.
+    """
+
+    __slots__ = ("names", "xs", "ys", "press_enter", "verify_paste", "delays",
+                 "move_durations", "focus_settles", "clipboard_settles", "pre_enters", "input_pause",
+                 "status_labels", "processing_labels", "enter_labels", "completed_labels")
+
+    def __init__(self, names, xs, ys, press_enter, delays, timings, input_pause, move_durations=None,
+                 verify_paste=None):
+        total = len(names)
+        self.names = tuple(names)
+        self.xs = _readonly('i', xs)
+        self.ys = _readonly('i', ys)
+        self.press_enter = tuple(press_enter)
+        self.verify_paste = tuple(verify_paste) if verify_paste is not None else (False,) * total
+        self.delays = _readonly('d', delays)
+
+        # Per-step waits resolved from the timing profile and coordinate overrides
+        self.move_durations = _readonly('d', move_durations if move_durations is not None
+                                        else (t.move_duration for t in timings))
+        self.focus_settles = _readonly('d', (t.focus_settle for t in timings))
+        self.clipboard_settles = _readonly('d', (t.clipboard_settle for t in timings))
+        self.pre_enters = _readonly('d', (t.pre_enter for t in timings))
+        self.input_pause = input_pause
+
+        # Precomputed log and status lines
+        self.status_labels = tuple(f"🔄 Processing {name} ({i+1}/{total})" for i, name in enumerate(self.names))
+        self.processing_labels = tuple(f"Processing {name} at ({x}, {y})"
+                                       for name, x, y in zip(self.names, self.xs, self.ys))
+        self.enter_labels = tuple(f"Pressed Enter after pasting at {name}" for name in self.names)
+        self.completed_labels = tuple(f"Completed {name}" for name in self.names)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __setattr__(self, name, value):
+        if hasattr(self, name):
+            raise AttributeError("ExecutionPlan is immutable")
+        object.__setattr__(self, name, value)
+
+
+def _readonly(typecode, values):
+    """Pack values into an array and return a read-only view of it"""
+    return memoryview(array(typecode, values)).toreadonly()
+
+
+def _require_int(coord, key, index):
+    value = coord.get(key)
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or \
+            (isinstance(value, float) and not value.is_integer()):
+        raise PlanError(f"Coordinate #{index+1}: '{key}' must be a whole number, got {value!r}")
+    if not -2**31 <= value < 2**31:
+        raise PlanError(f"Coordinate #{index+1}: '{key}' is out of range")
+    return int(value)
+
+
+def compile_plan(coordinates, timing=None):
+    """Validate a list of coordinate dicts and compile it into an ExecutionPlan
+
+    timing is the TimingProfile for the run (defaults to the "normal" profile).
+    """
+    if not isinstance(coordinates, (list, tuple)):
+        raise PlanError("Coordinates must be a list")
+    if timing is None:
+        timing = BUILTIN_PROFILES[DEFAULT_PROFILE_NAME]
+
+    names, xs, ys, press_enter, verify_paste, delays, timings = [], [], [], [], [], [], []
+    for index, coord in enumerate(coordinates):
+        if not isinstance(coord, dict):
+            raise PlanError(f"Coordinate #{index+1} must be an object, got {type(coord).__name__}")
+
+        name = coord.get("name")
+        if name is None or str(name).strip() == "":
+            name = f"Position {index+1}"
+
+        try:
+            delay = float(coord.get("delay_after_action", 0.0))
+        except (TypeError, ValueError):
+            raise PlanError(f"Coordinate #{index+1}: 'delay_after_action' must be a number")
+        if not math.isfinite(delay):
+            # inf would wait forever and NaN breaks the scheduler's deadlines
+            raise PlanError(f"Coordinate #{index+1}: 'delay_after_action' must be a finite number")
+        if delay < 0:
+            raise PlanError(f"Coordinate #{index+1}: 'delay_after_action' cannot be negative")
+
+        names.append(str(name))
+        xs.append(_require_int(coord, "x", index))
+        ys.append(_require_int(coord, "y", index))
+        press_enter.append(bool(coord.get("press_enter_after_paste", False)))
+        verify_paste.append(bool(coord.get("verify_paste", False)))
+        delays.append(delay)
+        try:
+            timings.append(step_timing(timing, coord, f"Coordinate #{index+1} timing"))
+        except ValueError as e:
+            raise PlanError(str(e))
+
+    # Distance-based moves (move_speed) depend on where the previous step left the cursor
+    move_durations = [move_time(t, math.hypot(xs[i] - xs[i-1], ys[i] - ys[i-1]) if i else None)
+                      for i, t in enumerate(timings)]
+    return ExecutionPlan(names, xs, ys, press_enter, delays, timings, timing.input_pause, move_durations,
+                         verify_paste)
@@ -0,0 +1,216 @@
+import threading
+import time
+
+from clipboard_watch import X11SelectionOwnerProbe, win32_clipboard_sequence_number
+
+
+class InputBackend:
+    """Base interface for the mouse, keyboard and clipboard actions used by a sequence"""
+
+    name = "base"
+
+    def move_to(self, x, y, duration=0.0, cancel_event=None):
+        """Move the mouse cursor to (x, y); an animated move ends early once cancel_event is set"""
+        raise NotImplementedError
+
+    def click(self, x, y):
+        """Click at (x, y)"""
+        raise NotImplementedError
+
+    def hotkey(self, *keys):
+        """Press a key chord such as ('ctrl', 'v')"""
+        raise NotImplementedError
+
+    def press(self, key):
+        """Press and release a single key"""
+        self.hotkey(key)
+
+    def copy_to_clipboard(self, text):
+        """Write text to the clipboard"""
+        raise NotImplementedError
+
+    def read_clipboard(self):
+        """Read text from the clipboard"""
+        raise NotImplementedError
+
+    def position(self):
+        """Return the current mouse position"""
+        raise NotImplementedError
+
+    def set_pause(self, seconds):
+        """Set the pause the backend inserts after every input call"""
+        pass
+
+    def clipboard_change_token(self):
+        """Return a cheap value that changes whenever the clipboard changes
+
+        None means the backend cannot tell; callers then compare contents.
+        """
+        return None
+
+
+class PyAutoGuiBackend(InputBackend):
+    """Real input backend driving pyautogui and pyperclip"""
+
+    name = "pyautogui"
+
+    def __init__(self, pause=None, failsafe=True, lazy=False):
+        """lazy=True defers importing pyautogui/pyperclip until the first input call"""
+        self._pause = pause
+        self._failsafe = failsafe
+        self._modules = None
+        self._owner_probes = threading.local()
+        if not lazy:
+            self.load()
+
+    def load(self):
+        """Import pyautogui and pyperclip (once) and apply the failsafe and pause settings"""
+        if self._modules is None:
+            # Imported here so headless tools can load this module without a display
+            import pyautogui
+            import pyperclip
+            pyautogui.FAILSAFE = self._failsafe
+            if self._pause is not None:
+                pyautogui.PAUSE = self._pause
+            self._modules = (pyautogui, pyperclip)
+        return self._modules
+
+    @property
+    def _pyautogui(self):
+        return (self._modules or self.load())[0]
+
+    @property
+    def _pyperclip(self):
+        return (self._modules or self.load())[1]
+
+    # Step length of a cancellable animated move
+    MOVE_STEP_SECONDS = 0.02
+
+    def move_to(self, x, y, duration=0.0, cancel_event=None):
+        if cancel_event is None or duration <= self.MOVE_STEP_SECONDS:
+            self._pyautogui.moveTo(x, y, duration=duration)
+            return
+
+        # Animate in short linear steps so STOP interrupts the move
+        start_x, start_y = self._pyautogui.position()
+        steps = max(1, int(duration / self.MOVE_STEP_SECONDS))
+        step_time = duration / steps
+        for step in range(1, steps + 1):
+            self._pyautogui.moveTo(start_x + (x - start_x) * step / steps,
+                                   start_y + (y - start_y) * step / steps, _pause=False)
+            if cancel_event.wait(step_time):
+                return
+        self._pyautogui.moveTo(x, y)
+
+    def click(self, x, y):
+        self._pyautogui.click(x, y)
+
+    def hotkey(self, *keys):
+        self._pyautogui.hotkey(*keys)
+
+    def press(self, key):
+        self._pyautogui.press(key)
+
+    def copy_to_clipboard(self, text):
+        self._pyperclip.copy(text)
+
+    def read_clipboard(self):
+        return self._pyperclip.paste()
+
+    def position(self):
+        x, y = self._pyautogui.position()
+        return x, y
+
+    def set_pause(self, seconds):
+        self._pause = seconds
+        self._pyautogui.PAUSE = seconds
+
+    def clipboard_change_token(self):
+        # Windows: clipboard sequence number; X11: current selection owner
+        token = win32_clipboard_sequence_number()
+        if token is not None:
+            return token
+        probe = getattr(self._owner_probes, "probe", None)
+        if probe is None:
+            probe = X11SelectionOwnerProbe()
+            self._owner_probes.probe = probe
+        if probe.available:
+            return probe.owner()
+        return None
+
+
+class RecordingBackend(InputBackend):
+    """In-memory backend that timestamps every event instead of touching the desktop
+
+    Useful for benchmarking sequence throughput and per-step latency on machines
+    without a display. Each event is a tuple of (monotonic_time, action, args).
+    """
+
+    name = "recording"
+
+    def __init__(self, simulate_durations=False):
+        self.simulate_durations = simulate_durations
+        self.events = []
+        self.clipboard = ""
+        self.clipboard_changes = 0
+        self._position = (0, 0)
+
+    def _record(self, action, *args):
+        self.events.append((time.perf_counter(), action, args))
+
+    def move_to(self, x, y, duration=0.0, cancel_event=None):
+        if self.simulate_durations and duration > 0:
+            if cancel_event is not None:
+                cancel_event.wait(duration)
+            else:
+                time.sleep(duration)
+        self._position = (x, y)
+        self._record("move", x, y, duration)
+
+    def click(self, x, y):
+        self._position = (x, y)
+        self._record("click", x, y)
+
+    def hotkey(self, *keys):
+        self._record("hotkey", *keys)
+
+    def press(self, key):
+        self._record("press", key)
+
+    def copy_to_clipboard(self, text):
+        self.clipboard = text
+        self.clipboard_changes += 1
+        self._record("copy", len(text))
+
+    def clipboard_change_token(self):
+        return self.clipboard_changes
+
+    def read_clipboard(self):
+        return self.clipboard
+
+    def position(self):
+        return self._position
+
+    def clear(self):
+        """Forget all recorded events"""
+        self.events = []
+
+    def actions(self):
+        """Return the recorded action names in order"""
+        return [event[1] for event in self.events]
+
+    def step_latencies(self, step_action="click"):
+        """Return the time between consecutive occurrences of step_action (seconds)"""
+        times = [event[0] for event in self.events if event[1] == step_action]
+        return [later - earlier for earlier, later in zip(times, times[1:])]
+
+
+def create_backend(name="pyautogui", **kwargs):
+    """Create an input backend by name"""
+    backends = {
+        PyAutoGuiBackend.name: PyAutoGuiBackend,
+        RecordingBackend.name: RecordingBackend,
+    }
+    if name not in backends:
+        raise ValueError(f"Unknown input backend: {name}")
+    return backends[name](**kwargs)
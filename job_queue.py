@@ -0,0 +1,177 @@
+import itertools
+import threading
+import time
+from collections import deque
+
+
+class Job:
+    """One queued run: a compiled profile plan, a payload and a repetition count
+
+    A batch job carries passes (see payload_sources) instead of one payload.
+    """
+
+    _ids = itertools.count(1)
+
+    def __init__(self, profile, plan, payload, repetitions=1, countdown=0, passes=None):
+        self.id = next(self._ids)
+        self.profile = profile
+        self.plan = plan
+        self.payload = payload
+        self.passes = passes
+        self.repetitions = repetitions
+        self.countdown = countdown
+        self.enqueued_at = time.monotonic()
+        self.started_at = None
+        self.finished_at = None
+        self.status = "queued"
+        self.summaries = []
+
+    @property
+    def wait_time(self):
+        """Seconds spent in the queue before starting"""
+        end = self.started_at if self.started_at is not None else time.monotonic()
+        return end - self.enqueued_at
+
+    @property
+    def duration(self):
+        """Seconds spent running (so far)"""
+        if self.started_at is None:
+            return 0.0
+        end = self.finished_at if self.finished_at is not None else time.monotonic()
+        return end - self.started_at
+
+    def describe(self):
+        if self.passes is not None:
+            return f"#{self.id} {self.profile} batch"
+        return f"#{self.id} {self.profile} x{self.repetitions}"
+
+
+class JobQueue:
+    """Runs queued jobs back to back on one worker thread
+
+    stop() drops the queued jobs and stops the running one. The runner keeps
+    the stop request until the worker takes the next job, so a stop is not
+    lost between taking a job and starting its run.
+
+    Callbacks run on the worker thread:
+        on_job_started(job)
+        on_job_finished(job)
+        on_idle()             the queue drained (or was stopped)
+    """
+
+    def __init__(self, runner, on_job_started=None, on_job_finished=None, on_idle=None):
+        self.runner = runner
+        self.on_job_started = on_job_started or (lambda job: None)
+        self.on_job_finished = on_job_finished or (lambda job: None)
+        self.on_idle = on_idle or (lambda: None)
+        self._pending = deque()
+        self._condition = threading.Condition()
+        self._thread = None
+        self.current = None
+        self.last_job = None
+        self.completed_jobs = 0
+
+    def enqueue(self, profile, plan, payload, repetitions=1, countdown=0, passes=None, idle_countdown=None):
+        """Queue a job and start the worker if needed; returns the Job
+
+        idle_countdown, if given, replaces countdown: the job gets it only if
+        the queue was idle, decided atomically with queueing it.
+        """
+        if repetitions < 1:
+            raise ValueError("Repetitions must be at least 1")
+        if passes is not None and repetitions != 1:
+            # A pass iterator is consumed by the first run
+            raise ValueError("Batch jobs cannot be repeated")
+        job = Job(profile, plan, payload, repetitions, countdown, passes)
+        with self._condition:
+            if idle_countdown is not None:
+                job.countdown = idle_countdown if self._thread is None else 0
+            self._pending.append(job)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._worker, name="job-queue", daemon=True)
+                self._thread.start()
+            self._condition.notify()
+        return job
+
+    def stop(self):
+        """Drop queued jobs and stop the running one"""
+        with self._condition:
+            dropped = list(self._pending)
+            self._pending.clear()
+            # Under the lock, so the stop cannot hit a job queued after it
+            self.runner.stop()
+        for job in dropped:
+            job.status = "cancelled"
+        return dropped
+
+    def wait_idle(self, timeout=None):
+        """Block until every queued job has finished; returns False on timeout"""
+        with self._condition:
+            return self._condition.wait_for(lambda: self._thread is None, timeout)
+
+    @property
+    def busy(self):
+        with self._condition:
+            return self._thread is not None
+
+    def stats(self):
+        """Return queue depth and timing figures for display"""
+        with self._condition:
+            depth = len(self._pending)
+            oldest_wait = self._pending[0].wait_time if self._pending else 0.0
+        current = self.current
+        last = self.last_job
+        return {
+            "depth": depth,
+            "oldest_wait": oldest_wait,
+            "current": current.describe() if current else None,
+            "current_duration": current.duration if current else 0.0,
+            "last_wait": last.wait_time if last else 0.0,
+            "last_duration": last.duration if last else 0.0,
+            "completed": self.completed_jobs,
+        }
+
+    def _next_job(self):
+        with self._condition:
+            if not self._pending:
+                # Nothing left: the worker exits and the next enqueue starts a new one
+                self._thread = None
+                self._condition.notify_all()
+                return None
+            # Any earlier stop request was for jobs stop() already dropped
+            self.runner.acknowledge_stop()
+            return self._pending.popleft()
+
+    def _worker(self):
+        while True:
+            job = self._next_job()
+            if job is None:
+                self.on_idle()
+                return
+
+            self.current = job
+            job.started_at = time.monotonic()
+            job.status = "running"
+            self.on_job_started(job)
+            try:
+                for repetition in range(job.repetitions):
+                    countdown = job.countdown if repetition == 0 else 0
+                    summary = self.runner.run(job.plan, job.payload, countdown=countdown, passes=job.passes)
+                    job.summaries.append(summary)
+                    if summary["error"] or summary["stopped"]:
+                        break
+                last = job.summaries[-1] if job.summaries else None
+                if last and last["error"]:
+                    job.status = "failed"
+                elif last and last["stopped"]:
+                    job.status = "stopped"
+                else:
+                    job.status = "done"
+            except Exception:
+                job.status = "failed"
+            finally:
+                job.finished_at = time.monotonic()
+                self.current = None
+                self.last_job = job
+                self.completed_jobs += 1
+                self.on_job_finished(job)
@@ -0,0 +1,56 @@
+import datetime
+import threading
+from collections import deque, namedtuple
+
+
+class LogRecord(namedtuple("LogRecord", "seq timestamp level message")):
+    """One activity log entry"""
+
+    __slots__ = ()
+
+    def format(self):
+        """Format the record the way the Logs tab shows it"""
+        return f"[{self.timestamp.strftime('%H:%M:%S')}] {self.level}: {self.message}\n"
+
+
+class LogStore:
+    """Thread-safe ring buffer of log records with a fixed capacity
+
+    Records carry an increasing sequence number so a consumer (the Logs tab)
+    can fetch only what it has not rendered yet.
+    """
+
+    def __init__(self, capacity=5000):
+        self.capacity = capacity
+        self._records = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._seq = 0
+
+    def append(self, message, level="INFO"):
+        """Add a record and return it"""
+        with self._lock:
+            self._seq += 1
+            record = LogRecord(self._seq, datetime.datetime.now(), level, message)
+            self._records.append(record)
+        return record
+
+    def records_since(self, seq):
+        """Return buffered records newer than seq (oldest first)"""
+        with self._lock:
+            if not self._records or self._records[-1].seq <= seq:
+                return []
+            # Records are contiguous, so the new ones are the last (last_seq - seq)
+            count = min(self._records[-1].seq - seq, len(self._records))
+            return [self._records[-i] for i in range(count, 0, -1)]
+
+    def clear(self):
+        """Drop all buffered records (sequence numbers keep increasing)"""
+        with self._lock:
+            self._records.clear()
+
+    @property
+    def last_seq(self):
+        return self._seq
+
+    def __len__(self):
+        return len(self._records)
@@ -0,0 +1,301 @@
+"""Monitor geometry for validating and grouping coordinates before a run
+
+A MonitorLayout is the list of connected monitors in virtual-screen
+coordinates (monitors left of or above the primary one have negative
+origins). Layouts come from a provider: a callable returning a list of
+Monitor tuples, or None if the layout cannot be determined. The default
+provider reads XRandR on Linux and EnumDisplayMonitors on Windows; tests
+and headless tools can pass a fixed list instead.
+
+MonitorLayoutCache keeps the last layout and re-reads it only after an
+XRandR screen-change event. Without an event source it re-reads on every
+get().
+"""
+import ctypes
+import ctypes.util
+import os
+import re
+import select
+import subprocess
+import sys
+import threading
+from collections import namedtuple
+
+from clipboard_watch import XEvent, load_x11_libraries
+
+
+class Monitor(namedtuple("Monitor", "name x y width height primary")):
+    """One connected monitor"""
+
+    __slots__ = ()
+
+    def contains(self, x, y):
+        return self.x <= x < self.x + self.width and self.y <= y < self.y + self.height
+
+    def describe(self):
+        return f"{self.name} {self.width}x{self.height}{self.x:+d}{self.y:+d}"
+
+
+class MonitorLayout:
+    """The connected monitors, with lookups for coordinates and plans"""
+
+    def __init__(self, monitors):
+        # Left to right, then top to bottom, so groups come out in screen order
+        self.monitors = tuple(sorted(monitors, key=lambda m: (m.x, m.y)))
+
+    def __len__(self):
+        return len(self.monitors)
+
+    def monitor_at(self, x, y):
+        """Return the monitor showing (x, y), or None if the point is off-screen"""
+        for monitor in self.monitors:
+            if monitor.contains(x, y):
+                return monitor
+        return None
+
+    def tag_plan(self, plan):
+        """Return the monitor (or None) of every step of an ExecutionPlan"""
+        return tuple(self.monitor_at(x, y) for x, y in zip(plan.xs, plan.ys))
+
+    def validate_plan(self, plan):
+        """Return an error line for every step that is not on a connected monitor"""
+        return [f"{name} at ({x}, {y}) is not on any connected monitor"
+                for name, x, y, monitor in zip(plan.names, plan.xs, plan.ys, self.tag_plan(plan))
+                if monitor is None]
+
+    def group_by_monitor(self, plan):
+        """Return {monitor name: [step indices]} in screen order (off-screen steps under None)"""
+        groups = {monitor.name: [] for monitor in self.monitors}
+        for index, monitor in enumerate(self.tag_plan(plan)):
+            groups.setdefault(monitor.name if monitor else None, []).append(index)
+        return {name: steps for name, steps in groups.items() if steps}
+
+    def describe(self):
+        return ", ".join(monitor.describe() for monitor in self.monitors)
+
+
+# " 0: +*DP-1 2560/597x1440/336+0+0  DP-1"
+_XRANDR_MONITOR = re.compile(r"^\s*\d+:\s+\+?(\*?)(\S+)\s+(\d+)/\d+x(\d+)/\d+([+-]\d+)([+-]\d+)")
+
+
+def parse_xrandr_monitors(output):
+    """Parse the output of `xrandr --listmonitors` into Monitor tuples"""
+    monitors = []
+    for line in output.splitlines():
+        match = _XRANDR_MONITOR.match(line)
+        if match:
+            primary, name, width, height, x, y = match.groups()
+            monitors.append(Monitor(name, int(x), int(y), int(width), int(height), bool(primary)))
+    return monitors
+
+
+def xrandr_monitors():
+    """Read the monitors from XRandR; returns None if xrandr is unavailable"""
+    if not os.environ.get('DISPLAY'):
+        return None
+    try:
+        output = subprocess.run(["xrandr", "--listmonitors"], capture_output=True, text=True,
+                                timeout=5, check=True).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return parse_xrandr_monitors(output) or None
+
+
+def win32_monitors():
+    """Read the monitors with EnumDisplayMonitors; returns None off Windows"""
+    if sys.platform != 'win32':
+        return None
+    from ctypes import wintypes
+
+    class MONITORINFOEXW(ctypes.Structure):
+        _fields_ = [("cbSize", wintypes.DWORD), ("rcMonitor", wintypes.RECT), ("rcWork", wintypes.RECT),
+                    ("dwFlags", wintypes.DWORD), ("szDevice", wintypes.WCHAR * 32)]
+
+    user32 = ctypes.windll.user32
+    monitors = []
+    callback_type = ctypes.WINFUNCTYPE(ctypes.c_int, wintypes.HMONITOR, wintypes.HDC,
+                                       ctypes.POINTER(wintypes.RECT), wintypes.LPARAM)
+
+    def callback(handle, dc, rect, data):
+        info = MONITORINFOEXW()
+        info.cbSize = ctypes.sizeof(info)
+        if user32.GetMonitorInfoW(handle, ctypes.byref(info)):
+            r = info.rcMonitor
+            monitors.append(Monitor(info.szDevice, r.left, r.top, r.right - r.left, r.bottom - r.top,
+                                    bool(info.dwFlags & 1)))
+        return 1
+
+    try:
+        user32.SetProcessDPIAware()
+        user32.EnumDisplayMonitors(None, None, callback_type(callback), 0)
+    except Exception:
+        return None
+    return monitors or None
+
+
+def system_monitors():
+    """Default provider: the monitors of this machine, or None if they cannot be read"""
+    if sys.platform == 'win32':
+        return win32_monitors()
+    return xrandr_monitors()
+
+
+# XRandR screen-change event (from Xrandr.h / randr.h)
+RR_SCREEN_CHANGE_NOTIFY_MASK = 1 << 0
+RR_SCREEN_CHANGE_NOTIFY = 0
+
+_xrandr = None
+
+
+def load_xrandr():
+    """Load libXrandr via ctypes, returning (xlib, xrandr) or None"""
+    global _xrandr
+    if _xrandr is not None:
+        return _xrandr or None
+
+    _xrandr = False
+    libs = load_x11_libraries()
+    if libs is None:
+        return None
+    try:
+        xrandr = ctypes.CDLL(ctypes.util.find_library('Xrandr') or 'libXrandr.so.2')
+    except OSError:
+        return None
+    xrandr.XRRQueryExtension.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_int),
+                                         ctypes.POINTER(ctypes.c_int)]
+    xrandr.XRRSelectInput.argtypes = [ctypes.c_void_p, ctypes.c_ulong, ctypes.c_int]
+    _xrandr = (libs[0], xrandr)
+    return _xrandr
+
+
+class ScreenChangeWatcher:
+    """Calls on_change() from a background thread when XRandR reports a screen change"""
+
+    def __init__(self, on_change):
+        self.on_change = on_change
+        self._thread = None
+        self._stop_pipe = None
+        self._stop_event = None
+
+    def start(self):
+        """Start watching; returns False if XRandR events are not available"""
+        if self.running:
+            return True
+        libs = load_xrandr()
+        if libs is None:
+            return False
+
+        xlib, xrandr = libs
+        display = xlib.XOpenDisplay(None)
+        if not display:
+            return False
+        event_base, error_base = ctypes.c_int(), ctypes.c_int()
+        if not xrandr.XRRQueryExtension(display, ctypes.byref(event_base), ctypes.byref(error_base)):
+            xlib.XCloseDisplay(display)
+            return False
+        xrandr.XRRSelectInput(display, xlib.XDefaultRootWindow(display), RR_SCREEN_CHANGE_NOTIFY_MASK)
+        xlib.XFlush(display)
+
+        self._stop_pipe = os.pipe()
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._event_loop,
+                                        args=(xlib, display, event_base.value,
+                                              self._stop_pipe, self._stop_event),
+                                        name="screen-watcher", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self):
+        """Stop watching and wait for the event thread to exit"""
+        if not self.running:
+            return
+        self._stop_event.set()
+        try:
+            os.write(self._stop_pipe[1], b"x")
+        except OSError:
+            pass
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=1.0)
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._stop_event is not None and not self._stop_event.is_set()
+
+    def _event_loop(self, xlib, display, event_base, stop_pipe, stop_event):
+        """Block on the X connection until a screen-change event or stop request arrives"""
+        x_fd = xlib.XConnectionNumber(display)
+        stop_fd = stop_pipe[0]
+        event = XEvent()
+        try:
+            while not stop_event.is_set():
+                readable, _, _ = select.select([x_fd, stop_fd], [], [])
+                if stop_fd in readable:
+                    break
+                changed = False
+                while xlib.XPending(display):
+                    xlib.XNextEvent(display, ctypes.byref(event))
+                    if event.type == event_base + RR_SCREEN_CHANGE_NOTIFY:
+                        changed = True
+                if changed and not stop_event.is_set():
+                    try:
+                        self.on_change()
+                    except Exception:
+                        pass
+        finally:
+            stop_event.set()
+            xlib.XCloseDisplay(display)
+            for fd in stop_pipe:
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+
+
+class MonitorLayoutCache:
+    """Caches the monitor layout, refreshing it only after a screen change
+
+    provider is a callable returning a list of Monitor tuples (or None). With
+    watch=True the cache listens for XRandR screen-change events; if no event
+    source is available it falls back to reading the layout on every get().
+    on_change(layout) is called from the watcher thread after a change.
+    """
+
+    def __init__(self, provider=system_monitors, watch=True, on_change=None):
+        self.provider = provider
+        self.on_change = on_change or (lambda layout: None)
+        self._layout = None
+        self._valid = False
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._watcher = ScreenChangeWatcher(self._screen_changed) if watch else None
+        self.event_driven = bool(self._watcher and self._watcher.start())
+
+    def get(self):
+        """Return the current MonitorLayout, or None if the monitors cannot be determined"""
+        with self._lock:
+            if self._valid and self.event_driven:
+                return self._layout
+            generation = self._generation
+        monitors = self.provider()
+        layout = MonitorLayout(monitors) if monitors else None
+        with self._lock:
+            # A screen change during the read leaves the cache invalid
+            if generation == self._generation:
+                self._layout = layout
+                self._valid = True
+        return layout
+
+    def invalidate(self):
+        with self._lock:
+            self._valid = False
+            self._generation += 1
+
+    def _screen_changed(self):
+        self.invalidate()
+        self.on_change(self.get())
+
+    def close(self):
+        if self._watcher is not None:
+            self._watcher.stop()
+        self.event_driven = False
@@ -1,14 +1,34 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
-import pyautogui
-import pyperclip
+from tkinter import ttk, messagebox, simpledialog, filedialog
 import time
 import threading
-import json
-import os
-import base64
-from PIL import Image, ImageDraw, ImageTk
-import io
+import app_icon
+from input_backends import PyAutoGuiBackend
+from sequence_runner import SequenceRunner
+from execution_plan import PlanError, compile_plan
+from clipboard_monitor import ClipboardMonitor
+from clipboard_digest import ClipboardTracker
+from log_store import LogStore
+from ui_queue import UiUpdateQueue
+from clipboard_preview import ClipboardPreview
+import config_store
+import timing_profiles
+from job_queue import JobQueue
+from config_watch import ConfigWatcher
+from tree_sync import TreeSync
+from spatial_index import SpatialIndex
+import route_optimizer
+from monitor_layout import MonitorLayoutCache
+from tracing import Tracer
+from paste_verify import PasteVerifier
+
+# Activity log limits: records kept in memory / lines kept in the Logs tab,
+# and how often buffered records are flushed to the widget
+LOG_CAPACITY = 5000
+LOG_FLUSH_INTERVAL_MS = 100
+
+# A captured position this close (pixels) to an existing coordinate triggers a warning
+PROXIMITY_RADIUS = 25
 
 # Global color scheme - Modern dark theme with good contrast
 COLORS = {
@@ -26,53 +46,61 @@ COLORS = {
     'text_on_primary': '#FFFFFF' # White text for use on dark backgrounds like primary color
 }
 
-def create_app_icon():
-    """Create a professional-looking app icon"""
-    # Create a 32x32 icon with a modern design
-    img = Image.new('RGBA', (32, 32), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
-    
-    # Draw background circle
-    draw.ellipse([2, 2, 30, 30], fill='#2C3E50', outline='#3498DB', width=2)
-    
-    # Draw cursor/target symbol
-    # Crosshair
-    draw.line([16, 8, 16, 12], fill='#FFFFFF', width=2)
-    draw.line([16, 20, 16, 24], fill='#FFFFFF', width=2)
-    draw.line([8, 16, 12, 16], fill='#FFFFFF', width=2)
-    draw.line([20, 16, 24, 16], fill='#FFFFFF', width=2)
-    
-    # Center dot
-    draw.ellipse([14, 14, 18, 18], fill='#E74C3C')
-    
-    return img
+def read_clipboard_text():
+    """Return the clipboard text (pyperclip is imported on first use, not at startup)"""
+    import pyperclip
+    return pyperclip.paste()
+
+def mouse_position():
+    """Return the mouse position (pyautogui is imported on first use, not at startup)"""
+    import pyautogui
+    return pyautogui.position()
 
 class MultiCoordinatesClicker:
-    def __init__(self, root):
+    def __init__(self, root, input_backend=None, log_capacity=LOG_CAPACITY):
         self.root = root
+        # Activity log ring buffer; the Logs tab is fed from it in batches
+        self.log_store = LogStore(log_capacity)
+        self.log_flush_timer = None
+        self.log_flushed_seq = 0
+        # Worker threads post UI updates here; the Tk loop drains them
+        self.ui_queue = UiUpdateQueue(self.root)
+        self.ui_queue.add_drain_hook(self.flush_logs)
+        # Backend used by the sequence runner; defaults to pyautogui/pyperclip,
+        # imported on the first sequence rather than at startup
+        self.input_backend = input_backend or PyAutoGuiBackend(pause=0.05, lazy=True)
+        # Per-step spans of recent runs, exported from the Logs tab
+        self.tracer = Tracer()
+        self.sequence_runner = SequenceRunner(self.input_backend,
+                                              on_status=self.post_status,
+                                              on_log=self.log_message,
+                                              on_progress=self.post_progress,
+                                              tracer=self.tracer,
+                                              verifier=PasteVerifier())
+        self.ui_queue.register("status", self.update_status)
+        self.ui_queue.register("progress", self.update_progress)
+        self.ui_queue.register("sequence_finished", self.on_sequence_finished)
+        self.ui_queue.register("job_started", self.on_job_started)
+        self.ui_queue.register("job_finished", self.on_job_finished)
+        self.ui_queue.register("route_optimized", self.on_route_optimized)
+        self.ui_queue.register("position_captured", self.on_position_captured)
+        self.route_worker = None
+        
+        # Jobs (profile, payload, repetitions) run back to back on one worker thread
+        self.job_queue = JobQueue(self.sequence_runner,
+                                  on_job_started=lambda job: self.ui_queue.post("job_started", job),
+                                  on_job_finished=lambda job: self.ui_queue.post("job_finished", job),
+                                  on_idle=lambda: self.ui_queue.post("sequence_finished", None))
+        self.ui_queue.register("clipboard_changed", self.on_clipboard_changed_event)
         
         # Set window properties for taskbar pinning
         self.root.title("Multi Coordinates Clicker")
         self.root.geometry("1800x700")
         self.root.resizable(True, True)
         
-        # Create and set the application icon
+        # Set the application icon (rendered once, then loaded from the user cache)
         try:
-            icon_img = create_app_icon()
-            self.icon_photo = ImageTk.PhotoImage(icon_img)
-            self.root.iconphoto(True, self.icon_photo)
-            
-            # Also try to set as window icon (for Windows)
-            # Save temporary icon file
-            icon_path = "temp_app_icon.ico"
-            # Create a larger version for ICO file
-            large_icon = icon_img.resize((64, 64), Image.Resampling.LANCZOS)
-            large_icon.save(icon_path, format='ICO', sizes=[(16,16), (32,32), (64,64)])
-            
-            # Set icon using iconbitmap (Windows-specific)
-            if os.path.exists(icon_path):
-                self.root.iconbitmap(icon_path)
-                
+            self.icon_photo = app_icon.apply_icon(self.root)
         except Exception as e:
             print(f"Could not set icon: {e}")
         
@@ -94,50 +122,120 @@ class MultiCoordinatesClicker:
         
         # Initialize variables
         self.is_running = False
-        self.current_thread = None
         self.start_time = None
         self.completed_count = 0
         self.auto_refresh_enabled = True
-        self.clipboard_refresh_timer = None
+        # Strategy comes from the config's "clipboard_monitor" settings (event-driven by default)
+        self.clipboard_monitor = ClipboardMonitor(self.root, self.check_clipboard_for_changes,
+                                                  wake=lambda: self.ui_queue.post_latest("clipboard_changed"),
+                                                  default_strategy="event")
         self.last_clipboard_content = ""
+        self.clipboard_tracker = ClipboardTracker()
+        self.clipboard_preview = None
         self.sequence_clipboard_content = ""
-        
-        # Load or create default coordinates
-        self.coordinates = self.load_coordinates()
+        self.sequence_plan = None
+        # Grid index over the current profile's coordinates, rebuilt lazily after edits
+        self.spatial_index = None
+        self.spatial_coords = {}
+        
+        # Load or create default coordinates (named profiles plus timing profiles)
+        self.app_config = self.load_config()
+        self.coordinates = config_store.profile_coordinates(self.app_config)
+        self.apply_clipboard_monitor_settings()
+        self.queue_stats_timer = None
+        # Edits are saved in the background, coalesced and written atomically
+        self.config_writer = config_store.ConfigWriter(
+            config_store.CONFIG_FILE, on_error=lambda message: self.ui_queue.post("config_save_error", message))
+        self.ui_queue.register("config_save_error", self.on_config_save_error)
+        # Changes made to the config file by other tools are picked up while running
+        self.config_key = config_store.file_key(config_store.CONFIG_FILE)
+        self.config_reload_pending = False
+        self.config_watcher = ConfigWatcher(config_store.CONFIG_FILE,
+                                            lambda: self.ui_queue.post_latest("config_file_changed"))
+        self.ui_queue.register("config_file_changed", self.on_config_file_changed)
+        # Monitor geometry, re-read only after a screen-change event, for pre-run checks
+        self.monitor_cache = MonitorLayoutCache(
+            on_change=lambda layout: self.ui_queue.post_latest("monitors_changed", layout))
+        self.ui_queue.register("monitors_changed", self.on_monitors_changed)
+        # Paste verification keeps its capture region on the target's monitor
+        self.sequence_runner.verifier.monitors = self.monitor_cache
+        
+        # Widgets of the Settings and Logs tabs exist once the tab is first shown
+        self.pending_tabs = {}
+        self.editor_tree = None
+        self.editor_sync = None
+        self.timing_profile_combo = None
+        self.logs_text = None
         
         self.setup_ui()
+        if self.config_load_error:
+            source = "backup" if self.config_source == "backup" else "default coordinates"
+            self.log_message(f"Config could not be read ({self.config_load_error}); loaded the {source}", "WARNING")
+        mode = self.config_watcher.start()
+        self.log_message(f"Config hot-reload: {'inotify' if mode == 'inotify' else 'mtime polling'}", "INFO")
         
         # Start auto-monitoring for clipboard changes
         self.start_auto_refresh()
         
-    def load_coordinates(self):
-        """Load coordinates from config file or create defaults"""
-        try:
-            if os.path.exists('coordinates_config.json'):
-                with open('coordinates_config.json', 'r') as f:
-                    return json.load(f)
-        except:
-            pass
-        
-        # Default coordinates
-        return [
-            {"name": "Position 1", "x": -2658, "y": 934, "press_enter_after_paste": True, "delay_after_action": 0.5},
-            {"name": "Position 2", "x": -2002, "y": 985, "press_enter_after_paste": True, "delay_after_action": 0.5},
-            {"name": "Position 3", "x": -2644, "y": 1763, "press_enter_after_paste": True, "delay_after_action": 0.5},
-            {"name": "Position 4", "x": -1708, "y": 1664, "press_enter_after_paste": True, "delay_after_action": 0.5},
-            {"name": "Position 5", "x": -1050, "y": 1721, "press_enter_after_paste": True, "delay_after_action": 0.5},
-            {"name": "Position 6", "x": -720, "y": 1040, "press_enter_after_paste": True, "delay_after_action": 0.5},
-            {"name": "Position 7", "x": -814, "y": 1699, "press_enter_after_paste": True, "delay_after_action": 0.5},
-            {"name": "Position 8", "x": -75, "y": 1766, "press_enter_after_paste": True, "delay_after_action": 0.5}
-        ]
-    
-    def save_coordinates(self):
-        """Save coordinates to config file"""
+    def load_config(self):
+        """Load coordinates and settings from config file (or its backup) or create defaults"""
+        config, self.config_source, self.config_load_error = config_store.recover_config(config_store.CONFIG_FILE)
+        return config
+    
+    def save_coordinates(self, immediate=False):
+        """Queue a background save of the coordinates to the config file"""
+        self.app_config["profiles"][self.app_config["active_profile"]] = self.coordinates
+        self.config_writer.save(self.app_config, delay=0 if immediate else None)
+    
+    def on_config_save_error(self, message):
+        """A background config write failed"""
+        self.log_message(message, "ERROR")
+        self.update_status(f"❌ {message}", "error")
+    
+    def on_config_file_changed(self):
+        """The config file changed on disk; reload it unless the change is our own"""
+        key = config_store.file_key(config_store.CONFIG_FILE)
+        if key is None or key == self.config_key or key == self.config_writer.last_written:
+            return
+        if self.config_writer.pending:
+            self.log_message("Config changed on disk while edits were unsaved; keeping the edits", "WARNING")
+            self.config_key = key
+            return
+        if self.job_queue.busy:
+            # Never swap coordinates under a running sequence
+            if not self.config_reload_pending:
+                self.log_message("Config changed on disk; it will be reloaded when the sequence ends", "INFO")
+            self.config_reload_pending = True
+            return
+        self.reload_config(key)
+    
+    def reload_config(self, key):
+        """Swap in the config from disk and refresh the rows that changed"""
+        self.config_key = key
         try:
-            with open('coordinates_config.json', 'w') as f:
-                json.dump(self.coordinates, f, indent=2)
+            config = config_store.load_config_cached(config_store.CONFIG_FILE)
         except Exception as e:
-            messagebox.showerror("Save Error", f"Could not save coordinates: {str(e)}")
+            self.log_message(f"Ignored config change on disk: {str(e)}", "WARNING")
+            self.update_status("⚠️ Config on disk is invalid; keeping the current one", "warning")
+            return
+        
+        # Stay on the profile being edited if it still exists
+        active = self.app_config["active_profile"]
+        if active in config["profiles"]:
+            config["active_profile"] = active
+        self.app_config = config
+        self.coordinates = config_store.profile_coordinates(config)
+        
+        self.refresh_profile_lists()
+        self.apply_clipboard_monitor_settings()
+        if self.timing_profile_combo is not None:
+            self.timing_profile_combo.config(values=sorted(timing_profiles.load_profiles(config)))
+            self.timing_profile_var.set(config["active_timing_profile"])
+            self.update_timing_details()
+        changed = self.refresh_coordinate_views()
+        self.on_coordinate_select(None)
+        self.update_status("🔄 Config reloaded from disk", "info")
+        self.log_message(f"Reloaded config from disk ({changed} coordinate rows changed)", "INFO")
     
     def setup_modern_style(self):
         """Configure modern visual styling"""
@@ -191,18 +289,32 @@ class MultiCoordinatesClicker:
         self.notebook = ttk.Notebook(self.root, style='Modern.TNotebook')
         self.notebook.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S), padx=15, pady=15)
         
-        # Create tabs
+        # Create tabs; Settings and Logs are built the first time they are shown
         self.setup_main_tab()
-        self.setup_settings_tab()
-        self.setup_logs_tab()
+        self.add_lazy_tab("⚙️ Settings", self.setup_settings_tab)
+        self.add_lazy_tab("📋 Logs", self.setup_logs_tab)
+        self.notebook.bind("<<NotebookTabChanged>>", self.on_tab_changed)
+        self.log_message("Application started", "INFO")
         
-        # Initialize clipboard after all tabs are created
-        self.refresh_clipboard()
-        # Store initial clipboard content for change detection
-        try:
-            self.last_clipboard_content = pyperclip.paste()
-        except:
-            self.last_clipboard_content = ""
+        # Read the clipboard once the window is up (the first read imports pyperclip)
+        self.root.after_idle(self.refresh_clipboard)
+    
+    def add_lazy_tab(self, text, builder):
+        """Add an empty tab that builder(tab_frame) fills in when it is first selected"""
+        tab = ttk.Frame(self.notebook)
+        self.notebook.add(tab, text=text)
+        self.pending_tabs[str(tab)] = builder
+        return tab
+    
+    def on_tab_changed(self, event=None):
+        """Build a lazily created tab the first time it is shown"""
+        tab = self.notebook.select()
+        builder = self.pending_tabs.pop(tab, None)
+        if builder is None:
+            return
+        started = time.perf_counter()
+        builder(self.notebook.nametowidget(tab))
+        self.log_message(f"Built tab in {(time.perf_counter() - started) * 1000:.0f} ms", "DEBUG")
     
     def setup_main_tab(self):
         """Set up the main control tab"""
@@ -244,9 +356,11 @@ class MultiCoordinatesClicker:
         # Configure black text tag for clipboard
         self.clipboard_text.tag_configure("black_text", foreground="#000000", font=("Cascadia Code", 11))
         
-        scrollbar = ttk.Scrollbar(left_frame, orient="vertical", command=self.clipboard_text.yview)
-        scrollbar.grid(row=1, column=1, sticky=(tk.N, tk.S))
-        self.clipboard_text.configure(yscrollcommand=scrollbar.set)
+        self.clipboard_scrollbar = ttk.Scrollbar(left_frame, orient="vertical", command=self.clipboard_text.yview)
+        self.clipboard_scrollbar.grid(row=1, column=1, sticky=(tk.N, tk.S))
+        # Load further preview pages when the view reaches the bottom
+        self.clipboard_text.configure(yscrollcommand=self.on_clipboard_scroll)
+        self.clipboard_text.tag_configure("preview_note", foreground=COLORS['secondary'], font=("Segoe UI", 9, "italic"))
         
         # Control buttons with better styling
         control_frame = tk.Frame(left_frame, bg=COLORS['light'])
@@ -282,6 +396,29 @@ class MultiCoordinatesClicker:
         self.progress = ttk.Progressbar(status_frame, mode='determinate')
         self.progress.grid(row=1, column=0, sticky=(tk.W, tk.E), pady=3)
         
+        # Job queue: run profiles back to back
+        queue_frame = ttk.LabelFrame(left_frame, text="📦 Job Queue", padding="10")
+        queue_frame.grid(row=4, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(0, 5))
+        queue_frame.columnconfigure(1, weight=1)
+        
+        tk.Label(queue_frame, text="Profile:", font=("Segoe UI", 9),
+                bg=COLORS['light'], fg=COLORS['dark']).grid(row=0, column=0, sticky=tk.W)
+        self.queue_profile_var = tk.StringVar(value=self.app_config["active_profile"])
+        self.queue_profile_combo = ttk.Combobox(queue_frame, textvariable=self.queue_profile_var,
+                                                state="readonly", width=18)
+        self.queue_profile_combo.grid(row=0, column=1, sticky=(tk.W, tk.E), padx=(10, 0))
+        
+        tk.Label(queue_frame, text="Reps:", font=("Segoe UI", 9),
+                bg=COLORS['light'], fg=COLORS['dark']).grid(row=0, column=2, sticky=tk.W, padx=(10, 0))
+        self.queue_reps_var = tk.StringVar(value="1")
+        ttk.Spinbox(queue_frame, from_=1, to=10000, textvariable=self.queue_reps_var, width=6).grid(row=0, column=3, padx=(5, 0))
+        
+        ttk.Button(queue_frame, text="➕ Enqueue", command=self.enqueue_from_panel, style='Info.TButton').grid(row=0, column=4, padx=(10, 0))
+        
+        self.queue_stats_label = tk.Label(queue_frame, text="Queue: idle", font=("Segoe UI", 9),
+                                         bg=COLORS['light'], fg=COLORS['dark'], anchor='w')
+        self.queue_stats_label.grid(row=1, column=0, columnspan=5, sticky=(tk.W, tk.E), pady=(5, 0))
+        
         # Right panel
         right_frame = ttk.LabelFrame(main_tab, text="🎯 Configured Coordinates", padding="15")
         right_frame.grid(row=1, column=1, sticky=(tk.W, tk.E, tk.N, tk.S), padx=(8, 15), pady=5)
@@ -313,6 +450,9 @@ class MultiCoordinatesClicker:
         tree_scrollbar = ttk.Scrollbar(right_frame, orient="vertical", command=self.coords_tree.yview)
         tree_scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
         self.coords_tree.configure(yscrollcommand=tree_scrollbar.set)
+        # Rows are keyed by coordinate id and updated in place
+        self.coords_tree.tag_configure('coordinate_row', foreground='#000000', font=('Segoe UI', 10))
+        self.coords_sync = TreeSync(self.coords_tree, tags=('coordinate_row',))
         
         # Quick edit buttons
         edit_buttons_frame = tk.Frame(right_frame, bg=COLORS['light'])
@@ -329,12 +469,15 @@ class MultiCoordinatesClicker:
         ttk.Button(edit_buttons_frame, text="✏️ Edit", command=self.quick_edit_coordinate, style='Primary.TButton').grid(row=0, column=1, padx=1, pady=2, sticky=(tk.W, tk.E))
         ttk.Button(edit_buttons_frame, text="🎯 Get Pos", command=self.quick_get_position, style='Primary.TButton').grid(row=0, column=2, padx=1, pady=2, sticky=(tk.W, tk.E))
         ttk.Button(edit_buttons_frame, text="🗑️ Delete", command=self.quick_delete_coordinate, style='Danger.TButton').grid(row=0, column=3, padx=1, pady=2, sticky=(tk.W, tk.E))
+        ttk.Button(edit_buttons_frame, text="🔲 Area", command=self.show_area_select_dialog, style='Info.TButton').grid(row=0, column=4, padx=1, pady=2, sticky=(tk.W, tk.E))
         
         # Second row - ordering operations
         ttk.Button(edit_buttons_frame, text="⬆️ Up", command=self.move_coordinate_up, style='Info.TButton').grid(row=1, column=0, padx=1, pady=2, sticky=(tk.W, tk.E))
         ttk.Button(edit_buttons_frame, text="⬇️ Down", command=self.move_coordinate_down, style='Info.TButton').grid(row=1, column=1, padx=1, pady=2, sticky=(tk.W, tk.E))
         ttk.Button(edit_buttons_frame, text="🔢 Order", command=self.show_order_dialog, style='Info.TButton').grid(row=1, column=2, padx=1, pady=2, sticky=(tk.W, tk.E))
-        ttk.Button(edit_buttons_frame, text="💾 Save", command=self.save_coordinates, style='Success.TButton').grid(row=1, column=3, padx=1, pady=2, sticky=(tk.W, tk.E))
+        ttk.Button(edit_buttons_frame, text="💾 Save", command=lambda: self.save_coordinates(immediate=True), style='Success.TButton').grid(row=1, column=3, padx=1, pady=2, sticky=(tk.W, tk.E))
+        self.optimize_btn = ttk.Button(edit_buttons_frame, text="🧭 Optimize", command=self.optimize_route, style='Info.TButton')
+        self.optimize_btn.grid(row=1, column=4, padx=1, pady=2, sticky=(tk.W, tk.E))
         
         # Quick settings panel with better colors
         quick_settings_frame = ttk.LabelFrame(right_frame, text="⚡ Quick Settings", padding="10")
@@ -381,15 +524,28 @@ class MultiCoordinatesClicker:
         # Update button
         ttk.Button(quick_settings_frame, text="💾 Update Selected", command=self.update_selected_coordinate, style='Success.TButton').grid(row=5, column=0, columnspan=2, pady=10, sticky=(tk.W, tk.E))
         
+        # Coordinate profile selection (one profile per target app layout)
+        profile_frame = tk.Frame(right_frame, bg=COLORS['light'])
+        profile_frame.grid(row=3, column=0, columnspan=2, sticky=(tk.W, tk.E))
+        profile_frame.columnconfigure(1, weight=1)
+        
+        tk.Label(profile_frame, text="🗂️ Profile:", font=("Segoe UI", 10, "bold"),
+                bg=COLORS['light'], fg=COLORS['dark']).grid(row=0, column=0, sticky=tk.W)
+        self.profile_var = tk.StringVar(value=self.app_config["active_profile"])
+        self.profile_combo = ttk.Combobox(profile_frame, textvariable=self.profile_var, state="readonly")
+        self.profile_combo.grid(row=0, column=1, sticky=(tk.W, tk.E), padx=(10, 5))
+        self.profile_combo.bind("<<ComboboxSelected>>", lambda event: self.switch_profile(self.profile_var.get()))
+        ttk.Button(profile_frame, text="➕ New", command=self.new_profile, style='Primary.TButton').grid(row=0, column=2, padx=1)
+        ttk.Button(profile_frame, text="🗑️", command=self.delete_profile, style='Danger.TButton').grid(row=0, column=3, padx=1)
+        self.refresh_profile_lists()
+        
         # Bind tree selection
         self.coords_tree.bind('<<TreeviewSelect>>', self.on_coordinate_select)
         
         self.populate_coordinates()
     
-    def setup_settings_tab(self):
+    def setup_settings_tab(self, settings_tab):
         """Set up the settings tab with adjustable coordinates"""
-        settings_tab = ttk.Frame(self.notebook)
-        self.notebook.add(settings_tab, text="⚙️ Settings")
         settings_tab.columnconfigure(0, weight=1)
         settings_tab.rowconfigure(1, weight=1)
         
@@ -405,6 +561,25 @@ class MultiCoordinatesClicker:
         
         # Coordinate editor
         self.setup_coordinate_editor(settings_frame)
+        
+        # Timing profile selection
+        timing_frame = ttk.LabelFrame(settings_tab, text="⏱️ Timing Profile", padding="15")
+        timing_frame.grid(row=2, column=0, sticky=(tk.W, tk.E), padx=20, pady=(0, 10))
+        timing_frame.columnconfigure(1, weight=1)
+        
+        tk.Label(timing_frame, text="Profile:", font=("Segoe UI", 10, "bold"),
+                bg=COLORS['light'], fg=COLORS['dark']).grid(row=0, column=0, sticky=tk.W)
+        self.timing_profile_var = tk.StringVar(value=self.app_config.get("active_timing_profile", timing_profiles.DEFAULT_PROFILE_NAME))
+        profile_names = sorted(timing_profiles.load_profiles(self.app_config))
+        self.timing_profile_combo = ttk.Combobox(timing_frame, textvariable=self.timing_profile_var,
+                                                 values=profile_names, state="readonly", width=15)
+        self.timing_profile_combo.grid(row=0, column=1, sticky=tk.W, padx=(10, 0))
+        self.timing_profile_combo.bind("<<ComboboxSelected>>", self.on_timing_profile_selected)
+        
+        self.timing_details_label = tk.Label(timing_frame, text="", font=("Segoe UI", 9),
+                                            bg=COLORS['light'], fg=COLORS['dark'])
+        self.timing_details_label.grid(row=1, column=0, columnspan=2, sticky=tk.W, pady=(5, 0))
+        self.update_timing_details()
     
     def setup_coordinate_editor(self, parent):
         """Set up the coordinate editor"""
@@ -426,6 +601,8 @@ class MultiCoordinatesClicker:
         editor_scrollbar = ttk.Scrollbar(editor_frame, orient="vertical", command=self.editor_tree.yview)
         editor_scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
         self.editor_tree.configure(yscrollcommand=editor_scrollbar.set)
+        self.editor_tree.tag_configure('black_text', foreground='black')
+        self.editor_sync = TreeSync(self.editor_tree, tags=('black_text',))
         
         # Buttons
         button_frame = tk.Frame(parent)
@@ -438,10 +615,8 @@ class MultiCoordinatesClicker:
         
         self.populate_editor()
     
-    def setup_logs_tab(self):
+    def setup_logs_tab(self, logs_tab):
         """Set up the logs tab"""
-        logs_tab = ttk.Frame(self.notebook)
-        self.notebook.add(logs_tab, text="📋 Logs")
         logs_tab.columnconfigure(0, weight=1)
         logs_tab.rowconfigure(1, weight=1)
         
@@ -452,7 +627,9 @@ class MultiCoordinatesClicker:
         
         tk.Label(header_frame, text="📋 Activity Logs", font=("Segoe UI", 16, "bold"),
                 bg=COLORS['light'], fg=COLORS['dark']).grid(row=0, column=0, sticky=tk.W)
-        ttk.Button(header_frame, text="Clear Logs", command=self.clear_logs, style='Primary.TButton').grid(row=0, column=1)
+        ttk.Button(header_frame, text="💾 Export Trace", command=self.export_trace,
+                  style='Primary.TButton').grid(row=0, column=1, padx=(0, 5))
+        ttk.Button(header_frame, text="Clear Logs", command=self.clear_logs, style='Primary.TButton').grid(row=0, column=2)
         
         # Logs
         logs_frame = ttk.Frame(logs_tab)
@@ -468,28 +645,117 @@ class MultiCoordinatesClicker:
         logs_scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
         self.logs_text.configure(yscrollcommand=logs_scrollbar.set)
         
-        self.log_message("Application started", "INFO")
+        # Show everything logged before the tab was first opened
+        self.flush_logs()
+    
+    def update_timing_details(self):
+        """Show the waits of the selected timing profile"""
+        try:
+            profile = timing_profiles.get_profile(self.app_config, self.timing_profile_var.get())
+            details = (f"Move {profile.move_duration:g}s · Focus {profile.focus_settle:g}s · "
+                       f"Clipboard {profile.clipboard_settle:g}s · Before Enter {profile.pre_enter:g}s · "
+                       f"Input pause {profile.input_pause:g}s")
+            if profile.move_speed > 0:
+                details += f" · Move speed {profile.move_speed:g}px/s"
+        except ValueError as e:
+            details = f"❌ {str(e)}"
+        self.timing_details_label.config(text=details)
+    
+    def on_timing_profile_selected(self, event=None):
+        """Make the selected timing profile the active one"""
+        name = self.timing_profile_var.get()
+        self.app_config["active_timing_profile"] = name
+        self.update_timing_details()
+        self.save_coordinates()
+        self.update_status(f"⏱️ Timing profile: {name}", "info")
+        self.log_message(f"Timing profile set to '{name}'", "INFO")
+    
+    def refresh_profile_lists(self):
+        """Update the profile drop-downs after profiles were added or removed"""
+        names = list(self.app_config["profiles"])
+        self.profile_combo.config(values=names)
+        self.profile_var.set(self.app_config["active_profile"])
+        if hasattr(self, 'queue_profile_combo'):
+            self.queue_profile_combo.config(values=names)
+            if self.queue_profile_var.get() not in names:
+                self.queue_profile_var.set(self.app_config["active_profile"])
+    
+    def switch_profile(self, name):
+        """Make another coordinate profile the one being edited"""
+        if name == self.app_config["active_profile"] or name not in self.app_config["profiles"]:
+            return
+        self.app_config["active_profile"] = name
+        self.coordinates = self.app_config["profiles"][name]
+        self.refresh_coordinate_views()
+        self.on_coordinate_select(None)
+        self.refresh_profile_lists()
+        self.save_coordinates()
+        self.update_status(f"🗂️ Profile: {name}", "info")
+        self.log_message(f"Switched to profile '{name}' ({len(self.coordinates)} coordinates)", "INFO")
+    
+    def new_profile(self):
+        """Create a new profile as a copy of the current one"""
+        name = simpledialog.askstring("New Profile", "Name for the new profile (starts as a copy of the current one):",
+                                      parent=self.root)
+        if name is None:
+            return
+        name = name.strip()
+        if not name:
+            messagebox.showerror("Invalid Input", "Name cannot be empty.")
+            return
+        if name in self.app_config["profiles"]:
+            messagebox.showerror("Profile Exists", f"A profile named '{name}' already exists.")
+            return
+        self.app_config["profiles"][name] = [dict(coord) for coord in self.coordinates]
+        self.log_message(f"Created profile '{name}'", "INFO")
+        self.switch_profile(name)
+    
+    def delete_profile(self):
+        """Delete the current profile"""
+        name = self.app_config["active_profile"]
+        if len(self.app_config["profiles"]) == 1:
+            messagebox.showinfo("Cannot Delete", "This is the only profile.")
+            return
+        if not messagebox.askyesno("Confirm Delete", f"Delete profile '{name}' and its coordinates?"):
+            return
+        del self.app_config["profiles"][name]
+        # Point at another profile before switching so the deleted one is not saved back
+        self.app_config["active_profile"] = None
+        self.switch_profile(next(iter(self.app_config["profiles"])))
+        self.log_message(f"Deleted profile '{name}'", "INFO")
     
     def start_auto_refresh(self):
         """Start automatic clipboard monitoring for new content"""
-        def check_clipboard():
-            if self.auto_refresh_enabled:
-                self.check_clipboard_for_changes()
-                # Schedule next check in 2 seconds for less intrusive monitoring
-                self.clipboard_refresh_timer = self.root.after(2000, check_clipboard)
-        
-        # Start the first check after 2 seconds
-        self.clipboard_refresh_timer = self.root.after(2000, check_clipboard)
+        strategy = self.clipboard_monitor.start()
+        requested = self.clipboard_monitor.settings["strategy"]
+        if strategy != requested:
+            self.log_message(f"Clipboard monitoring: {strategy} ({requested} is not available here)", "INFO")
+        else:
+            self.log_message(f"Clipboard monitoring: {strategy}", "INFO")
     
     def stop_auto_refresh(self):
         """Stop automatic clipboard refresh"""
         self.auto_refresh_enabled = False
-        if self.clipboard_refresh_timer:
-            self.root.after_cancel(self.clipboard_refresh_timer)
+        self.clipboard_monitor.stop()
+    
+    def apply_clipboard_monitor_settings(self):
+        """Use the config's "clipboard_monitor" settings (invalid settings keep the current ones)"""
+        try:
+            changed = self.clipboard_monitor.configure(self.app_config.get("clipboard_monitor"))
+        except ValueError as e:
+            self.log_message(f"{str(e)}; keeping the current clipboard monitoring", "WARNING")
+            return
+        if changed and self.clipboard_monitor.running:
+            self.log_message(f"Clipboard monitoring switched to {self.clipboard_monitor.active_strategy}", "INFO")
+    
+    def on_clipboard_changed_event(self):
+        """The clipboard owner changed (event-driven monitoring)"""
+        self.clipboard_monitor.on_event()
     
     def toggle_auto_refresh(self):
         """Toggle automatic clipboard monitoring on/off"""
         if self.auto_refresh_enabled:
+            self.log_message(f"Clipboard monitor: {self.clipboard_monitor.describe()}", "INFO")
             self.stop_auto_refresh()
             self.auto_refresh_btn.config(text="⏰ Auto-Monitor: OFF")
             self.update_status("🔄 Clipboard monitoring disabled", "warning")
@@ -501,44 +767,65 @@ class MultiCoordinatesClicker:
             self.update_status("🔄 Clipboard monitoring enabled", "success")
             self.log_message("Clipboard monitoring enabled", "INFO")
     
+    @staticmethod
+    def coordinate_row_values(index, coord):
+        """Values of a row in the main coordinates tree"""
+        # Ensure all values are properly formatted
+        name = str(coord.get("name", f"Position {index+1}"))[:15]  # Limit name length
+        x_val = str(coord.get("x", 0))
+        y_val = str(coord.get("y", 0))
+        enter_val = "Yes" if coord.get("press_enter_after_paste", False) else "No"
+        delay_val = f"{coord.get('delay_after_action', 1.0):.1f}s"
+        return (name, x_val, y_val, enter_val, delay_val)
+    
+    @staticmethod
+    def editor_row_values(coord):
+        """Values of a row in the editor tree"""
+        return (coord["name"], coord["x"], coord["y"],
+                "Yes" if coord["press_enter_after_paste"] else "No",
+                coord['delay_after_action'])
+    
     def populate_coordinates(self):
-        """Populate main coordinates tree"""
-        # Clear existing items
-        for item in self.coords_tree.get_children():
-            self.coords_tree.delete(item)
-        
-        # Configure tag for proper text display
-        self.coords_tree.tag_configure('coordinate_row', foreground='#000000', font=('Segoe UI', 10))
-        
-        # Add coordinates with proper formatting
-        for i, coord in enumerate(self.coordinates):
-            # Ensure all values are properly formatted
-            name = str(coord.get("name", f"Position {i+1}"))[:15]  # Limit name length
-            x_val = str(coord.get("x", 0))
-            y_val = str(coord.get("y", 0))
-            enter_val = "Yes" if coord.get("press_enter_after_paste", False) else "No"
-            delay_val = f"{coord.get('delay_after_action', 1.0):.1f}s"
-            
-            self.coords_tree.insert("", "end", values=(
-                name, x_val, y_val, enter_val, delay_val
-            ), tags=('coordinate_row',))
-        
-        # Force refresh
-        self.coords_tree.update_idletasks()
+        """Bring the main coordinates tree in line with self.coordinates (changed rows only)"""
+        return self.coords_sync.sync([(coord["id"], self.coordinate_row_values(i, coord))
+                                      for i, coord in enumerate(self.coordinates)])
     
     def populate_editor(self):
-        """Populate editor tree"""
-        for item in self.editor_tree.get_children():
-            self.editor_tree.delete(item)
-        
-        self.editor_tree.tag_configure('black_text', foreground='black')
-
-        for coord in self.coordinates:
-            self.editor_tree.insert("", "end", values=(
-                coord["name"], coord["x"], coord["y"],
-                "Yes" if coord["press_enter_after_paste"] else "No",
-                coord['delay_after_action']
-            ), tags=('black_text',))
+        """Bring the editor tree in line with self.coordinates (changed rows only)"""
+        if self.editor_sync is None:
+            return {}
+        return self.editor_sync.sync([(coord["id"], self.editor_row_values(coord))
+                                      for coord in self.coordinates])
+    
+    def refresh_coordinate_views(self):
+        """Sync both coordinate trees; returns the number of main-tree rows touched"""
+        self.spatial_index = None
+        self.populate_editor()
+        return sum(self.populate_coordinates().values())
+    
+    def get_spatial_index(self):
+        """Return the spatial index of the current coordinates (built on first use after an edit)"""
+        if self.spatial_index is None:
+            self.spatial_index = SpatialIndex.from_coordinates(self.coordinates)
+            self.spatial_coords = {coord["id"]: coord for coord in self.coordinates}
+        return self.spatial_index
+    
+    def proximity_warning(self, x, y, exclude_id=None):
+        """Describe the nearest coordinate within PROXIMITY_RADIUS of (x, y), or return None"""
+        nearest = self.get_spatial_index().nearest(x, y, PROXIMITY_RADIUS, exclude=exclude_id)
+        if nearest is None:
+            return None
+        distance, coord_id = nearest
+        coord = self.spatial_coords[coord_id]
+        return f"'{coord['name']}' at ({coord['x']}, {coord['y']}) is only {distance:.0f}px away"
+    
+    def new_coordinate_id(self):
+        """Return an id not used by any coordinate of the current profile"""
+        used = {coord["id"] for coord in self.coordinates}
+        coord_id = config_store.new_coordinate_id()
+        while coord_id in used:
+            coord_id = config_store.new_coordinate_id()
+        return coord_id
     
     def add_coordinate(self):
         """Add new coordinate"""
@@ -558,7 +845,7 @@ class MultiCoordinatesClicker:
         """Show coordinate edit dialog"""
         dialog = tk.Toplevel(self.root)
         dialog.title("Edit Coordinate" if index is not None else "Add Coordinate")
-        dialog.geometry("400x320")
+        dialog.geometry("400x400")
         dialog.transient(self.root)
         dialog.grab_set()
         dialog.configure(bg=COLORS['light'])
@@ -594,6 +881,16 @@ class MultiCoordinatesClicker:
         delay_var = tk.StringVar(value=str(self.coordinates[index]["delay_after_action"]) if index is not None else "0.5")
         ttk.Entry(fields_frame, textvariable=delay_var, width=30).grid(row=4, column=1, padx=10, pady=5)
         
+        # Pinned steps always run right after the previous one (the route optimizer keeps them together)
+        ttk.Label(fields_frame, text="📌 Keep after previous:", background=COLORS['light'], foreground=COLORS['dark']).grid(row=5, column=0, sticky=tk.W, padx=10, pady=5)
+        pinned_var = tk.BooleanVar(value=bool(self.coordinates[index].get("pinned")) if index is not None else False)
+        ttk.Checkbutton(fields_frame, variable=pinned_var).grid(row=5, column=1, sticky=tk.W, padx=10, pady=5)
+        
+        # Verified steps compare screenshots around the target and paste again if nothing appeared
+        ttk.Label(fields_frame, text="🔍 Verify paste:", background=COLORS['light'], foreground=COLORS['dark']).grid(row=6, column=0, sticky=tk.W, padx=10, pady=5)
+        verify_var = tk.BooleanVar(value=bool(self.coordinates[index].get("verify_paste")) if index is not None else False)
+        ttk.Checkbutton(fields_frame, variable=verify_var).grid(row=6, column=1, sticky=tk.W, padx=10, pady=5)
+        
         # Get current mouse position button
         def get_mouse_pos():
             try:
@@ -606,18 +903,23 @@ class MultiCoordinatesClicker:
                 
                 if result:
                     time.sleep(3)
-                    x, y = pyautogui.position()
+                    x, y = mouse_position()
                     x_var.set(str(x))
                     y_var.set(str(y))
                     dialog.deiconify()
-                    messagebox.showinfo("Success", f"Position captured: ({x}, {y})")
+                    nearby = self.proximity_warning(x, y, self.coordinates[index]["id"] if index is not None else None)
+                    if nearby:
+                        self.log_message(f"Captured ({x}, {y}) near an existing coordinate: {nearby}", "WARNING")
+                        messagebox.showwarning("Possible Duplicate", f"Position captured: ({x}, {y})\n\n⚠️ {nearby}.")
+                    else:
+                        messagebox.showinfo("Success", f"Position captured: ({x}, {y})")
                 else:
                     dialog.deiconify()
             except Exception as e:
                 dialog.deiconify()
                 messagebox.showerror("Error", f"Failed to capture position: {str(e)}")
         
-        ttk.Button(fields_frame, text="🎯 Get Current Mouse Position", command=get_mouse_pos, style='Info.TButton').grid(row=5, column=0, columnspan=2, pady=10)
+        ttk.Button(fields_frame, text="🎯 Get Current Mouse Position", command=get_mouse_pos, style='Info.TButton').grid(row=7, column=0, columnspan=2, pady=10)
         
         # Buttons Frame
         button_frame = tk.Frame(dialog, bg=COLORS['light'])
@@ -626,20 +928,30 @@ class MultiCoordinatesClicker:
         # Buttons
         def save_coordinate():
             try:
-                coord = {
+                # Keep the id and any per-coordinate settings of an edited coordinate
+                coord = dict(self.coordinates[index]) if index is not None else {"id": self.new_coordinate_id()}
+                coord.update({
                     "name": name_var.get(),
                     "x": int(x_var.get()),
                     "y": int(y_var.get()),
                     "press_enter_after_paste": enter_var.get(),
                     "delay_after_action": float(delay_var.get())
-                }
+                })
+                if pinned_var.get():
+                    coord["pinned"] = True
+                else:
+                    coord.pop("pinned", None)
+                if verify_var.get():
+                    coord["verify_paste"] = True
+                else:
+                    coord.pop("verify_paste", None)
                 
                 if index is not None:
                     self.coordinates[index] = coord
                 else:
                     self.coordinates.append(coord)
                 
-                self.populate_editor()
+                self.refresh_coordinate_views()
                 dialog.destroy()
                 
             except ValueError:
@@ -658,12 +970,12 @@ class MultiCoordinatesClicker:
         if messagebox.askyesno("Confirm Delete", "Are you sure you want to delete this coordinate?"):
             index = self.editor_tree.index(selection[0])
             del self.coordinates[index]
-            self.populate_editor()
+            self.refresh_coordinate_views()
     
     def save_changes(self):
         """Save all changes"""
         self.save_coordinates()
-        self.populate_coordinates()
+        self.refresh_coordinate_views()
         messagebox.showinfo("Saved", "Coordinates saved successfully!")
         self.log_message("Coordinates configuration saved", "INFO")
     
@@ -692,6 +1004,7 @@ class MultiCoordinatesClicker:
     def quick_add_coordinate(self):
         """Quick add new coordinate"""
         new_coord = {
+            "id": self.new_coordinate_id(),
             "name": f"Position {len(self.coordinates) + 1}",
             "x": 100,
             "y": 100,
@@ -699,13 +1012,12 @@ class MultiCoordinatesClicker:
             "delay_after_action": 0.5
         }
         self.coordinates.append(new_coord)
-        self.populate_coordinates()
+        self.refresh_coordinate_views()
         self.save_coordinates()
         # Select the new coordinate
-        children = self.coords_tree.get_children()
-        if children:
-            self.coords_tree.selection_set(children[-1])
-            self.coords_tree.focus(children[-1])
+        self.coords_tree.selection_set(new_coord["id"])
+        self.coords_tree.focus(new_coord["id"])
+        self.coords_tree.see(new_coord["id"])
         self.log_message(f"Added new coordinate: {new_coord['name']}", "INFO")
     
     def quick_edit_coordinate(self):
@@ -720,84 +1032,102 @@ class MultiCoordinatesClicker:
     
     def quick_get_position(self):
         """Quick get mouse position for selected coordinate"""
+        # Hide main window temporarily
+        self.root.withdraw()
+        
+        # Show instruction dialog
+        result = messagebox.askokcancel("Get Position", 
+            "1. Position your mouse where you want to capture\n"
+            "2. Click OK\n"
+            "3. DO NOT move mouse for 3 seconds\n\n"
+            "The position will be captured automatically.")
+        if not result:
+            # Show main window again if cancelled
+            self.root.deiconify()
+            self.root.lift()
+            return
+        
+        # Wait in a thread to avoid blocking; the result is handled on the Tk thread
         def get_position():
             try:
-                # Hide main window temporarily
-                self.root.withdraw()
-                
-                # Show instruction dialog
-                result = messagebox.askokcancel("Get Position", 
-                    "1. Position your mouse where you want to capture\n"
-                    "2. Click OK\n"
-                    "3. DO NOT move mouse for 3 seconds\n\n"
-                    "The position will be captured automatically.")
-                
-                if result:
-                    time.sleep(3)
-                    x, y = pyautogui.position()
-                    
-                    # Update the quick settings fields
-                    self.quick_x_var.set(str(x))
-                    self.quick_y_var.set(str(y))
-                    
-                    # Show main window again
-                    self.root.deiconify()
-                    self.root.lift()
-                    
-                    # Update status and log
-                    self.update_status(f"✅ Position captured: ({x}, {y})", "success")
-                    self.log_message(f"Captured position: ({x}, {y})", "INFO")
-                    
-                    # If a coordinate is selected, show message about updating
-                    selection = self.coords_tree.selection()
-                    if selection:
-                        messagebox.showinfo("Position Captured", 
-                            f"Position ({x}, {y}) captured!\n\n"
-                            "Click 'Update Selected' to save this position to the selected coordinate.")
-                    else:
-                        messagebox.showinfo("Position Captured", 
-                            f"Position ({x}, {y}) captured!\n\n"
-                            "You can now use 'Add' to create a new coordinate with this position.")
-                else:
-                    # Show main window again if cancelled
-                    self.root.deiconify()
-                    self.root.lift()
-                    
+                time.sleep(3)
+                x, y = mouse_position()
+                self.ui_queue.post("position_captured", x, y, None)
             except Exception as e:
-                # Make sure window is shown again
-                self.root.deiconify()
-                self.root.lift()
-                messagebox.showerror("Error", f"Failed to capture position: {str(e)}")
-                self.log_message(f"Position capture error: {str(e)}", "ERROR")
+                self.ui_queue.post("position_captured", None, None, str(e))
         
-        # Run in thread to avoid blocking
         thread = threading.Thread(target=get_position)
         thread.daemon = True
         thread.start()
     
+    def on_position_captured(self, x, y, error):
+        """Fill the quick settings with a captured position (Tk thread)"""
+        # Show main window again
+        self.root.deiconify()
+        self.root.lift()
+        if error is not None:
+            messagebox.showerror("Error", f"Failed to capture position: {error}")
+            self.log_message(f"Position capture error: {error}", "ERROR")
+            return
+        
+        # Update the quick settings fields
+        self.quick_x_var.set(str(x))
+        self.quick_y_var.set(str(y))
+        
+        # Update status and log
+        self.update_status(f"✅ Position captured: ({x}, {y})", "success")
+        self.log_message(f"Captured position: ({x}, {y})", "INFO")
+        
+        # Warn about near-duplicates (ignoring the coordinate being updated)
+        selection = self.coords_tree.selection()
+        nearby = self.proximity_warning(x, y, selection[0] if selection else None)
+        if nearby:
+            self.log_message(f"Captured ({x}, {y}) near an existing coordinate: {nearby}", "WARNING")
+            messagebox.showwarning("Possible Duplicate",
+                f"Position ({x}, {y}) captured!\n\n⚠️ {nearby}.\n\n"
+                "Update that coordinate instead of adding a new one if it is the same target.")
+        # If a coordinate is selected, show message about updating
+        elif selection:
+            messagebox.showinfo("Position Captured", 
+                f"Position ({x}, {y}) captured!\n\n"
+                "Click 'Update Selected' to save this position to the selected coordinate.")
+        else:
+            messagebox.showinfo("Position Captured", 
+                f"Position ({x}, {y}) captured!\n\n"
+                "You can now use 'Add' to create a new coordinate with this position.")
+    
     def quick_delete_coordinate(self):
-        """Quick delete selected coordinate"""
+        """Quick delete the selected coordinate(s)"""
         selection = self.coords_tree.selection()
         if not selection:
             messagebox.showwarning("No Selection", "Please select a coordinate to delete.")
             return
         
-        index = self.coords_tree.index(selection[0])
-        coord_name = self.coordinates[index]["name"]
-        
-        if messagebox.askyesno("Confirm Delete", f"Delete '{coord_name}'?"):
+        if len(selection) > 1:
+            # Bulk delete, e.g. after an area or near-duplicate selection
+            if not messagebox.askyesno("Confirm Delete", f"Delete {len(selection)} selected coordinates?"):
+                return
+            selected = set(selection)
+            self.coordinates[:] = [coord for coord in self.coordinates if coord["id"] not in selected]
+            coord_name = f"{len(selection)} coordinates"
+        else:
+            index = self.coords_tree.index(selection[0])
+            coord_name = self.coordinates[index]["name"]
+            if not messagebox.askyesno("Confirm Delete", f"Delete '{coord_name}'?"):
+                return
             del self.coordinates[index]
-            self.populate_coordinates()
-            self.save_coordinates()
-            self.log_message(f"Deleted coordinate: {coord_name}", "INFO")
-            
-            # Clear quick settings
-            self.selected_coord_label.config(text="None selected")
-            self.quick_name_var.set("")
-            self.quick_x_var.set("")
-            self.quick_y_var.set("")
-            self.quick_enter_var.set(False)
-            self.quick_delay_var.set("")
+        
+        self.refresh_coordinate_views()
+        self.save_coordinates()
+        self.log_message(f"Deleted coordinate: {coord_name}", "INFO")
+        
+        # Clear quick settings
+        self.selected_coord_label.config(text="None selected")
+        self.quick_name_var.set("")
+        self.quick_x_var.set("")
+        self.quick_y_var.set("")
+        self.quick_enter_var.set(False)
+        self.quick_delay_var.set("")
     
     def move_coordinate_up(self):
         """Move selected coordinate up in the list"""
@@ -813,14 +1143,10 @@ class MultiCoordinatesClicker:
         
         # Swap coordinates
         self.coordinates[index], self.coordinates[index-1] = self.coordinates[index-1], self.coordinates[index]
-        self.populate_coordinates()
+        # Rows are keyed by id, so the selection moves with the coordinate
+        self.refresh_coordinate_views()
         self.save_coordinates()
-        
-        # Re-select the moved coordinate
-        children = self.coords_tree.get_children()
-        if index-1 < len(children):
-            self.coords_tree.selection_set(children[index-1])
-            self.coords_tree.focus(children[index-1])
+        self.coords_tree.see(selection[0])
         
         self.update_status(f"✅ Moved '{self.coordinates[index-1]['name']}' up", "success")
         self.log_message(f"Moved coordinate up: {self.coordinates[index-1]['name']}", "INFO")
@@ -839,14 +1165,10 @@ class MultiCoordinatesClicker:
         
         # Swap coordinates
         self.coordinates[index], self.coordinates[index+1] = self.coordinates[index+1], self.coordinates[index]
-        self.populate_coordinates()
+        # Rows are keyed by id, so the selection moves with the coordinate
+        self.refresh_coordinate_views()
         self.save_coordinates()
-        
-        # Re-select the moved coordinate
-        children = self.coords_tree.get_children()
-        if index+1 < len(children):
-            self.coords_tree.selection_set(children[index+1])
-            self.coords_tree.focus(children[index+1])
+        self.coords_tree.see(selection[0])
         
         self.update_status(f"✅ Moved '{self.coordinates[index+1]['name']}' down", "success")
         self.log_message(f"Moved coordinate down: {self.coordinates[index+1]['name']}", "INFO")
@@ -924,7 +1246,7 @@ class MultiCoordinatesClicker:
                 messagebox.showwarning("No Selection", "Please select an item to move.")
         
         def save_order():
-            self.populate_coordinates()
+            self.refresh_coordinate_views()
             self.save_coordinates()
             self.update_status("✅ Coordinate order saved", "success")
             self.log_message("Coordinate order updated", "INFO")
@@ -935,6 +1257,148 @@ class MultiCoordinatesClicker:
         ttk.Button(button_frame, text="💾 Save Order", command=save_order, style='Success.TButton').pack(side='left', padx=5)
         ttk.Button(button_frame, text="❌ Cancel", command=dialog.destroy, style='Danger.TButton').pack(side='left', padx=5)
     
+    def select_coordinate_ids(self, coord_ids):
+        """Select the given coordinates in the main tree (in list order)"""
+        wanted = set(coord_ids)
+        ordered = [coord["id"] for coord in self.coordinates if coord["id"] in wanted]
+        self.coords_tree.selection_set(ordered)
+        if ordered:
+            self.coords_tree.focus(ordered[0])
+            self.coords_tree.see(ordered[0])
+        return len(ordered)
+    
+    def show_area_select_dialog(self):
+        """Select every coordinate inside a screen rectangle, or all near-duplicates"""
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Select by Area")
+        dialog.geometry("380x260")
+        dialog.transient(self.root)
+        dialog.configure(bg=COLORS['light'])
+        
+        fields_frame = tk.Frame(dialog, bg=COLORS['light'])
+        fields_frame.pack(padx=20, pady=15, fill='both', expand=True)
+        
+        # Start from the bounding box of the current selection
+        selection = set(self.coords_tree.selection())
+        selected = [coord for coord in self.coordinates if coord["id"] in selection]
+        if selected:
+            bounds = (min(c["x"] for c in selected), min(c["y"] for c in selected),
+                      max(c["x"] for c in selected), max(c["y"] for c in selected))
+        else:
+            bounds = ("", "", "", "")
+        corner_vars = []
+        for row, (label, value) in enumerate(zip(("Left X:", "Top Y:", "Right X:", "Bottom Y:"), bounds)):
+            ttk.Label(fields_frame, text=label, background=COLORS['light'], foreground=COLORS['dark']).grid(row=row, column=0, sticky=tk.W, padx=10, pady=4)
+            var = tk.StringVar(value=str(value))
+            ttk.Entry(fields_frame, textvariable=var, width=20).grid(row=row, column=1, padx=10, pady=4)
+            corner_vars.append(var)
+        
+        def select_area():
+            try:
+                x1, y1, x2, y2 = (int(var.get()) for var in corner_vars)
+            except ValueError:
+                messagebox.showerror("Invalid Input", "Please enter whole numbers for all four edges.", parent=dialog)
+                return
+            count = self.select_coordinate_ids(self.get_spatial_index().in_rect(x1, y1, x2, y2))
+            self.update_status(f"🔲 {count} coordinates in ({x1}, {y1})-({x2}, {y2})", "info")
+            self.log_message(f"Area select ({x1}, {y1})-({x2}, {y2}): {count} coordinates", "INFO")
+            dialog.destroy()
+        
+        def select_duplicates():
+            pairs = self.get_spatial_index().close_pairs(PROXIMITY_RADIUS)
+            # Select the later coordinate of each close pair, keeping the first one
+            position = {coord["id"]: i for i, coord in enumerate(self.coordinates)}
+            later = {max(a, b, key=position.get) for _, a, b in pairs}
+            count = self.select_coordinate_ids(later)
+            self.update_status(f"🔍 {count} near-duplicate coordinates selected", "info" if count else "success")
+            self.log_message(f"Near-duplicates within {PROXIMITY_RADIUS}px: {count} coordinates", "INFO")
+            dialog.destroy()
+        
+        button_frame = tk.Frame(dialog, bg=COLORS['light'])
+        button_frame.pack(pady=10)
+        ttk.Button(button_frame, text="🔲 Select Area", command=select_area, style='Success.TButton').grid(row=0, column=0, padx=5)
+        ttk.Button(button_frame, text="🔍 Near-Duplicates", command=select_duplicates, style='Info.TButton').grid(row=0, column=1, padx=5)
+        ttk.Button(button_frame, text="❌ Cancel", command=dialog.destroy, style='Danger.TButton').grid(row=0, column=2, padx=5)
+    
+    def optimize_route(self):
+        """Propose a visiting order with less cursor travel (computed on a worker thread)"""
+        if self.is_running:
+            messagebox.showwarning("Sequence Running", "Stop the sequence before reordering coordinates.")
+            return
+        if len(self.coordinates) < 3:
+            messagebox.showinfo("Optimize Route", "At least three coordinates are needed to change the order.")
+            return
+        if self.route_worker is not None:
+            return
+        try:
+            profile = timing_profiles.get_profile(self.app_config)
+        except (ValueError, KeyError) as e:
+            messagebox.showerror("Optimize Route", f"Could not optimize: {str(e)}")
+            return
+        
+        # The worker gets its own copy; the editor may change the live list meanwhile
+        coordinates = [dict(coord) for coord in self.coordinates]
+        
+        def optimize():
+            try:
+                proposal = route_optimizer.optimize_route(coordinates)
+                time_before = route_optimizer.estimate_move_time(coordinates, range(len(coordinates)), profile)
+                time_after = route_optimizer.estimate_move_time(coordinates, proposal.order, profile)
+                self.ui_queue.post("route_optimized", coordinates, profile, proposal, time_before, time_after, None)
+            except Exception as e:
+                self.ui_queue.post("route_optimized", coordinates, profile, None, 0.0, 0.0, str(e))
+        
+        self.optimize_btn.config(state="disabled")
+        self.update_status("🧭 Optimizing route...", "info")
+        self.route_worker = threading.Thread(target=optimize, name="route-optimizer", daemon=True)
+        self.route_worker.start()
+    
+    def on_route_optimized(self, coordinates, profile, proposal, time_before, time_after, error):
+        """Show the optimizer's proposal and apply it if accepted (Tk thread)"""
+        self.route_worker = None
+        self.optimize_btn.config(state="normal")
+        if error is not None:
+            self.update_status("❌ Route optimization failed", "error")
+            messagebox.showerror("Optimize Route", f"Could not optimize: {error}")
+            return
+        
+        if proposal.optimized_distance >= proposal.original_distance:
+            self.update_status("🧭 Route is already optimal", "info")
+            messagebox.showinfo("Optimize Route", "The current order already has the shortest route found.")
+            return
+        
+        saved_pct = 100 * (1 - proposal.optimized_distance / proposal.original_distance)
+        timing_name = self.app_config["active_timing_profile"]
+        if profile.move_speed > 0:
+            time_note = (f"Estimated move time: {time_before:.1f}s → {time_after:.1f}s "
+                         f"(saves {time_before - time_after:.1f}s per run with '{timing_name}')")
+        else:
+            time_note = (f"Timing profile '{timing_name}' gives every move a fixed {profile.move_duration:g}s, "
+                         f"so move time stays {time_before:.1f}s; set \"move_speed\" to make moves distance-based")
+        message = (f"Cursor travel: {proposal.original_distance:,.0f}px → {proposal.optimized_distance:,.0f}px "
+                   f"(-{saved_pct:.0f}%)\n{time_note}\n\n"
+                   "The first step stays first and pinned steps stay right after the step before them. "
+                   "Apply the new order?")
+        self.log_message(f"Route optimizer: {proposal.original_distance:,.0f}px → "
+                         f"{proposal.optimized_distance:,.0f}px; {time_note}", "INFO")
+        if not messagebox.askyesno("Optimize Route", message):
+            self.update_status("🧭 Route unchanged", "info")
+            return
+        
+        # The order refers to the list the worker saw; it must still match
+        def layout(coords):
+            return [(coord.get("id"), coord["x"], coord["y"], bool(coord.get("pinned"))) for coord in coords]
+        if self.is_running or layout(self.coordinates) != layout(coordinates):
+            messagebox.showwarning("Optimize Route",
+                                   "The coordinates changed while the route was computed. Run Optimize again.")
+            return
+        
+        self.coordinates[:] = [self.coordinates[i] for i in proposal.order]
+        self.refresh_coordinate_views()
+        self.save_coordinates()
+        self.update_status(f"🧭 Route optimized: {saved_pct:.0f}% less cursor travel", "success")
+        self.log_message("Applied optimized coordinate order", "INFO")
+    
     def update_selected_coordinate(self):
         """Update the selected coordinate with quick settings values"""
         selection = self.coords_tree.selection()
@@ -955,24 +1419,21 @@ class MultiCoordinatesClicker:
                 messagebox.showerror("Invalid Input", "Name cannot be empty.")
                 return
             
-            # Update coordinate
-            self.coordinates[index] = {
+            # Update coordinate (the id and per-coordinate settings are kept)
+            coord = dict(self.coordinates[index])
+            coord.update({
                 "name": name,
                 "x": x,
                 "y": y,
                 "press_enter_after_paste": self.quick_enter_var.get(),
                 "delay_after_action": delay
-            }
+            })
+            self.coordinates[index] = coord
             
-            self.populate_coordinates()
+            # Only this row changes; its selection is kept
+            self.refresh_coordinate_views()
             self.save_coordinates()
             
-            # Re-select the updated coordinate
-            children = self.coords_tree.get_children()
-            if index < len(children):
-                self.coords_tree.selection_set(children[index])
-                self.coords_tree.focus(children[index])
-            
             self.update_status(f"✅ Updated '{name}'", "success")
             self.log_message(f"Updated coordinate: {name} at ({x}, {y})", "INFO")
             
@@ -982,60 +1443,79 @@ class MultiCoordinatesClicker:
             messagebox.showerror("Error", f"Failed to update coordinate: {str(e)}")
     
     def check_clipboard_for_changes(self):
-        """Check if clipboard content has changed and update if so"""
+        """Check if clipboard content has changed and update if so (returns True on update)"""
         try:
-            clipboard_content = pyperclip.paste()
+            clipboard_content = read_clipboard_text()
             
-            # Skip if clipboard contains JSON (likely from our own config)
-            if clipboard_content.strip().startswith('{') or clipboard_content.strip().startswith('['):
-                try:
-                    import json
-                    json.loads(clipboard_content)
-                    # If it's valid JSON, probably our config - skip
-                    return
-                except:
-                    pass  # Not JSON, continue normally
+            # Fingerprint-based check: JSON (likely our own config), cleared
+            # clipboards and whitespace-only edits are classified once per value
+            if self.clipboard_tracker.check(clipboard_content) is None:
+                return False
             
-            # More robust change detection - avoid false positives
-            if clipboard_content != self.last_clipboard_content:
-                # Don't update if new content is empty and we had content before
-                # (this prevents losing content due to clipboard clearing)
-                if not clipboard_content.strip() and self.last_clipboard_content.strip():
-                    return
-                
-                # Don't update if the change is just whitespace differences
-                if clipboard_content.strip() == self.last_clipboard_content.strip() and self.last_clipboard_content:
-                    return
-                
-                # Only update if there's a meaningful change
-                if len(clipboard_content.strip()) > 0 or not self.last_clipboard_content:
-                    self.last_clipboard_content = clipboard_content
-                    self.update_clipboard_display(clipboard_content)
+            self.last_clipboard_content = clipboard_content
+            self.update_clipboard_display(clipboard_content)
+            return True
                 
         except Exception as e:
             # Silently handle clipboard access errors to avoid spam
             pass
+        return False
 
+    def render_clipboard_preview(self, clipboard_content, header_title):
+        """Show a bounded preview of clipboard_content (first page, more on scroll)"""
+        import datetime
+        timestamp = datetime.datetime.now().strftime("%H:%M:%S")
+        header = f"🕒 {header_title}: {timestamp}\n" + "="*50 + "\n"
+        
+        preview = ClipboardPreview(clipboard_content)
+        self.clipboard_preview = preview
+        
+        self.clipboard_text.config(state='normal')
+        self.clipboard_text.delete(1.0, tk.END)
+        self.clipboard_text.insert(tk.END, header, "black_text")
+        if preview.is_paged:
+            self.clipboard_text.insert(tk.END, preview.stats_line() + "\n" + "-"*50 + "\n", "preview_note")
+        # Only the inserted page is tagged; the widget never holds the full payload
+        self.clipboard_text.insert(tk.END, preview.next_page(), "black_text")
+        self.append_preview_footer(preview)
+        self.clipboard_text.config(state='disabled', fg='#000000')
+    
+    def append_preview_footer(self, preview):
+        """Add the 'scroll for more' marker or the tail window after the rendered pages"""
+        if preview.has_more_pages():
+            self.clipboard_text.insert(tk.END, "\n⋯ scroll down to load more ⋯", ("preview_note", "preview_more"))
+            return
+        tail = preview.hidden_tail()
+        if tail:
+            skipped, tail_text = tail
+            self.clipboard_text.insert(tk.END, f"\n\n⋯ {skipped:,} characters not shown ⋯\n\n", "preview_note")
+            self.clipboard_text.insert(tk.END, tail_text, "black_text")
+    
+    def on_clipboard_scroll(self, first, last):
+        """Scrollbar callback; loads the next preview page near the bottom"""
+        self.clipboard_scrollbar.set(first, last)
+        preview = self.clipboard_preview
+        if preview is not None and preview.has_more_pages() and float(last) >= 0.98:
+            # Defer so the widget is not modified from inside its own scroll callback
+            self.root.after_idle(self.load_next_preview_page, preview)
+    
+    def load_next_preview_page(self, preview):
+        """Append the next page of the current preview"""
+        if preview is not self.clipboard_preview or not preview.has_more_pages():
+            return
+        page = preview.next_page()
+        self.clipboard_text.config(state='normal')
+        marker = self.clipboard_text.tag_ranges("preview_more")
+        if marker:
+            self.clipboard_text.delete(marker[0], marker[1])
+        self.clipboard_text.insert(tk.END, page, "black_text")
+        self.append_preview_footer(preview)
+        self.clipboard_text.config(state='disabled')
+    
     def update_clipboard_display(self, clipboard_content):
         """Update the clipboard display with new content"""
         try:
-            self.clipboard_text.config(state='normal')
-            self.clipboard_text.delete(1.0, tk.END)
-            
-            # Add timestamp and content
-            import datetime
-            timestamp = datetime.datetime.now().strftime("%H:%M:%S")
-            header = f"🕒 Content updated: {timestamp}\n" + "="*50 + "\n"
-            
-            # Show full clipboard content (no truncation)
-            display_content = clipboard_content
-            
-            self.clipboard_text.insert(1.0, header + display_content)
-            
-            # Configure proper text styling
-            self.clipboard_text.tag_add("black_text", "1.0", tk.END)
-            self.clipboard_text.tag_configure("black_text", foreground="#000000", font=("Cascadia Code", 11))
-            self.clipboard_text.config(state='disabled', fg='#000000')
+            self.render_clipboard_preview(clipboard_content, "Content updated")
             
             # Show success message briefly
             self.update_status("✅ Clipboard content updated", "success")
@@ -1048,37 +1528,17 @@ class MultiCoordinatesClicker:
     def refresh_clipboard(self):
         """Manually refresh clipboard display (force update)"""
         try:
-            clipboard_content = pyperclip.paste()
-            
-            # Skip if clipboard contains JSON (likely from our own config)
-            if clipboard_content.strip().startswith('{') or clipboard_content.strip().startswith('['):
-                try:
-                    import json
-                    json.loads(clipboard_content)
-                    # If it's valid JSON, probably our config - get real clipboard
-                    clipboard_content = "No text in clipboard (contains data/JSON)"
-                except:
-                    pass  # Not JSON, continue normally
+            clipboard_content = read_clipboard_text()
             
             # Force update regardless of whether content changed
-            self.last_clipboard_content = clipboard_content
-            self.clipboard_text.config(state='normal')
-            self.clipboard_text.delete(1.0, tk.END)
+            snapshot = self.clipboard_tracker.accept(clipboard_content)
             
-            # Add timestamp and content
-            import datetime
-            timestamp = datetime.datetime.now().strftime("%H:%M:%S")
-            header = f"🕒 Manually refreshed: {timestamp}\n" + "="*50 + "\n"
-            
-            # Show full clipboard content (no truncation)
-            display_content = clipboard_content
-            
-            self.clipboard_text.insert(1.0, header + display_content)
+            # Skip if clipboard contains JSON (likely from our own config)
+            if snapshot.is_json:
+                clipboard_content = "No text in clipboard (contains data/JSON)"
             
-            # Configure proper text styling
-            self.clipboard_text.tag_add("black_text", "1.0", tk.END)
-            self.clipboard_text.tag_configure("black_text", foreground="#000000", font=("Cascadia Code", 11))
-            self.clipboard_text.config(state='disabled', fg='#000000')
+            self.last_clipboard_content = clipboard_content
+            self.render_clipboard_preview(clipboard_content, "Manually refreshed")
             
             # Show success message briefly
             self.update_status("✅ Clipboard manually refreshed", "success")
@@ -1095,32 +1555,80 @@ class MultiCoordinatesClicker:
         self.status_label.config(text=message, bg=color, fg=COLORS['dark'])
     
     def log_message(self, message, level="INFO"):
-        """Add message to logs"""
-        import datetime
-        timestamp = datetime.datetime.now().strftime("%H:%M:%S")
-        log_entry = f"[{timestamp}] {level}: {message}\n"
+        """Add message to logs (safe to call from any thread)"""
+        self.log_store.append(message, level)
+        
+        # Worker threads leave the flush to the UI queue's drain loop, which runs every frame
+        if threading.current_thread() is not threading.main_thread():
+            return
         
-        # Only log if logs_text widget exists (logs tab has been created)
-        if hasattr(self, 'logs_text') and self.logs_text:
-            self.logs_text.config(state=tk.NORMAL)
-            self.logs_text.insert(tk.END, log_entry)
-            self.logs_text.see(tk.END)
-            self.logs_text.config(state=tk.DISABLED)
+        # Batch widget updates: at most one flush per LOG_FLUSH_INTERVAL_MS
+        if self.log_flush_timer is None:
+            self.log_flush_timer = self.root.after(LOG_FLUSH_INTERVAL_MS, self.flush_logs)
+    
+    def flush_logs(self):
+        """Render buffered log records into the Logs tab and trim old lines"""
+        if self.log_flush_timer is not None:
+            self.root.after_cancel(self.log_flush_timer)
+            self.log_flush_timer = None
+        
+        # Only render once the Logs tab has been built; records wait in the ring buffer
+        if self.logs_text is None:
+            return False
+        
+        records = self.log_store.records_since(self.log_flushed_seq)
+        if not records:
+            return False
+        self.log_flushed_seq = records[-1].seq
+        
+        self.logs_text.config(state=tk.NORMAL)
+        self.logs_text.insert(tk.END, "".join(record.format() for record in records))
+        
+        # Keep the widget no larger than the ring buffer
+        line_count = int(self.logs_text.index('end-1c').split('.')[0]) - 1
+        excess = line_count - self.log_store.capacity
+        if excess > 0:
+            self.logs_text.delete('1.0', f'{excess + 1}.0')
+        
+        self.logs_text.see(tk.END)
+        self.logs_text.config(state=tk.DISABLED)
+        return True
     
     def clear_logs(self):
         """Clear all logs"""
+        self.log_store.clear()
+        self.log_flushed_seq = self.log_store.last_seq
         self.logs_text.config(state=tk.NORMAL)
         self.logs_text.delete(1.0, tk.END)
         self.logs_text.config(state=tk.DISABLED)
         self.log_message("Logs cleared", "INFO")
     
+    def export_trace(self):
+        """Save the per-step spans of recent runs (Chrome trace JSON or JSON Lines)"""
+        if not len(self.tracer):
+            messagebox.showinfo("Export Trace", "No runs have been traced yet.")
+            return
+        path = filedialog.asksaveasfilename(
+            title="Export Trace", defaultextension=".json", initialfile="sequence_trace.json",
+            filetypes=[("Chrome / Perfetto trace", "*.json"), ("JSON Lines", "*.jsonl")])
+        if not path:
+            return
+        try:
+            self.tracer.write(path)
+        except OSError as e:
+            messagebox.showerror("Export Trace", f"Could not write {path}: {str(e)}")
+            return
+        self.log_message(f"Trace exported to {path} ({len(self.tracer)} spans)", "SUCCESS")
+        if self.tracer.dropped:
+            self.log_message(f"{self.tracer.dropped} older spans were dropped", "WARNING")
+    
     def submit_action(self):
-        """Start the sequence"""
-        if self.is_running:
+        """Start the sequence (queues one run of the active profile)"""
+        if self.is_running or self.job_queue.busy:
             return
         
         try:
-            self.sequence_clipboard_content = pyperclip.paste()
+            self.sequence_clipboard_content = read_clipboard_text()
             if not self.sequence_clipboard_content.strip():
                 messagebox.showwarning("Empty Clipboard", "Please copy some text first.")
                 return
@@ -1128,95 +1636,175 @@ class MultiCoordinatesClicker:
             messagebox.showerror("Clipboard Error", f"Error: {str(e)}")
             return
         
-        self.is_running = True
-        self.submit_btn.config(state="disabled")
-        self.stop_btn.config(state="normal")
+        self.sequence_plan = self.compile_profile_plan(self.app_config["active_profile"])
+        if self.sequence_plan is None:
+            return
+        
         self.start_time = time.time()
         self.completed_count = 0
+        self.log_message(f"Starting sequence with {len(self.sequence_plan)} coordinates", "INFO")
+        self.job_queue.enqueue(self.app_config["active_profile"], self.sequence_plan,
+                               self.sequence_clipboard_content, repetitions=1, countdown=3)
+        self.set_running_controls()
+    
+    def compile_profile_plan(self, profile):
+        """Snapshot a profile into an execution plan; shows an error and returns None if invalid"""
+        # Snapshot the coordinates so edits during the run cannot affect it
+        try:
+            timing = timing_profiles.get_profile(self.app_config)
+            plan = compile_plan(config_store.profile_coordinates(self.app_config, profile), timing)
+        except PlanError as e:
+            messagebox.showerror("Invalid Coordinates", f"Profile '{profile}': {str(e)}")
+            return None
+        except ValueError as e:
+            messagebox.showerror("Invalid Timing Profile", str(e))
+            return None
+        return plan if self.check_plan_monitors(plan, profile) else None
+    
+    def check_plan_monitors(self, plan, profile):
+        """Fail fast if a step is off every connected monitor; returns True if the plan can run"""
+        layout = self.monitor_cache.get()
+        if layout is None:
+            self.log_message("Monitor layout unavailable; skipping the off-screen check", "DEBUG")
+            return True
+        
+        problems = layout.validate_plan(plan)
+        if problems:
+            for problem in problems:
+                self.log_message(problem, "ERROR")
+            shown = "\n".join(problems[:10])
+            if len(problems) > 10:
+                shown += f"\n... and {len(problems) - 10} more"
+            messagebox.showerror("Off-Screen Coordinates",
+                                 f"Profile '{profile}' has steps outside the connected monitors:\n\n{shown}\n\n"
+                                 f"Monitors: {layout.describe()}")
+            return False
+        
+        groups = layout.group_by_monitor(plan)
+        self.log_message("Steps per monitor: " + ", ".join(f"{name} {len(steps)}" for name, steps in groups.items()),
+                         "DEBUG")
+        return True
+    
+    def on_monitors_changed(self, layout):
+        """The monitor configuration changed (XRandR screen-change event)"""
+        if layout is None:
+            self.log_message("🖥️ Monitor layout changed", "INFO")
+        else:
+            self.log_message(f"🖥️ Monitor layout changed: {layout.describe()}", "INFO")
+    
+    def enqueue_from_panel(self):
+        """Queue the selected profile with the current clipboard as payload"""
+        profile = self.queue_profile_var.get()
+        try:
+            repetitions = int(self.queue_reps_var.get())
+            if repetitions < 1:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("Invalid Input", "Repetitions must be a whole number of at least 1.")
+            return
+        
+        try:
+            payload = read_clipboard_text()
+        except Exception as e:
+            messagebox.showerror("Clipboard Error", f"Error: {str(e)}")
+            return
+        if not payload.strip():
+            messagebox.showwarning("Empty Clipboard", "Please copy some text first.")
+            return
         
-        self.log_message(f"Starting sequence with {len(self.coordinates)} coordinates", "INFO")
+        plan = self.compile_profile_plan(profile)
+        if plan is None:
+            return
         
-        self.current_thread = threading.Thread(target=self.execute_sequence)
-        self.current_thread.daemon = True
-        self.current_thread.start()
+        # Only the first job after an idle queue gets the countdown
+        job = self.job_queue.enqueue(profile, plan, payload, repetitions=repetitions, idle_countdown=3)
+        self.log_message(f"Queued job {job.describe()} ({len(plan)} coordinates)", "INFO")
+        self.set_running_controls()
+    
+    def set_running_controls(self):
+        """Switch the controls to the running state"""
+        self.is_running = True
+        self.submit_btn.config(state="disabled")
+        self.stop_btn.config(state="normal")
+        self.refresh_queue_stats()
     
     def stop_action(self):
         """Stop the sequence"""
         self.is_running = False
+        dropped = self.job_queue.stop()
         self.submit_btn.config(state="normal")
         self.stop_btn.config(state="disabled")
-        self.update_status("🛑 Sequence stopped", "warning")
+        # Queued so it replaces any status the worker posted before stopping
+        self.post_status("🛑 Sequence stopped", "warning")
         self.log_message("Sequence stopped by user", "WARNING")
+        if dropped:
+            self.log_message(f"Dropped {len(dropped)} queued job(s)", "WARNING")
     
-    def execute_sequence(self):
-        """Execute the pasting sequence"""
-        try:
-            total_coords = len(self.coordinates)
-            self.progress.config(maximum=total_coords)
-            
-            # Initial delay
-            for i in range(3, 0, -1):
-                if not self.is_running:
-                    return
-                self.update_status(f"⏳ Starting in {i} seconds...", "warning")
-                time.sleep(1)
-            
-            # Process each coordinate
-            for index, coord in enumerate(self.coordinates):
-                if not self.is_running:
-                    return
-                
-                self.update_status(f"🔄 Processing {coord['name']} ({index+1}/{total_coords})", "info")
-                self.log_message(f"Processing {coord['name']} at ({coord['x']}, {coord['y']})", "INFO")
-                
-                # Move and click
-                pyautogui.moveTo(coord["x"], coord["y"], duration=0.5)
-                pyautogui.click(coord["x"], coord["y"])
-                time.sleep(0.2)
-                
-                # Restore clipboard content before pasting
-                pyperclip.copy(self.sequence_clipboard_content)
-                time.sleep(0.1) # Brief pause for clipboard to settle
-
-                # Paste
-                pyautogui.hotkey('ctrl', 'v')
-                
-                # Press Enter if configured
-                if coord["press_enter_after_paste"]:
-                    time.sleep(0.1)
-                    pyautogui.press('enter')
-                    self.log_message(f"Pressed Enter after pasting at {coord['name']}", "DEBUG")
-                
-                self.completed_count += 1
-                self.progress.config(value=index + 1)
-                self.log_message(f"Completed {coord['name']}", "SUCCESS")
-                
-                # Wait before next
-                if index < total_coords - 1:
-                    delay = coord["delay_after_action"]
-                    for i in range(int(delay * 10)):
-                        if not self.is_running:
-                            return
-                        time.sleep(0.1)
-            
-            if self.is_running:
-                total_time = int(time.time() - self.start_time)
-                self.update_status(f"✅ Completed! {total_coords} locations in {total_time}s", "success")
-                self.log_message(f"Sequence completed in {total_time} seconds", "SUCCESS")
-        
-        except Exception as e:
-            self.update_status(f"❌ Error: {str(e)}", "error")
-            self.log_message(f"Error: {str(e)}", "ERROR")
+    def on_job_started(self, job):
+        """A queued job started running"""
+        self.log_message(f"Job {job.describe()} started after waiting {job.wait_time:.1f}s", "INFO")
+        if self.clipboard_monitor.run_started():
+            self.log_message("Clipboard monitoring paused during the sequence", "INFO")
+        self.refresh_queue_stats()
+    
+    def on_job_finished(self, job):
+        """A queued job finished"""
+        if job.summaries:
+            self.completed_count = job.summaries[-1]["completed"]
+        level = "SUCCESS" if job.status == "done" else "WARNING"
+        self.log_message(f"Job {job.describe()} {job.status} in {job.duration:.1f}s", level)
+        self.refresh_queue_stats()
+    
+    def refresh_queue_stats(self):
+        """Show queue depth, wait time and job durations; repeats while jobs run"""
+        if self.queue_stats_timer is not None:
+            self.root.after_cancel(self.queue_stats_timer)
+            self.queue_stats_timer = None
+        
+        stats = self.job_queue.stats()
+        if stats["current"]:
+            text = (f"Running {stats['current']} ({stats['current_duration']:.1f}s) · "
+                    f"{stats['depth']} waiting")
+            if stats["depth"]:
+                text += f" (oldest {stats['oldest_wait']:.1f}s)"
+        else:
+            text = f"Queue: idle · {stats['completed']} job(s) done"
+        if stats["completed"]:
+            text += f" · last job waited {stats['last_wait']:.1f}s, ran {stats['last_duration']:.1f}s"
+        self.queue_stats_label.config(text=text)
         
-        finally:
-            self.is_running = False
-            self.submit_btn.config(state="normal")
-            self.stop_btn.config(state="disabled")
+        if self.job_queue.busy:
+            self.queue_stats_timer = self.root.after(500, self.refresh_queue_stats)
+    
+    def on_sequence_finished(self, summary):
+        """Reset the controls once the job queue is idle"""
+        if self.job_queue.busy:
+            # A new job was queued after the idle notification was posted
+            return
+        self.is_running = False
+        self.submit_btn.config(state="normal")
+        self.stop_btn.config(state="disabled")
+        self.refresh_queue_stats()
+        if self.clipboard_monitor.run_finished():
+            self.log_message("Clipboard monitoring resumed", "INFO")
+        self.log_message(f"Clipboard monitor: {self.clipboard_monitor.describe()}", "DEBUG")
+        if self.config_reload_pending:
+            self.config_reload_pending = False
+            self.on_config_file_changed()
+    
+    def post_status(self, message, status_type="info"):
+        """Queue a status update from any thread (only the latest is shown)"""
+        self.ui_queue.post_latest("status", message, status_type)
+    
+    def post_progress(self, value, maximum):
+        """Queue a progress update from any thread (only the latest is shown)"""
+        self.ui_queue.post_latest("progress", value, maximum)
+    
+    def update_progress(self, value, maximum):
+        """Update the sequence progress bar"""
+        self.progress.config(maximum=maximum, value=value)
 
 def main():
-    pyautogui.FAILSAFE = True
-    pyautogui.PAUSE = 0.05
-    
     root = tk.Tk()
     app = MultiCoordinatesClicker(root)
     
@@ -1229,12 +1817,10 @@ def main():
     # Handle window close event
     def on_closing():
         app.stop_auto_refresh()
-        # Clean up temporary icon file
-        try:
-            if os.path.exists("temp_app_icon.ico"):
-                os.remove("temp_app_icon.ico")
-        except:
-            pass
+        app.config_watcher.stop()
+        app.monitor_cache.close()
+        # Write any coalesced edits before exiting
+        app.config_writer.close()
         root.destroy()
     
     root.protocol("WM_DELETE_WINDOW", on_closing)
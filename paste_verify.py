@@ -0,0 +1,194 @@
+"""Paste verification by diffing small screenshots around the target
+
+A PasteVerifier captures a region around a coordinate before the paste and
+again afterwards, and reports a change when enough of the region's pixel
+values differ. Only the region is captured (a few milliseconds), and the
+capture buffers are allocated once and reused for every step.
+
+The screen source is a callable source(left, top, width, height) returning
+the region as RGB bytes (any bytes-like object of width * height * 3 bytes,
+such as bytes, a bytearray or a uint8 numpy array). The default, grab_region,
+uses Pillow's ImageGrab; tests can pass a source returning synthetic images.
+The diff is vectorized with numpy when it is installed and falls back to a
+pure Python comparison otherwise. numpy is imported on the first capture,
+not at startup.
+
+The region is kept inside the monitor showing the target (from
+monitor_layout), so targets near a screen edge or on monitors at negative
+coordinates capture a full-size region. A capture that fails raises
+CaptureError; callers then carry on as if verification were off (the paste
+is counted as unverified, but Enter is still pressed as configured).
+"""
+import operator
+
+# RGB
+CHANNELS = 3
+
+_numpy = None
+
+
+class CaptureError(Exception):
+    """Raised when the region around a target cannot be captured"""
+
+
+def load_numpy():
+    """Import numpy once; returns None if it is not installed"""
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy
+            _numpy = numpy
+        except ImportError:
+            _numpy = False
+    return _numpy or None
+
+
+def grab_region(left, top, width, height):
+    """Default screen source: the region as RGB bytes, captured with Pillow's ImageGrab"""
+    try:
+        from PIL import ImageGrab
+    except ImportError:
+        raise RuntimeError("Paste verification needs Pillow (pip install Pillow)")
+    # all_screens lets Windows capture monitors left of or above the primary one
+    image = ImageGrab.grab(bbox=(left, top, left + width, top + height), all_screens=True)
+    if image.mode != "RGB":
+        image = image.convert("RGB")
+    return image.tobytes()
+
+
+class RegionDiff:
+    """Two reusable capture buffers and the diff between them
+
+    tolerance is how much a channel value may differ (0-255) before it
+    counts as changed, which ignores compression and dithering noise.
+    """
+
+    def __init__(self, size, tolerance=0, numpy=None):
+        """numpy is the module to vectorize with (None for the pure Python diff)"""
+        self.size = size
+        self.tolerance = tolerance
+        self.numpy = numpy
+        if numpy is not None:
+            self.before = numpy.zeros(size, numpy.uint8)
+            self.after = numpy.zeros(size, numpy.uint8)
+            self._low = numpy.empty(size, numpy.uint8)
+            self._high = numpy.empty(size, numpy.uint8)
+            self._mask = numpy.empty(size, bool)
+        else:
+            self.before = bytearray(size)
+            self.after = bytearray(size)
+
+    def load(self, buffer, data):
+        """Copy a capture into one of the buffers (before or after)"""
+        size = memoryview(data).nbytes
+        if size != self.size:
+            raise ValueError(f"Screen source returned {size} bytes, expected {self.size}")
+        numpy = self.numpy
+        if numpy is not None:
+            numpy.copyto(buffer, numpy.frombuffer(data, numpy.uint8).reshape(-1))
+        else:
+            buffer[:] = data
+
+    def changed_values(self):
+        """Number of channel values that differ by more than the tolerance"""
+        before, after = self.before, self.after
+        numpy = self.numpy
+        if numpy is not None:
+            if not self.tolerance:
+                return int(numpy.count_nonzero(numpy.not_equal(before, after, out=self._mask)))
+            # |before - after| without leaving uint8: max - min
+            numpy.maximum(before, after, out=self._high)
+            numpy.minimum(before, after, out=self._low)
+            numpy.subtract(self._high, self._low, out=self._high)
+            return int(numpy.count_nonzero(numpy.greater(self._high, self.tolerance, out=self._mask)))
+        if not self.tolerance:
+            return sum(map(operator.ne, before, after))
+        tolerance = self.tolerance
+        return sum(abs(b - a) > tolerance for b, a in zip(before, after))
+
+    def changed_fraction(self):
+        return self.changed_values() / self.size if self.size else 0.0
+
+
+class PasteVerifier:
+    """Detects whether a paste changed the screen around a coordinate
+
+    width x height is the region captured around the coordinate. A paste
+    counts as visible once more than threshold (a fraction of the region's
+    channel values) changed. The runner waits up to timeout seconds for the
+    change, checking every poll_interval, and pastes at most attempts times.
+
+    monitors is a MonitorLayout, or a MonitorLayoutCache to follow monitor
+    changes; by default the layout is read once, on the first capture.
+    """
+
+    def __init__(self, source=None, width=240, height=48, threshold=0.01, tolerance=16,
+                 attempts=3, timeout=0.5, poll_interval=0.03, monitors=None):
+        if width <= 0 or height <= 0:
+            raise ValueError("Paste verification region must be at least 1x1")
+        if not 0 <= threshold < 1:
+            raise ValueError("Paste verification threshold must be between 0 and 1")
+        if attempts < 1:
+            raise ValueError("Paste verification needs at least one attempt")
+        self.source = source or grab_region
+        self.width = width
+        self.height = height
+        self.threshold = threshold
+        self.attempts = attempts
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self.tolerance = tolerance
+        self.monitors = monitors
+        # Buffers are allocated on the first capture and reused after that
+        self.diff = None
+        self.last_fraction = 0.0
+        self._region = None
+
+    def layout(self):
+        """Return the current MonitorLayout, or None if it is unknown"""
+        if self.monitors is None:
+            from monitor_layout import MonitorLayoutCache
+            self.monitors = MonitorLayoutCache(watch=False).get() or False
+        if not self.monitors:
+            return None
+        return self.monitors.get() if hasattr(self.monitors, "get") else self.monitors
+
+    def region(self, x, y):
+        """Return (left, top, width, height) of the region around (x, y), inside its monitor"""
+        width, height = self.width, self.height
+        left, top = x - width // 2, y - height // 2
+        layout = self.layout()
+        if layout is None:
+            return left, top, width, height
+        monitor = layout.monitor_at(x, y)
+        if monitor is None:
+            raise CaptureError(f"({x}, {y}) is not on any connected monitor")
+        # Shift the box back inside the monitor; shrink it only on a tiny monitor
+        width, height = min(width, monitor.width), min(height, monitor.height)
+        left = min(max(left, monitor.x), monitor.x + monitor.width - width)
+        top = min(max(top, monitor.y), monitor.y + monitor.height - height)
+        return left, top, width, height
+
+    def _capture(self, buffer_name):
+        left, top, width, height = self._region
+        try:
+            data = self.source(left, top, width, height)
+            self.diff.load(getattr(self.diff, buffer_name), data)
+        except CaptureError:
+            raise
+        except Exception as e:
+            raise CaptureError(f"capture of {width}x{height} at ({left}, {top}) failed: {e}")
+
+    def capture_before(self, x, y):
+        """Capture the region before pasting (raises CaptureError)"""
+        self._region = self.region(x, y)
+        size = self._region[2] * self._region[3] * CHANNELS
+        if self.diff is None or self.diff.size != size:
+            self.diff = RegionDiff(size, self.tolerance, load_numpy())
+        self._capture("before")
+
+    def changed(self, x, y):
+        """Capture the region again; returns True if it changed since capture_before() (raises CaptureError)"""
+        self._capture("after")
+        self.last_fraction = self.diff.changed_fraction()
+        return self.last_fraction > self.threshold
@@ -0,0 +1,409 @@
+"""Streaming payload sources for batch runs
+
+A batch run pastes many records instead of one clipboard snapshot. Records
+are read lazily from a file, one line at a time, and mapped onto the
+coordinate sequence as "passes": one pass is a tuple with the text to paste
+at each step (None skips that step) plus the number of records it consumes.
+
+Formats:
+    lines   one record per non-empty line
+    csv     one record per row (a list of cells)
+    jsonl   one JSON value per non-empty line
+
+Mapping modes:
+    round-robin  consecutive records go to consecutive coordinates
+    per-pass     every coordinate of a pass gets the same record
+    columns      column/field i of a record goes to coordinate i
+
+MappedLineSource gives random access to the records of very large files: the
+file is memory-mapped and a line-offset index is built once and saved next
+to it as <file>.idx, so a run can start at record N without rescanning.
+The index splits the raw bytes on "\n", so indexed reading needs an
+ASCII-compatible encoding (UTF-8, Latin-1, cp1252, ...); UTF-16 and UTF-32
+files are rejected and can still be read with open_records().
+"""
+import codecs
+import csv
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import time
+from array import array
+from collections import deque
+
+FORMATS = ("lines", "csv", "jsonl")
+MAPPING_MODES = ("round-robin", "per-pass", "columns")
+
+_EXTENSION_FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+
+
+def detect_format(path):
+    """Guess the record format from the file extension (default: lines)"""
+    return _EXTENSION_FORMATS.get(os.path.splitext(path)[1].lower(), "lines")
+
+
+def iter_lines(path, encoding="utf-8"):
+    """Yield each non-empty line of a text file, without its line ending"""
+    with open(path, 'r', encoding=encoding, newline='') as f:
+        for line in f:
+            line = line.rstrip("\r\n")
+            if line:
+                yield line
+
+
+def iter_csv(path, encoding="utf-8", header=False):
+    """Yield each CSV row as a list of cells, or a dict when header is True"""
+    with open(path, 'r', encoding=encoding, newline='') as f:
+        reader = csv.DictReader(f) if header else csv.reader(f)
+        for row in reader:
+            if row:
+                yield row
+
+
+def iter_jsonl(path, encoding="utf-8"):
+    """Yield each JSON value of a JSON Lines file"""
+    with open(path, 'r', encoding=encoding) as f:
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError as e:
+                raise ValueError(f"{path}, line {number}: invalid JSON ({e})")
+
+
+def open_records(path, fmt=None, encoding="utf-8", header=False):
+    """Return a lazy record iterator for path in the given (or detected) format"""
+    fmt = fmt or detect_format(path)
+    if fmt == "lines":
+        return iter_lines(path, encoding)
+    if fmt == "csv":
+        return iter_csv(path, encoding, header)
+    if fmt == "jsonl":
+        return iter_jsonl(path, encoding)
+    raise ValueError(f"Unknown batch format: {fmt}")
+
+
+def parse_record(line, fmt, fieldnames=None):
+    """Parse one line of a file into a record of the given format"""
+    if fmt == "lines":
+        return line
+    if fmt == "jsonl":
+        return json.loads(line)
+    if fmt == "csv":
+        row = next(csv.reader([line]), [])
+        return dict(zip(fieldnames, row)) if fieldnames else row
+    raise ValueError(f"Unknown batch format: {fmt}")
+
+
+# Index file: header (magic, source size, source mtime_ns, record count), then one
+# native 8-byte start offset per record. The magic records the byte order, and
+# whether whitespace-only lines were skipped as well as empty ones (JSON Lines).
+_BYTE_ORDER = b"L" if sys.byteorder == "little" else b"B"
+INDEX_MAGIC = b"MCCIDX1" + _BYTE_ORDER
+BLANK_SKIPPING_INDEX_MAGIC = b"MCCIDXW" + _BYTE_ORDER
+# Whitespace bytes.strip() removes
+_WHITESPACE = b" \t\r\n\x0b\x0c"
+INDEX_HEADER = struct.Struct("<8sQQQ")
+_INDEX_CHUNK = 65536
+
+
+def check_indexable_encoding(encoding):
+    """Raise ValueError unless line endings in encoding are the plain "\r\n" bytes"""
+    try:
+        encoder = codecs.getincrementalencoder(encoding)()
+    except LookupError:
+        raise ValueError(f"Unknown encoding: {encoding}")
+    # Encode something first so a byte order mark or signature is not counted
+    encoder.encode("a")
+    if encoder.encode("\r\n") != b"\r\n":
+        raise ValueError(f"Indexed reading needs an ASCII-compatible encoding such as utf-8, not {encoding}")
+
+
+class MappedLineSource:
+    """Random-access records of a memory-mapped file
+
+    Memory use does not grow with the file: both the file and its offset
+    index are memory-mapped. Records are the file's non-empty lines (jsonl
+    also skips whitespace-only ones, like iter_jsonl()), parsed as lines,
+    csv or jsonl (a CSV record cannot span lines). With header=True the
+    first record holds the CSV field names and is not a record itself.
+    encoding must be ASCII-compatible; others raise ValueError.
+    """
+
+    def __init__(self, path, fmt=None, encoding="utf-8", header=False, index_path=None):
+        self.path = path
+        self.fmt = fmt or detect_format(path)
+        if self.fmt not in FORMATS:
+            raise ValueError(f"Unknown batch format: {self.fmt}")
+        check_indexable_encoding(encoding)
+        self.encoding = encoding
+        self.index_path = index_path or path + ".idx"
+        # iter_jsonl() skips whitespace-only lines; iter_lines() and csv only empty ones
+        self._skip_blank = self.fmt == "jsonl"
+        self._magic = BLANK_SKIPPING_INDEX_MAGIC if self._skip_blank else INDEX_MAGIC
+        self.index_rebuilt = False
+        self._file = open(path, 'rb')
+        self._size = os.fstat(self._file.fileno()).st_size
+        # mmap cannot map an empty file
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self._size else b""
+        self._index_file = None
+        self._index_map = None
+        self._offsets = None
+        self._open_index()
+        self._first = 0
+        self.fieldnames = None
+        if header and self.fmt == "csv" and len(self._offsets):
+            self.fieldnames = next(csv.reader([self._line(0)]), [])
+            self._first = 1
+
+    def _stat_key(self):
+        stat = os.fstat(self._file.fileno())
+        return stat.st_size, stat.st_mtime_ns
+
+    def _open_index(self):
+        size, mtime_ns = self._stat_key()
+        if not self._map_index(self.index_path, size, mtime_ns):
+            self._build_index(size, mtime_ns)
+
+    def _map_index(self, index_path, size, mtime_ns, index_file=None):
+        """Map an index file if it matches the source; returns True on success"""
+        try:
+            index_file = index_file or open(index_path, 'rb')
+        except OSError:
+            return False
+        try:
+            index_map = mmap.mmap(index_file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, indexed_size, indexed_mtime, count = INDEX_HEADER.unpack_from(index_map)
+        except (OSError, ValueError, struct.error):
+            index_file.close()
+            return False
+        if (magic != self._magic or indexed_size != size or indexed_mtime != mtime_ns
+                or len(index_map) != INDEX_HEADER.size + count * 8):
+            index_map.close()
+            index_file.close()
+            return False
+        self._index_file = index_file
+        self._index_map = index_map
+        self._offsets = memoryview(index_map)[INDEX_HEADER.size:].cast('Q')
+        return True
+
+    def _write_index(self, out, size, mtime_ns):
+        """Scan the file once and write the header and record offsets to out"""
+        data = self._data
+        find = data.find if size else None
+        skip_blank = self._skip_blank
+        out.write(INDEX_HEADER.pack(self._magic, size, mtime_ns, 0))
+        offsets = array('Q')
+        count = 0
+        pos = 0
+        while pos < size:
+            end = find(b"\n", pos)
+            if end < 0:
+                end = size
+            # Skip empty lines, including a lone "\r" of a CRLF file
+            if (end > pos and not (end == pos + 1 and data[pos] == 13)
+                    and not (skip_blank and data[pos] in _WHITESPACE and not data[pos:end].strip())):
+                offsets.append(pos)
+                if len(offsets) == _INDEX_CHUNK:
+                    offsets.tofile(out)
+                    count += len(offsets)
+                    del offsets[:]
+            pos = end + 1
+        offsets.tofile(out)
+        count += len(offsets)
+        out.seek(0)
+        out.write(INDEX_HEADER.pack(self._magic, size, mtime_ns, count))
+        out.flush()
+
+    def _build_index(self, size, mtime_ns):
+        self.index_rebuilt = True
+        temp_path = self.index_path + ".tmp"
+        try:
+            with open(temp_path, 'wb') as out:
+                self._write_index(out, size, mtime_ns)
+            os.replace(temp_path, self.index_path)
+            if self._map_index(self.index_path, size, mtime_ns):
+                return
+        except OSError:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+        # Read-only location: keep the index in an anonymous temporary file
+        out = tempfile.TemporaryFile()
+        self._write_index(out, size, mtime_ns)
+        if not self._map_index(None, size, mtime_ns, index_file=out):
+            raise OSError(f"Could not index {self.path}")
+
+    def _line(self, position):
+        start = self._offsets[position]
+        end = self._data.find(b"\n", start)
+        if end < 0:
+            end = self._size
+        return self._data[start:end].rstrip(b"\r").decode(self.encoding)
+
+    def __len__(self):
+        return len(self._offsets) - self._first
+
+    def __getitem__(self, number):
+        """Return record number (0-based, negative counts from the end)"""
+        count = len(self)
+        if number < 0:
+            number += count
+        if not 0 <= number < count:
+            raise IndexError(f"Record {number} is out of range (file has {count} records)")
+        line = self._line(number + self._first)
+        try:
+            return parse_record(line, self.fmt, self.fieldnames)
+        except ValueError as e:
+            raise ValueError(f"{self.path}, record {number}: invalid {self.fmt} ({e})")
+
+    def iter_from(self, start=0):
+        """Return an iterator over the records from record start onwards"""
+        if start < 0 or start > len(self):
+            raise IndexError(f"Start record {start} is out of range (file has {len(self)} records)")
+        return map(self.__getitem__, range(start, len(self)))
+
+    def __iter__(self):
+        return self.iter_from(0)
+
+    def close(self):
+        if self._offsets is not None:
+            self._offsets.release()
+            self._offsets = None
+        for handle in (self._index_map, self._index_file, self._file):
+            if handle is not None:
+                handle.close()
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def record_text(record):
+    """Return the text to paste for a whole record"""
+    if isinstance(record, str):
+        return record
+    if isinstance(record, (list, tuple)):
+        return "\t".join(str(cell) for cell in record)
+    if isinstance(record, dict) and isinstance(record.get("text"), str):
+        return record["text"]
+    return json.dumps(record, ensure_ascii=False)
+
+
+def _field_text(value):
+    if value is None:
+        return None
+    return value if isinstance(value, str) else json.dumps(value, ensure_ascii=False)
+
+
+def record_fields(record, names):
+    """Split a record into one text per coordinate (None where it has no value)
+
+    Lists map by position; dicts map by coordinate name, falling back to the
+    position as a string key ("0", "1", ...).
+    """
+    if isinstance(record, dict):
+        return tuple(_field_text(record.get(name, record.get(str(index))))
+                     for index, name in enumerate(names))
+    if isinstance(record, (list, tuple)):
+        return tuple(_field_text(record[index]) if index < len(record) else None
+                     for index in range(len(names)))
+    # A scalar record only fills the first coordinate
+    return (record_text(record),) + (None,) * (len(names) - 1)
+
+
+def round_robin_passes(records, step_count):
+    """Group consecutive records into passes of step_count (the last may be partial)"""
+    texts = [None] * step_count
+    filled = 0
+    for record in records:
+        texts[filled] = record_text(record)
+        filled += 1
+        if filled == step_count:
+            yield tuple(texts), filled
+            texts = [None] * step_count
+            filled = 0
+    if filled:
+        yield tuple(texts), filled
+
+
+def per_pass_passes(records, step_count):
+    """Run the whole sequence once per record"""
+    for record in records:
+        yield (record_text(record),) * step_count, 1
+
+
+def column_passes(records, names):
+    """Run the whole sequence once per record, one field per coordinate"""
+    for record in records:
+        yield record_fields(record, names), 1
+
+
+def map_records(records, plan, mode="round-robin"):
+    """Return a lazy iterator of (step_payloads, record_count) passes for plan"""
+    if mode == "round-robin":
+        return round_robin_passes(records, len(plan))
+    if mode == "per-pass":
+        return per_pass_passes(records, len(plan))
+    if mode == "columns":
+        return column_passes(records, plan.names)
+    raise ValueError(f"Unknown batch mode: {mode}")
+
+
+class ThroughputCounter:
+    """Counts processed records and reports records per minute
+
+    rate() covers the whole run; recent_rate() only the last window seconds.
+    """
+
+    def __init__(self, window=60.0):
+        self.window = window
+        self.count = 0
+        self.started = None
+        self._recent = deque()
+        self._recent_total = 0
+
+    def start(self):
+        self.count = 0
+        self.started = time.monotonic()
+        self._recent.clear()
+        self._recent_total = 0
+
+    def add(self, records=1):
+        now = time.monotonic()
+        if self.started is None:
+            self.started = now
+        self.count += records
+        self._recent.append((now, records))
+        self._recent_total += records
+        cutoff = now - self.window
+        while self._recent[0][0] < cutoff:
+            self._recent_total -= self._recent.popleft()[1]
+
+    @property
+    def elapsed(self):
+        return time.monotonic() - self.started if self.started is not None else 0.0
+
+    def rate(self):
+        """Records per minute since start()"""
+        elapsed = self.elapsed
+        return self.count * 60.0 / elapsed if elapsed > 0 else 0.0
+
+    def recent_rate(self):
+        """Records per minute over the last window seconds"""
+        if not self._recent:
+            return 0.0
+        span = min(self.window, self.elapsed)
+        return self._recent_total * 60.0 / span if span > 0 else 0.0
+
+    def describe(self):
+        return f"{self.count} records, {self.rate():.1f}/min (last {self.window:.0f}s: {self.recent_rate():.1f}/min)"
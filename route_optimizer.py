@@ -0,0 +1,132 @@
+"""Travel-minimizing visiting order for a coordinate sequence
+
+The optimizer proposes an order with less total cursor travel, using nearest
+neighbour construction followed by 2-opt segment reversals. Coordinates
+marked "pinned": true must directly follow the coordinate before them, so a
+pinned run (the step before it plus every pinned step after) moves as one
+unit and keeps its internal order. The first unit stays first by default,
+since that is where the user expects the sequence to start.
+"""
+import math
+import time
+from collections import namedtuple
+
+from timing_profiles import move_time, step_timing
+
+RouteProposal = namedtuple("RouteProposal", "order original_distance optimized_distance")
+
+
+def route_units(coordinates):
+    """Split the sequence into units of indices that must stay together, in order"""
+    units = []
+    for index, coord in enumerate(coordinates):
+        if units and coord.get("pinned"):
+            units[-1].append(index)
+        else:
+            units.append([index])
+    return units
+
+
+def _distance(a, b):
+    return math.hypot(a[0] - b[0], a[1] - b[1])
+
+
+def travel_distance(coordinates, order=None):
+    """Total cursor travel in pixels when visiting coordinates in order"""
+    order = range(len(coordinates)) if order is None else order
+    points = [(coordinates[i]["x"], coordinates[i]["y"]) for i in order]
+    return sum(_distance(a, b) for a, b in zip(points, points[1:]))
+
+
+def estimate_move_time(coordinates, order, profile):
+    """Seconds spent moving the cursor when visiting coordinates in order
+
+    Uses the same move model as the executor: each step's move_duration, or
+    distance / move_speed when the step's timing sets a move_speed.
+    """
+    total = 0.0
+    previous = None
+    for index in order:
+        coord = coordinates[index]
+        timing = step_timing(profile, coord)
+        point = (coord["x"], coord["y"])
+        total += move_time(timing, None if previous is None else _distance(previous, point))
+        previous = point
+    return total
+
+
+def _nearest_neighbour(units, entry, exit_, keep_start):
+    """Greedy tour over units: always continue with the closest unvisited entry point"""
+    remaining = list(range(len(units)))
+    if keep_start:
+        route = [remaining.pop(0)]
+    else:
+        # Start with the unit whose cheapest next hop is shortest
+        route = [min(remaining, key=lambda u: min((_distance(exit_[u], entry[v]) for v in remaining if v != u),
+                                                 default=0.0))]
+        remaining.remove(route[0])
+    while remaining:
+        here = exit_[route[-1]]
+        best = min(range(len(remaining)), key=lambda k: _distance(here, entry[remaining[k]]))
+        route.append(remaining.pop(best))
+    return route
+
+
+def _two_opt(route, entry, exit_, keep_start, deadline):
+    """Reverse segments of the unit route while that shortens it (open path, fixed unit direction)"""
+    count = len(route)
+    first = 1 if keep_start else 0
+    improved = True
+    while improved and time.monotonic() < deadline:
+        improved = False
+        # Prefix sums of hop lengths walking the route forwards and backwards
+        forward = [0.0]
+        backward = [0.0]
+        for k in range(count - 1):
+            forward.append(forward[-1] + _distance(exit_[route[k]], entry[route[k + 1]]))
+            backward.append(backward[-1] + _distance(exit_[route[k + 1]], entry[route[k]]))
+        for i in range(first, count - 1):
+            if time.monotonic() >= deadline:
+                break
+            before = exit_[route[i - 1]] if i > 0 else None
+            for j in range(i + 1, count):
+                after = entry[route[j + 1]] if j + 1 < count else None
+                old = forward[j] - forward[i]
+                new = backward[j] - backward[i]
+                if before is not None:
+                    old += _distance(before, entry[route[i]])
+                    new += _distance(before, entry[route[j]])
+                if after is not None:
+                    old += _distance(exit_[route[j]], after)
+                    new += _distance(exit_[route[i]], after)
+                if new < old - 1e-9:
+                    route[i:j + 1] = route[i:j + 1][::-1]
+                    improved = True
+                    break
+            if improved:
+                break
+    return route
+
+
+def optimize_route(coordinates, keep_start=True, time_limit=2.0):
+    """Propose a visiting order (list of indices) with less cursor travel
+
+    Pinned runs are kept intact; time_limit bounds the 2-opt phase (seconds).
+    """
+    units = route_units(coordinates)
+    points = [(coord["x"], coord["y"]) for coord in coordinates]
+    entry = [points[unit[0]] for unit in units]
+    exit_ = [points[unit[-1]] for unit in units]
+
+    route = list(range(len(units)))
+    if len(units) > 2:
+        route = _nearest_neighbour(units, entry, exit_, keep_start)
+        route = _two_opt(route, entry, exit_, keep_start, time.monotonic() + time_limit)
+
+    order = [index for u in route for index in units[u]]
+    original = travel_distance(coordinates)
+    optimized = travel_distance(coordinates, order)
+    if optimized >= original:
+        # Never propose a longer route than the current one
+        order, optimized = list(range(len(coordinates))), original
+    return RouteProposal(order, original, optimized)
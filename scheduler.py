@@ -0,0 +1,57 @@
+import threading
+import time
+
+
+class DeadlineScheduler:
+    """Sleeps until monotonic deadlines and wakes immediately when cancelled
+
+    Waits block on a threading.Event, so cancel() from another thread (the
+    STOP button) ends any wait at once instead of at the next polling tick.
+    Each deadline wait records its jitter (how late the wake-up was).
+    """
+
+    def __init__(self):
+        self.cancel_event = threading.Event()
+        self.jitter = []
+
+    def reset(self):
+        """Clear the cancel flag and the jitter history before a run"""
+        self.cancel_event.clear()
+        self.jitter = []
+
+    def cancel(self):
+        """Wake every current and future wait until reset()"""
+        self.cancel_event.set()
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def deadline_after(self, seconds):
+        """Return the monotonic deadline that lies seconds from now"""
+        return time.monotonic() + seconds
+
+    def wait_until(self, deadline, record_jitter=False):
+        """Block until deadline; returns False if cancelled first"""
+        wait = self.cancel_event.wait
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            if wait(remaining):
+                return False
+        if record_jitter:
+            self.jitter.append(time.monotonic() - deadline)
+        return not self.cancel_event.is_set()
+
+    def sleep(self, seconds):
+        """Sleep for seconds; returns False if cancelled first"""
+        if seconds <= 0:
+            return not self.cancel_event.is_set()
+        return self.wait_until(time.monotonic() + seconds)
+
+    def jitter_summary(self):
+        """Return (mean, max) jitter in seconds, or None if nothing was recorded"""
+        if not self.jitter:
+            return None
+        return sum(self.jitter) / len(self.jitter), max(self.jitter)
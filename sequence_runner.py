@@ -0,0 +1,360 @@
+import time
+
+from clipboard_manager import ClipboardManager
+from execution_plan import ExecutionPlan, compile_plan
+from paste_verify import CaptureError
+from payload_sources import ThroughputCounter
+from scheduler import DeadlineScheduler
+from tracing import NullTracer, clock as trace_clock
+
+# Categories reported in the run summary's time breakdown
+TIMING_CATEGORIES = ("move", "click", "focus_settle", "clipboard_write", "clipboard_settle",
+                     "paste", "verify", "pre_enter", "enter", "delay")
+
+# Step timestamps are integer nanoseconds (shared with the tracer)
+NS = 1e-9
+
+
+def format_timings(timings):
+    """Format a time breakdown as 'move 1.50s, click 0.10s, ...'"""
+    return ", ".join(f"{category.replace('_', ' ')} {timings[category]:.2f}s"
+                     for category in TIMING_CATEGORIES if timings.get(category))
+
+
+class SequenceRunner:
+    """Runs a coordinate sequence (move, click, paste, optional Enter) on an input backend
+
+    The runner has no GUI dependencies. Callers observe progress through the
+    optional callbacks:
+        on_status(message, status_type)
+        on_log(message, level)
+        on_progress(value, maximum)
+    and can record per-step spans by passing a tracing.Tracer. Steps with
+    verify_paste set are checked with the paste_verify.PasteVerifier passed
+    as verifier (without one they are pasted unverified).
+
+    stop() stays in effect until acknowledge_stop(): a run that starts after
+    a stop request returns at once as stopped, so a stop that lands between
+    taking a job and starting it is not lost.
+    """
+
+    def __init__(self, backend, on_status=None, on_log=None, on_progress=None, tracer=None, verifier=None):
+        self.backend = backend
+        self.on_status = on_status or (lambda message, status_type="info": None)
+        self.on_log = on_log or (lambda message, level="INFO": None)
+        self.on_progress = on_progress or (lambda value, maximum: None)
+        self.is_running = False
+        self.stop_requested = False
+        self.completed_count = 0
+        self.start_time = None
+        self.clipboard = ClipboardManager(backend)
+        self.scheduler = DeadlineScheduler()
+        self.throughput = ThroughputCounter()
+        self.tracer = tracer if tracer is not None else NullTracer()
+        self.verifier = verifier
+        self._run_start = None
+
+    def stop(self):
+        """Stop the running sequence; any wait in progress ends immediately"""
+        self.stop_requested = True
+        self.is_running = False
+        self.scheduler.cancel()
+
+    def acknowledge_stop(self):
+        """Forget a handled stop request so the next run can start"""
+        self.stop_requested = False
+
+    def run(self, plan, payload, countdown=3, passes=None):
+        """Execute the pasting sequence and return a summary dict
+
+        plan is an ExecutionPlan; a list of coordinate dicts is compiled first.
+        passes, if given, is an iterable of (step_payloads, record_count) from
+        payload_sources: each pass runs the sequence once, pasting
+        step_payloads[i] at step i and skipping steps whose payload is None.
+        Without passes the sequence runs once with payload at every step.
+        """
+        if not isinstance(plan, ExecutionPlan):
+            plan = compile_plan(plan)
+
+        backend = self.backend
+        scheduler = self.scheduler
+        scheduler.reset()
+        self.is_running = True
+        self.completed_count = 0
+        self.start_time = time.time()
+        self._run_start = trace_clock()
+        total_coords = len(plan)
+        batch = passes is not None
+        if not batch:
+            passes = (((payload,) * total_coords, 1),)
+        timings = dict.fromkeys(TIMING_CATEGORIES, 0.0)
+        # A batch's step total is only known once its source is exhausted
+        summary = {"total": None if batch else total_coords, "completed": 0, "elapsed": 0.0,
+                   "stopped": False, "error": None, "timings": timings, "clipboard_writes": 0,
+                   "records": 0, "records_per_minute": 0.0, "unverified": 0}
+        # Checked after reset() so a stop that arrived before this run started still applies
+        if self.stop_requested:
+            self.is_running = False
+            return self._finish(summary)
+
+        # Local references keep the per-step loop free of attribute lookups
+        xs, ys, press_enter, delays = plan.xs, plan.ys, plan.press_enter, plan.delays
+        move_durations, focus_settles = plan.move_durations, plan.focus_settles
+        clipboard_settles, pre_enters = plan.clipboard_settles, plan.pre_enters
+        status_labels, processing_labels = plan.status_labels, plan.processing_labels
+        enter_labels, completed_labels = plan.enter_labels, plan.completed_labels
+        on_status, on_log, on_progress = self.on_status, self.on_log, self.on_progress
+        names = plan.names
+        verifier = self.verifier
+        verify_paste = plan.verify_paste if verifier is not None else (False,) * total_coords
+        clock = trace_clock
+        sleep = scheduler.sleep
+        cancel_event = scheduler.cancel_event
+        throughput = self.throughput
+        tracer = self.tracer
+        traced = tracer.enabled
+        add_span = tracer.add
+
+        clipboard = self.clipboard
+        try:
+            backend.set_pause(plan.input_pause)
+            on_progress(0, total_coords)
+            if verifier is None and any(plan.verify_paste):
+                on_log("Paste verification is not available here; verify_paste steps paste unverified", "WARNING")
+            throughput.start()
+
+            # Take clipboard ownership once; steps only re-assert it if it changed
+            clipboard.begin()
+            if not clipboard.tracking:
+                on_log(f"Clipboard change token unavailable; checking the clipboard every "
+                       f"{clipboard.compare_every} steps instead of before each paste", "INFO")
+            if not batch:
+                t0 = clock()
+                clipboard.switch(payload)
+                timings["clipboard_write"] += (clock() - t0) * NS
+            clipboard_settled = False
+
+            # Initial delay
+            countdown_traced = clock()
+            countdown_start = time.monotonic()
+            for i in range(countdown, 0, -1):
+                if not self.is_running:
+                    return self._finish(summary)
+                on_status(f"⏳ Starting in {i} seconds...", "warning")
+                if not scheduler.wait_until(countdown_start + countdown - i + 1):
+                    return self._finish(summary)
+            if traced and countdown > 0:
+                add_span("countdown", countdown_traced, clock(), "run")
+
+            # Each step's delay is waited out before the next step that runs
+            pending_delay = None
+            for pass_number, (step_payloads, record_count) in enumerate(passes, 1):
+                pass_start = clock()
+                # Process each step of the plan
+                for index in range(total_coords):
+                    text = step_payloads[index]
+                    if text is None:
+                        continue
+                    if not self.is_running:
+                        return self._finish(summary)
+
+                    # Wait before next: this step is due delay seconds after the previous one ended
+                    if pending_delay is not None:
+                        t9 = clock()
+                        completed = scheduler.wait_until(time.monotonic() + pending_delay, record_jitter=True)
+                        t10 = clock()
+                        timings["delay"] += (t10 - t9) * NS
+                        if traced:
+                            add_span("delay", t9, t10, "phase")
+                        if not completed:
+                            return self._finish(summary)
+
+                    x = xs[index]
+                    y = ys[index]
+                    on_status(status_labels[index], "info")
+                    on_log(processing_labels[index], "INFO")
+
+                    # Move and click
+                    t0 = clock()
+                    backend.move_to(x, y, duration=move_durations[index], cancel_event=cancel_event)
+                    t1 = clock()
+                    if not self.is_running:
+                        return self._finish(summary)
+                    backend.click(x, y)
+                    t2 = clock()
+                    if not sleep(focus_settles[index]):
+                        return self._finish(summary)
+                    t3 = clock()
+
+                    # Restore clipboard content before pasting (only if something replaced it)
+                    if text is clipboard.payload:
+                        rewritten = clipboard.ensure()
+                    else:
+                        rewritten = clipboard.switch(text)
+                    t4 = clock()
+                    if rewritten or not clipboard_settled:
+                        # Brief pause for clipboard to settle
+                        if not sleep(clipboard_settles[index]):
+                            return self._finish(summary)
+                        clipboard_settled = True
+                    t5 = clock()
+
+                    # Paste, capturing the target region first if the paste is verified
+                    verify = verify_paste[index]
+                    tc = t5
+                    capture_error = None
+                    if verify:
+                        try:
+                            verifier.capture_before(x, y)
+                        except CaptureError as e:
+                            capture_error = e
+                        tc = clock()
+                    backend.hotkey('ctrl', 'v')
+                    t6 = clock()
+                    tv = t6
+                    pastes = 1
+                    if verify:
+                        if capture_error is None:
+                            try:
+                                pastes = self._verify_paste(x, y, names[index])
+                            except CaptureError as e:
+                                capture_error = e
+                        if not self.is_running:
+                            return self._finish(summary)
+                        tv = clock()
+                        timings["verify"] += ((tc - t5) + (tv - t6)) * NS
+                    timings["move"] += (t1 - t0) * NS
+                    timings["click"] += (t2 - t1) * NS
+                    timings["focus_settle"] += (t3 - t2) * NS
+                    timings["clipboard_write"] += (t4 - t3) * NS
+                    timings["clipboard_settle"] += (t5 - t4) * NS
+                    timings["paste"] += (t6 - tc) * NS
+                    t8 = tv
+                    enter = press_enter[index]
+                    if capture_error is not None:
+                        # Verification could not run (e.g. no Pillow); behave as if it were off
+                        summary["unverified"] += 1
+                        on_log(f"Could not verify the paste at {names[index]}: {capture_error}", "WARNING")
+                    elif not pastes:
+                        # Nothing showed up; pressing Enter could submit an empty field
+                        summary["unverified"] += 1
+                        on_log(f"Paste not visible at {names[index]} after {verifier.attempts} attempts"
+                               + ("; skipped Enter" if enter else ""), "WARNING")
+                        enter = False
+
+                    # Press Enter if configured
+                    if enter:
+                        if not sleep(pre_enters[index]):
+                            return self._finish(summary)
+                        t7 = clock()
+                        backend.press('enter')
+                        t8 = clock()
+                        timings["pre_enter"] += (t7 - tv) * NS
+                        timings["enter"] += (t8 - t7) * NS
+                        on_log(enter_labels[index], "DEBUG")
+
+                    if traced:
+                        args = {"index": index, "x": x, "y": y}
+                        if batch:
+                            args["pass"] = pass_number
+                        add_span(names[index], t0, t8, "step", args)
+                        add_span("move", t0, t1, "phase")
+                        add_span("click", t1, t2, "phase")
+                        add_span("focus_settle", t2, t3, "phase")
+                        add_span("clipboard_write", t3, t4, "phase", {"written": bool(rewritten)})
+                        add_span("clipboard_settle", t4, t5, "phase")
+                        if verify:
+                            add_span("capture", t5, tc, "phase")
+                        add_span("paste", tc, t6, "phase")
+                        if verify:
+                            add_span("verify", t6, tv, "phase",
+                                     {"pastes": pastes, "changed": round(verifier.last_fraction, 4)})
+                        if enter:
+                            add_span("pre_enter", tv, t7, "phase")
+                            add_span("enter", t7, t8, "phase")
+
+                    self.completed_count += 1
+                    on_progress(index + 1, total_coords)
+                    on_log(completed_labels[index], "SUCCESS")
+                    pending_delay = delays[index]
+
+                throughput.add(record_count)
+                if batch:
+                    if traced:
+                        add_span(f"Pass {pass_number}", pass_start, clock(), "pass", {"records": record_count})
+                    on_log(f"📦 Pass {pass_number}: {throughput.describe()}", "INFO")
+
+            if batch:
+                summary["total"] = self.completed_count
+            if self.is_running:
+                total_time = int(time.time() - self.start_time)
+                if batch:
+                    self.on_status(f"✅ Completed! {throughput.count} records "
+                                   f"({self.completed_count} steps) in {total_time}s", "success")
+                else:
+                    self.on_status(f"✅ Completed! {total_coords} locations in {total_time}s", "success")
+                self.on_log(f"Sequence completed in {total_time} seconds", "SUCCESS")
+                self.on_log(f"Time breakdown: {format_timings(timings)}", "INFO")
+                self.on_log(f"Clipboard writes: {clipboard.writes} for {self.completed_count} steps", "DEBUG")
+                if not clipboard.tracking and clipboard.payload is not None and not clipboard.holds_payload():
+                    self.on_log("The clipboard was replaced during the run; steps since the last check "
+                                "may have pasted other content", "WARNING")
+                if summary["unverified"]:
+                    self.on_log(f"Unverified pastes: {summary['unverified']}", "WARNING")
+                if batch:
+                    self.on_log(f"Throughput: {throughput.rate():.1f} records/min", "INFO")
+                jitter = scheduler.jitter_summary()
+                if jitter:
+                    self.on_log(f"Delay jitter: mean {jitter[0]*1000:.1f} ms, max {jitter[1]*1000:.1f} ms", "DEBUG")
+
+        except Exception as e:
+            summary["error"] = str(e)
+            self.on_status(f"❌ Error: {str(e)}", "error")
+            self.on_log(f"Error: {str(e)}", "ERROR")
+
+        return self._finish(summary)
+
+    def _verify_paste(self, x, y, name):
+        """Wait for the paste to show up around (x, y), pasting again while nothing changed
+
+        Returns the number of pastes it took, or 0 if the region never
+        changed (or the run was stopped). A failed capture raises
+        CaptureError without pasting again.
+        """
+        verifier = self.verifier
+        sleep = self.scheduler.sleep
+        for attempt in range(1, verifier.attempts + 1):
+            if attempt > 1:
+                self.on_log(f"No change after pasting at {name}; pasting again "
+                            f"(attempt {attempt}/{verifier.attempts})", "WARNING")
+                self.clipboard.ensure(force=True)
+                self.backend.hotkey('ctrl', 'v')
+            # The target may take a moment to redraw; give it the timeout before pasting again
+            deadline = time.monotonic() + verifier.timeout
+            while True:
+                if verifier.changed(x, y):
+                    if attempt > 1:
+                        self.on_log(f"Paste at {name} verified on attempt {attempt}", "INFO")
+                    return attempt
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                if not sleep(min(verifier.poll_interval, remaining)):
+                    return 0
+        return 0
+
+    def _finish(self, summary):
+        """Fill in the run summary and mark the runner idle"""
+        summary["stopped"] = not self.is_running and summary["error"] is None \
+            and (summary["total"] is None or self.completed_count < summary["total"])
+        summary["completed"] = self.completed_count
+        summary["clipboard_writes"] = self.clipboard.writes
+        summary["jitter"] = list(self.scheduler.jitter)
+        summary["records"] = self.throughput.count
+        summary["records_per_minute"] = self.throughput.rate()
+        summary["elapsed"] = time.time() - self.start_time
+        self.tracer.add("run", self._run_start, trace_clock(), "run",
+                        {"completed": summary["completed"], "stopped": summary["stopped"],
+                         "error": summary["error"]})
+        self.is_running = False
+        return summary
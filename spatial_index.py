@@ -0,0 +1,119 @@
+"""Uniform-grid spatial index over screen coordinates
+
+Points are bucketed into square cells of cell_size pixels, so a radius or
+rectangle query only visits the cells it overlaps instead of every point.
+Screen coordinates can be negative (monitors left of or above the primary
+one); floor division keeps the cells consistent across zero.
+"""
+import math
+
+
+class SpatialIndex:
+    """Points keyed by id (e.g. a coordinate's "id") with proximity and area queries"""
+
+    def __init__(self, cell_size=64):
+        if cell_size <= 0:
+            raise ValueError("cell_size must be positive")
+        self.cell_size = cell_size
+        self._cells = {}
+        self._points = {}
+
+    @classmethod
+    def from_coordinates(cls, coordinates, cell_size=64):
+        """Index a list of coordinate dicts by their "id" """
+        index = cls(cell_size)
+        for coord in coordinates:
+            index.insert(coord["id"], coord["x"], coord["y"])
+        return index
+
+    def _cell(self, x, y):
+        return (math.floor(x / self.cell_size), math.floor(y / self.cell_size))
+
+    def __len__(self):
+        return len(self._points)
+
+    def __contains__(self, key):
+        return key in self._points
+
+    def position(self, key):
+        return self._points[key]
+
+    def insert(self, key, x, y):
+        """Add a point (or move it if key is already indexed)"""
+        if key in self._points:
+            self.remove(key)
+        self._points[key] = (x, y)
+        self._cells.setdefault(self._cell(x, y), []).append(key)
+
+    def remove(self, key):
+        x, y = self._points.pop(key)
+        cell = self._cell(x, y)
+        bucket = self._cells[cell]
+        bucket.remove(key)
+        if not bucket:
+            del self._cells[cell]
+
+    def clear(self):
+        self._cells.clear()
+        self._points.clear()
+
+    def _cells_in(self, x1, y1, x2, y2):
+        """Yield the buckets of the cells overlapping a rectangle"""
+        cx1, cy1 = self._cell(x1, y1)
+        cx2, cy2 = self._cell(x2, y2)
+        cells = self._cells
+        if (cx2 - cx1 + 1) * (cy2 - cy1 + 1) > len(cells):
+            # Large, sparse area: cheaper to scan the occupied cells
+            for (cx, cy), bucket in cells.items():
+                if cx1 <= cx <= cx2 and cy1 <= cy <= cy2:
+                    yield bucket
+            return
+        for cx in range(cx1, cx2 + 1):
+            for cy in range(cy1, cy2 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    yield bucket
+
+    def within(self, x, y, radius, exclude=None):
+        """Return [(distance, key)] of the points within radius of (x, y), nearest first"""
+        points = self._points
+        limit = radius * radius
+        found = []
+        for bucket in self._cells_in(x - radius, y - radius, x + radius, y + radius):
+            for key in bucket:
+                if key == exclude:
+                    continue
+                px, py = points[key]
+                squared = (px - x) ** 2 + (py - y) ** 2
+                if squared <= limit:
+                    found.append((math.sqrt(squared), key))
+        found.sort()
+        return found
+
+    def nearest(self, x, y, radius, exclude=None):
+        """Return (distance, key) of the nearest point within radius, or None"""
+        found = self.within(x, y, radius, exclude)
+        return found[0] if found else None
+
+    def in_rect(self, x1, y1, x2, y2):
+        """Return the keys of the points inside a rectangle (edges included, corners in any order)"""
+        x1, x2 = min(x1, x2), max(x1, x2)
+        y1, y2 = min(y1, y2), max(y1, y2)
+        points = self._points
+        keys = []
+        for bucket in self._cells_in(x1, y1, x2, y2):
+            for key in bucket:
+                px, py = points[key]
+                if x1 <= px <= x2 and y1 <= py <= y2:
+                    keys.append(key)
+        return keys
+
+    def close_pairs(self, radius):
+        """Return [(distance, key_a, key_b)] of point pairs closer than radius, nearest first"""
+        pairs = []
+        for key, (x, y) in self._points.items():
+            for distance, other in self.within(x, y, radius, exclude=key):
+                if key < other:
+                    pairs.append((distance, key, other))
+        pairs.sort()
+        return pairs
@@ -0,0 +1,41 @@
+import os
+import sys
+import threading
+
+import pytest
+
+# The modules live at the top of the repository
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class FakeRoot:
+    """Stands in for a Tk root: after() callbacks run when the test calls run_next()
+
+    threads records the threads that called into it (Tk is only safe from one).
+    """
+
+    def __init__(self):
+        self.timers = {}
+        self.delays = []
+        self.threads = set()
+        self._next_id = 0
+
+    def after(self, ms, callback):
+        self.threads.add(threading.current_thread().name)
+        self._next_id += 1
+        self.timers[self._next_id] = callback
+        self.delays.append(ms)
+        return self._next_id
+
+    def after_cancel(self, timer_id):
+        self.threads.add(threading.current_thread().name)
+        self.timers.pop(timer_id, None)
+
+    def run_next(self):
+        timer_id = min(self.timers)
+        self.timers.pop(timer_id)()
+
+
+@pytest.fixture
+def fake_root():
+    return FakeRoot()
@@ -0,0 +1,57 @@
+from clipboard_manager import ClipboardManager
+from input_backends import RecordingBackend
+
+
+class UntrackedBackend(RecordingBackend):
+    """A clipboard without a change token that counts reads (each could be an xclip process)"""
+
+    def __init__(self):
+        super().__init__()
+        self.reads = 0
+
+    def clipboard_change_token(self):
+        return None
+
+    def read_clipboard(self):
+        self.reads += 1
+        return self.clipboard
+
+
+def test_token_skips_reads():
+    backend = RecordingBackend()
+    manager = ClipboardManager(backend)
+    manager.set_payload("payload")
+    assert manager.tracking
+    assert not any(manager.ensure() for _ in range(50))
+    assert manager.writes == 1
+
+
+def test_untracked_clipboard_is_compared_every_n_steps():
+    backend = UntrackedBackend()
+    manager = ClipboardManager(backend, compare_every=10)
+    manager.set_payload("payload")
+    assert not manager.tracking
+    for _ in range(50):
+        manager.ensure()
+    assert backend.reads == 5
+    assert manager.writes == 1
+
+
+def test_untracked_clipboard_is_restored_at_the_next_check():
+    backend = UntrackedBackend()
+    manager = ClipboardManager(backend, compare_every=3)
+    manager.set_payload("payload")
+    backend.clipboard = "copied by someone else"
+    assert not manager.holds_payload()
+    results = [manager.ensure() for _ in range(3)]
+    assert results == [False, False, True]
+    assert backend.clipboard == "payload"
+
+
+def test_forced_check_reads_immediately():
+    backend = UntrackedBackend()
+    manager = ClipboardManager(backend)
+    manager.set_payload("payload")
+    backend.clipboard = "other"
+    assert manager.ensure(force=True)
+    assert backend.reads == 1
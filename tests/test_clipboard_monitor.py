@@ -0,0 +1,27 @@
+from clipboard_monitor import ClipboardMonitor
+
+
+def test_reconfigure_while_paused_resumes_after_the_run(fake_root):
+    monitor = ClipboardMonitor(fake_root, lambda: False, {"strategy": "fixed", "pause_while_running": True})
+    monitor.start()
+    assert monitor.run_started()
+    assert not fake_root.timers
+
+    # Settings applied mid-run (Settings tab or a config reload)
+    assert monitor.configure({"strategy": "fixed", "interval_ms": 500, "pause_while_running": True})
+    assert monitor.paused
+    assert not fake_root.timers
+
+    assert monitor.run_finished()
+    assert monitor.active_strategy == "fixed"
+    assert not monitor.paused
+    assert fake_root.delays[-1] == 500
+    assert len(fake_root.timers) == 1
+
+
+def test_reconfigure_while_stopped_stays_stopped(fake_root):
+    monitor = ClipboardMonitor(fake_root, lambda: False, {"strategy": "fixed"})
+    assert monitor.configure({"strategy": "adaptive"})
+    assert not monitor.running
+    assert not monitor.run_finished()
+    assert not fake_root.timers
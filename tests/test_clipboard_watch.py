@@ -0,0 +1,92 @@
+"""Clipboard change detection: XFixes events (needs an X display, e.g. Xvfb) and the fallbacks"""
+import ctypes
+import os
+import sys
+import threading
+
+import pytest
+
+import clipboard_watch
+from clipboard_monitor import ClipboardMonitor
+from clipboard_watch import AdaptivePoller, X11SelectionOwnerProbe, XFixesClipboardWatcher
+
+
+@pytest.fixture
+def tk_root():
+    if not sys.platform.startswith('linux') or not os.environ.get('DISPLAY'):
+        pytest.skip("needs an X display (run under Xvfb)")
+    tkinter = pytest.importorskip("tkinter")
+    try:
+        root = tkinter.Tk()
+    except tkinter.TclError as e:
+        pytest.skip(f"cannot open the display: {e}")
+    root.withdraw()
+    yield root
+    root.destroy()
+
+
+def take_clipboard(root, text):
+    """Make the Tk window the CLIPBOARD owner"""
+    root.clipboard_clear()
+    root.clipboard_append(text)
+    root.update()
+
+
+def test_xfixes_watcher_reports_owner_change(tk_root):
+    if not XFixesClipboardWatcher.is_supported():
+        pytest.skip("libXfixes is not available")
+    changed = threading.Event()
+    watcher = XFixesClipboardWatcher(changed.set)
+    assert watcher.start()
+    try:
+        take_clipboard(tk_root, "first copy")
+        assert changed.wait(2.0), "no owner-change event after a copy"
+    finally:
+        watcher.stop()
+    assert not watcher.running
+
+
+def test_selection_owner_probe_sees_new_owner(tk_root):
+    probe = X11SelectionOwnerProbe()
+    if not probe.available:
+        pytest.skip("libX11 is not available")
+    try:
+        take_clipboard(tk_root, "owned by tk")
+        assert probe.owner() != 0
+    finally:
+        probe.close()
+
+
+def test_missing_libxfixes_falls_back_to_polling(monkeypatch, fake_root):
+    if not sys.platform.startswith('linux'):
+        pytest.skip("XFixes is only used on Linux")
+    real_cdll = ctypes.CDLL
+
+    def cdll(name, *args, **kwargs):
+        if "Xfixes" in str(name):
+            raise OSError(f"{name}: cannot open shared object file")
+        return real_cdll(name, *args, **kwargs)
+
+    monkeypatch.setenv("DISPLAY", os.environ.get("DISPLAY", ":99"))
+    monkeypatch.setattr(clipboard_watch, "_x11_libs", None)
+    monkeypatch.setattr(ctypes, "CDLL", cdll)
+
+    assert clipboard_watch.load_x11_libraries() is None
+    assert not XFixesClipboardWatcher.is_supported()
+    assert not XFixesClipboardWatcher(lambda: None).start()
+
+    monitor = ClipboardMonitor(fake_root, lambda: False, {"strategy": "event"})
+    assert monitor.start() == "adaptive"
+    monitor.stop()
+
+
+def test_adaptive_poller_backs_off_and_resets_on_change(fake_root):
+    root = fake_root
+    results = iter([False, False, False, True, False])
+    poller = AdaptivePoller(root, lambda: next(results), min_interval=100, max_interval=300, backoff=2.0)
+    poller.start()
+    for _ in range(5):
+        root.run_next()
+    assert root.delays == [100, 200, 300, 300, 100, 200]
+    poller.stop()
+    assert not poller.running and not root.timers
@@ -0,0 +1,16 @@
+import pytest
+
+from execution_plan import PlanError, compile_plan
+
+
+@pytest.mark.parametrize("delay", [float("nan"), float("inf"), "-inf", "NaN", -0.5])
+def test_delay_must_be_finite_and_not_negative(delay):
+    with pytest.raises(PlanError, match="delay_after_action"):
+        compile_plan([{"name": "Field", "x": 1, "y": 2, "delay_after_action": delay}])
+
+
+def test_plan_fields_are_read_only():
+    plan = compile_plan([{"name": "Field", "x": 1, "y": 2, "delay_after_action": 0.25}])
+    assert plan.delays[0] == 0.25
+    with pytest.raises(TypeError):
+        plan.xs[0] = 5
@@ -0,0 +1,41 @@
+import threading
+
+from execution_plan import compile_plan
+from input_backends import RecordingBackend
+from job_queue import JobQueue
+from sequence_runner import SequenceRunner
+from timing_profiles import TimingProfile
+
+ZERO_TIMING = TimingProfile(0, 0, 0, 0, 0, 0)
+PLAN = compile_plan([{"name": f"Step {i}", "x": i, "y": 0} for i in range(3)], ZERO_TIMING)
+
+
+def test_stop_between_taking_a_job_and_running_it_is_not_lost():
+    backend = RecordingBackend()
+    runner = SequenceRunner(backend)
+    jobs = JobQueue(runner, on_job_started=lambda job: jobs.stop())
+    job = jobs.enqueue("Default", PLAN, "payload")
+    assert jobs.wait_idle(timeout=5)
+    assert job.status == "stopped"
+    assert "click" not in backend.actions()
+
+
+def test_stop_while_idle_does_not_stop_the_next_job():
+    backend = RecordingBackend()
+    jobs = JobQueue(SequenceRunner(backend))
+    jobs.stop()
+    job = jobs.enqueue("Default", PLAN, "payload")
+    assert jobs.wait_idle(timeout=5)
+    assert job.status == "done"
+    assert backend.actions().count("click") == 3
+
+
+def test_idle_countdown_only_for_the_job_that_starts_the_queue():
+    release = threading.Event()
+    jobs = JobQueue(SequenceRunner(RecordingBackend()), on_job_started=lambda job: release.wait(5))
+    first = jobs.enqueue("Default", PLAN, "payload", idle_countdown=0)
+    second = jobs.enqueue("Default", PLAN, "payload", idle_countdown=3)
+    release.set()
+    assert jobs.wait_idle(timeout=5)
+    assert second.countdown == 0
+    assert first.status == second.status == "done"
@@ -0,0 +1,158 @@
+import sys
+
+import pytest
+
+from execution_plan import compile_plan
+from input_backends import RecordingBackend
+from monitor_layout import Monitor, MonitorLayout
+from paste_verify import CHANNELS, CaptureError, PasteVerifier
+from sequence_runner import SequenceRunner
+from timing_profiles import TimingProfile
+
+ZERO_TIMING = TimingProfile(0, 0, 0, 0, 0, 0)
+SCREEN = MonitorLayout([Monitor("main", 0, 0, 1920, 1080, True)])
+
+
+class PasteScreen(RecordingBackend):
+    """A screen whose region around the target changes once a paste lands
+
+    lands_on is the paste (Ctrl+V) that shows up; None means no paste ever
+    does. source() is the verifier's screen source and records each region.
+    """
+
+    def __init__(self, lands_on=1):
+        super().__init__()
+        self.lands_on = lands_on
+        self.pastes = 0
+        self.regions = []
+
+    def hotkey(self, *keys):
+        super().hotkey(*keys)
+        self.pastes += 1
+
+    def source(self, left, top, width, height):
+        self.regions.append((left, top, width, height))
+        landed = self.lands_on is not None and self.pastes >= self.lands_on
+        return bytes([200 if landed else 0]) * (width * height * CHANNELS)
+
+
+def make_verifier(source, **options):
+    options.setdefault("monitors", SCREEN)
+    return PasteVerifier(source, width=20, height=10, attempts=3, timeout=0.02, poll_interval=0.005,
+                         **options)
+
+
+def run_steps(screen, verifier, steps=1, x=100, y=100):
+    coordinates = [{"name": f"Field {i}", "x": x, "y": y, "press_enter_after_paste": True,
+                    "verify_paste": True} for i in range(steps)]
+    runner = SequenceRunner(screen, verifier=verifier)
+    return runner.run(compile_plan(coordinates, ZERO_TIMING), "payload", countdown=0)
+
+
+def striped(changed, width=20, height=10):
+    """A region in which the first `changed` channel values differ from a blank one"""
+    size = width * height * CHANNELS
+    return bytes([255]) * changed + bytes(size - changed)
+
+
+def test_change_must_exceed_the_threshold():
+    frames = []
+    verifier = make_verifier(lambda *region: frames.pop(0), threshold=0.1, tolerance=0)
+    size = 20 * 10 * CHANNELS
+    # Exactly at the threshold is not enough, one value more is
+    frames[:] = [bytes(size), striped(size // 10)]
+    verifier.capture_before(100, 100)
+    assert not verifier.changed(100, 100)
+    frames[:] = [bytes(size), striped(size // 10 + 1)]
+    verifier.capture_before(100, 100)
+    assert verifier.changed(100, 100)
+
+
+def test_differences_within_the_tolerance_are_ignored():
+    size = 20 * 10 * CHANNELS
+    frames = [bytes(size), bytes([10]) * size]
+    verifier = make_verifier(lambda *region: frames.pop(0), tolerance=16)
+    verifier.capture_before(100, 100)
+    assert not verifier.changed(100, 100)
+    assert verifier.last_fraction == 0.0
+
+
+def test_paste_that_lands_on_a_retry_is_verified():
+    screen = PasteScreen(lands_on=2)
+    summary = run_steps(screen, make_verifier(screen.source))
+    assert screen.pastes == 2
+    assert summary["unverified"] == 0
+    assert screen.actions().count("press") == 1
+
+
+def test_retries_are_bounded_and_enter_is_skipped():
+    screen = PasteScreen(lands_on=None)
+    verifier = make_verifier(screen.source)
+    summary = run_steps(screen, verifier, steps=2)
+    assert screen.pastes == 2 * verifier.attempts
+    assert summary["unverified"] == 2
+    assert summary["completed"] == 2
+    assert "press" not in screen.actions()
+
+
+def test_region_is_kept_inside_the_monitor_at_the_edge():
+    layout = MonitorLayout([Monitor("left", -1920, 0, 1920, 1080, False),
+                            Monitor("main", 0, 0, 2560, 1440, True)])
+    verifier = PasteVerifier(width=240, height=48, monitors=layout)
+    assert verifier.region(-1915, 3) == (-1920, 0, 240, 48)
+    assert verifier.region(-2, 1070) == (-240, 1032, 240, 48)
+    assert verifier.region(2555, 1435) == (2320, 1392, 240, 48)
+    assert verifier.region(1000, 500) == (880, 476, 240, 48)
+
+
+def test_region_shrinks_to_a_small_monitor():
+    layout = MonitorLayout([Monitor("tiny", 0, 0, 100, 30, True)])
+    verifier = PasteVerifier(width=240, height=48, monitors=layout)
+    assert verifier.region(50, 15) == (0, 0, 100, 30)
+
+
+def test_edge_target_is_captured_full_size():
+    screen = PasteScreen()
+    summary = run_steps(screen, make_verifier(screen.source), x=1919, y=0)
+    assert summary["unverified"] == 0
+    assert set(screen.regions) == {(1900, 0, 20, 10)}
+
+
+def test_target_off_every_monitor_is_unverified():
+    screen = PasteScreen()
+    verifier = make_verifier(screen.source)
+    with pytest.raises(CaptureError):
+        verifier.region(5000, 100)
+    summary = run_steps(screen, verifier, x=5000)
+    assert summary["error"] is None
+    assert summary["unverified"] == 1
+    assert screen.pastes == 1
+    assert screen.actions().count("press") == 1
+
+
+def failing_source(left, top, width, height):
+    raise OSError("screen grab failed")
+
+
+def short_source(left, top, width, height):
+    return bytes(7)
+
+
+@pytest.mark.parametrize("source", [failing_source, short_source], ids=["raises", "wrong-size"])
+def test_failed_capture_is_unverified_and_enter_is_still_pressed(source):
+    screen = PasteScreen()
+    summary = run_steps(screen, make_verifier(source), steps=2)
+    assert summary["error"] is None
+    assert summary["completed"] == 2
+    assert summary["unverified"] == 2
+    # One paste per step: a capture failure is not retried
+    assert screen.pastes == 2
+    assert screen.actions().count("press") == 2
+
+
+def test_missing_pillow_still_presses_enter(monkeypatch):
+    monkeypatch.setitem(sys.modules, "PIL", None)
+    screen = PasteScreen()
+    summary = run_steps(screen, make_verifier(None))
+    assert summary["unverified"] == 1
+    assert screen.actions().count("press") == 1
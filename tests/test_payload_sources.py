@@ -0,0 +1,70 @@
+import pytest
+
+from payload_sources import MappedLineSource, open_records
+
+
+@pytest.mark.parametrize("encoding", ["utf-16", "utf-32-le"])
+def test_indexed_reader_rejects_encodings_that_are_not_ascii_compatible(tmp_path, encoding):
+    path = tmp_path / "records.txt"
+    path.write_text("first\nsecond\n", encoding=encoding)
+    with pytest.raises(ValueError, match="ASCII-compatible"):
+        MappedLineSource(str(path), encoding=encoding)
+    assert not (tmp_path / "records.txt.idx").exists()
+
+
+def test_indexed_reader_decodes_ascii_compatible_encodings(tmp_path):
+    path = tmp_path / "records.txt"
+    path.write_text("café\nnaïve\n", encoding="latin-1")
+    with MappedLineSource(str(path), encoding="latin-1") as source:
+        assert list(source) == ["café", "naïve"]
+
+
+LINE_FILES = {
+    "plain": b"alpha\nbeta\ngamma\n",
+    "no-final-newline": b"alpha\nbeta\ngamma",
+    "empty-last-line": b"alpha\nbeta\n\n",
+    "blank-lines": b"\nalpha\n\n\nbeta\n",
+    "crlf": b"alpha\r\nbeta\r\n\r\ngamma\r\n",
+    "crlf-empty-last-line": b"alpha\r\nbeta\r\n\r\n",
+    "unicode": "café\n☃ snow\n".encode("utf-8"),
+    "empty": b"",
+}
+
+
+@pytest.mark.parametrize("data", LINE_FILES.values(), ids=LINE_FILES.keys())
+def test_indexed_records_match_the_streaming_reader(tmp_path, data):
+    path = tmp_path / "records.txt"
+    path.write_bytes(data)
+    expected = list(open_records(str(path)))
+    with MappedLineSource(str(path)) as source:
+        assert len(source) == len(expected)
+        assert [source[n] for n in range(len(source))] == expected
+        for start in range(len(expected) + 1):
+            assert list(source.iter_from(start)) == expected[start:]
+
+
+@pytest.mark.parametrize("fmt, data", [
+    ("csv", b"name,city\r\nAda,London\r\n\r\n\"Lovelace, A\",Paris\r\n"),
+    ("jsonl", b'{"text": "one"}\n\n  \n[1, 2]\r\n"three"\n'),
+])
+def test_indexed_csv_and_jsonl_match_the_streaming_reader(tmp_path, fmt, data):
+    path = tmp_path / f"records.{fmt}"
+    path.write_bytes(data)
+    expected = list(open_records(str(path), header=True))
+    with MappedLineSource(str(path), header=True) as source:
+        assert list(source) == expected
+        assert source[-1] == expected[-1]
+
+
+def test_index_is_reused_until_the_file_changes(tmp_path):
+    path = tmp_path / "records.txt"
+    path.write_bytes(b"alpha\nbeta\n")
+    with MappedLineSource(str(path)) as source:
+        assert source.index_rebuilt
+    with MappedLineSource(str(path)) as source:
+        assert not source.index_rebuilt
+        assert source[1] == "beta"
+    path.write_bytes(b"alpha\nbeta\ngamma, a longer record\n")
+    with MappedLineSource(str(path)) as source:
+        assert source.index_rebuilt
+        assert source[2] == "gamma, a longer record"
@@ -0,0 +1,50 @@
+import random
+
+from route_optimizer import optimize_route, route_units, travel_distance
+
+
+def scattered(count, seed, pinned_every=0):
+    rng = random.Random(seed)
+    return [{"name": f"Step {i}", "x": rng.randint(-2500, 2500), "y": rng.randint(0, 1400),
+             "pinned": bool(pinned_every) and i % pinned_every == 0 and i > 0}
+            for i in range(count)]
+
+
+def test_pinned_steps_stay_right_after_the_step_before_them():
+    for seed in range(20):
+        coordinates = scattered(30, seed, pinned_every=4)
+        order = optimize_route(coordinates).order
+        assert sorted(order) == list(range(len(coordinates)))
+        assert order[0] == 0
+        for position, index in enumerate(order):
+            if coordinates[index]["pinned"]:
+                assert order[position - 1] == index - 1
+
+
+def test_route_is_never_longer_than_the_input():
+    for seed in range(20):
+        coordinates = scattered(25, seed, pinned_every=seed % 5)
+        proposal = optimize_route(coordinates)
+        assert proposal.original_distance == travel_distance(coordinates)
+        assert proposal.optimized_distance == travel_distance(coordinates, proposal.order)
+        assert proposal.optimized_distance <= proposal.original_distance
+
+
+def test_an_already_optimal_route_is_kept():
+    coordinates = [{"name": f"Step {i}", "x": i * 100, "y": 0} for i in range(6)]
+    proposal = optimize_route(coordinates)
+    assert proposal.order == list(range(6))
+    assert proposal.optimized_distance == proposal.original_distance
+
+
+def test_zigzag_is_untangled():
+    xs = [0, 400, 100, 300, 200]
+    coordinates = [{"name": f"Step {i}", "x": x, "y": 0} for i, x in enumerate(xs)]
+    proposal = optimize_route(coordinates)
+    assert [coordinates[i]["x"] for i in proposal.order] == [0, 100, 200, 300, 400]
+
+
+def test_units_group_pinned_runs():
+    coordinates = [{"x": 0, "y": 0}, {"x": 1, "y": 0, "pinned": True}, {"x": 2, "y": 0},
+                   {"x": 3, "y": 0, "pinned": True}, {"x": 4, "y": 0, "pinned": True}]
+    assert route_units(coordinates) == [[0, 1], [2, 3, 4]]
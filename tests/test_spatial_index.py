@@ -0,0 +1,53 @@
+import math
+import random
+
+from spatial_index import SpatialIndex
+
+
+def brute_force_within(points, x, y, radius):
+    found = [(math.hypot(px - x, py - y), key) for key, (px, py) in points.items()]
+    return sorted(item for item in found if item[0] <= radius)
+
+
+def test_neighbours_across_cell_borders():
+    index = SpatialIndex(cell_size=64)
+    index.insert("left", 63, 10)
+    index.insert("right", 64, 10)
+    index.insert("below", 63, 70)
+    assert index.nearest(63, 10, 5, exclude="left") == (1.0, "right")
+    assert [key for _, key in index.within(63, 10, 59)] == ["left", "right"]
+    assert [key for _, key in index.within(64, 39, 40)] == ["right", "left", "below"]
+
+
+def test_negative_coordinates_share_cells_correctly():
+    index = SpatialIndex(cell_size=64)
+    index.insert("a", -1, -1)
+    index.insert("b", 0, 0)
+    index.insert("c", -64, -1)
+    index.insert("d", -65, -1)
+    assert index.nearest(-1, -1, 2, exclude="a") == (math.sqrt(2), "b")
+    assert [key for _, key in index.within(-64, -1, 1)] == ["c", "d"]
+    assert sorted(index.in_rect(-65, -1, 0, 0)) == ["a", "b", "c", "d"]
+    assert index.in_rect(-2, 0, -63, -2) == []
+
+
+def test_queries_match_a_brute_force_scan():
+    rng = random.Random(7)
+    points = {f"p{i}": (rng.randint(-3000, 3000), rng.randint(-2000, 2000)) for i in range(400)}
+    index = SpatialIndex(cell_size=50)
+    for key, (x, y) in points.items():
+        index.insert(key, x, y)
+    for _ in range(50):
+        x, y, radius = rng.randint(-3000, 3000), rng.randint(-2000, 2000), rng.choice((10, 75, 400))
+        assert index.within(x, y, radius) == brute_force_within(points, x, y, radius)
+
+
+def test_moved_and_removed_points_leave_their_old_cell():
+    index = SpatialIndex(cell_size=64)
+    index.insert("a", 10, 10)
+    index.insert("a", -500, 300)
+    assert index.within(10, 10, 20) == []
+    assert index.nearest(-500, 300, 1) == (0.0, "a")
+    index.remove("a")
+    assert len(index) == 0
+    assert index.within(-500, 300, 10) == []
@@ -0,0 +1,16 @@
+import pytest
+
+from timing_profiles import TIMING_FIELDS, profile_from_dict
+
+
+@pytest.mark.parametrize("field", TIMING_FIELDS)
+@pytest.mark.parametrize("value", [float("nan"), float("inf"), "inf", -1])
+def test_timing_fields_must_be_finite_and_not_negative(field, value):
+    with pytest.raises(ValueError, match=field):
+        profile_from_dict({field: value})
+
+
+def test_missing_fields_come_from_the_base_profile():
+    profile = profile_from_dict({"focus_settle": "0.3"})
+    assert profile.focus_settle == 0.3
+    assert profile.move_duration == 0.5
@@ -0,0 +1,110 @@
+import json
+
+import config_store
+from tree_sync import TreeSync
+
+
+class FakeTree:
+    """The flat part of the ttk.Treeview interface that TreeSync uses"""
+
+    def __init__(self):
+        self.children = []
+        self.values = {}
+        self.calls = []
+
+    def get_children(self):
+        return tuple(self.children)
+
+    def insert(self, parent, index, iid, values, tags=()):
+        self.calls.append("insert")
+        self.children.insert(index, iid)
+        self.values[iid] = values
+
+    def move(self, iid, parent, index):
+        self.calls.append("move")
+        self.children.remove(iid)
+        self.children.insert(index, iid)
+
+    def item(self, iid, values):
+        self.calls.append("item")
+        self.values[iid] = values
+
+    def delete(self, *iids):
+        self.calls.append("delete")
+        for iid in iids:
+            self.children.remove(iid)
+            del self.values[iid]
+
+
+def coordinate_rows(config):
+    return [(coord["id"], (coord["name"], coord["x"], coord["y"]))
+            for coord in config_store.profile_coordinates(config)]
+
+
+def test_reloading_a_file_without_ids_changes_no_rows(tmp_path):
+    path = str(tmp_path / "coordinates_config.json")
+    coordinates = [{"name": "Search", "x": 10, "y": 20},
+                   {"name": "Search", "x": 30, "y": 40},
+                   {"name": "Notes", "x": 50, "y": 60}]
+    sync = TreeSync(FakeTree())
+    counts = []
+    for _ in range(3):
+        # Another tool rewrites the file, still without ids
+        with open(path, "w") as f:
+            json.dump(coordinates, f)
+        counts.append(sum(sync.sync(coordinate_rows(config_store.load_config(path))).values()))
+    assert counts == [3, 0, 0]
+
+
+def rows(*ids):
+    return [(iid, (iid.upper(),)) for iid in ids]
+
+
+def test_insert_into_an_empty_tree():
+    tree = FakeTree()
+    stats = TreeSync(tree).sync(rows("a", "b", "c"))
+    assert tree.children == ["a", "b", "c"]
+    assert stats == {"inserted": 3, "moved": 0, "updated": 0, "deleted": 0}
+
+
+def test_unchanged_rows_touch_nothing():
+    tree = FakeTree()
+    sync = TreeSync(tree)
+    sync.sync(rows("a", "b", "c"))
+    tree.calls.clear()
+    assert sum(sync.sync(rows("a", "b", "c")).values()) == 0
+    assert tree.calls == []
+
+
+def test_delete_and_insert_in_the_middle():
+    tree = FakeTree()
+    sync = TreeSync(tree)
+    sync.sync(rows("a", "b", "c", "d"))
+    stats = sync.sync(rows("a", "x", "c", "d"))
+    assert tree.children == ["a", "x", "c", "d"]
+    assert stats == {"inserted": 1, "moved": 0, "updated": 0, "deleted": 1}
+
+
+def test_reorder_moves_rows_without_recreating_them():
+    tree = FakeTree()
+    sync = TreeSync(tree)
+    sync.sync(rows("a", "b", "c", "d", "e"))
+    stats = sync.sync(rows("e", "a", "b", "c", "d"))
+    assert tree.children == ["e", "a", "b", "c", "d"]
+    assert stats == {"inserted": 0, "moved": 1, "updated": 0, "deleted": 0}
+
+    tree.calls.clear()
+    for order in ("acdeb", "edcba", "badce"):
+        stats = sync.sync(rows(*order))
+        assert tree.children == list(order)
+        assert stats["inserted"] == stats["deleted"] == stats["updated"] == 0
+    assert set(tree.calls) == {"move"}
+
+
+def test_changed_values_update_in_place():
+    tree = FakeTree()
+    sync = TreeSync(tree)
+    sync.sync(rows("a", "b"))
+    stats = sync.sync([("a", ("A",)), ("b", ("B, edited",))])
+    assert tree.values["b"] == ("B, edited",)
+    assert stats == {"inserted": 0, "moved": 0, "updated": 1, "deleted": 0}
@@ -0,0 +1,57 @@
+import threading
+
+from ui_queue import UiUpdateQueue
+
+
+def test_worker_posts_make_no_tk_calls(fake_root):
+    updates = UiUpdateQueue(fake_root)
+    handled = []
+    updates.register("finished", handled.append)
+    updates.register("status", lambda text: handled.append(("status", text)))
+
+    def worker():
+        for i in range(3):
+            updates.post_latest("status", f"step {i}")
+        updates.post("finished", "done")
+
+    thread = threading.Thread(target=worker, name="worker")
+    thread.start()
+    thread.join()
+    fake_root.run_next()
+
+    assert handled == [("status", "step 2"), "done"]
+    assert fake_root.threads == {threading.current_thread().name}
+
+
+def test_drain_loop_keeps_running_while_idle(fake_root):
+    updates = UiUpdateQueue(fake_root)
+    for _ in range(100):
+        fake_root.run_next()
+    handled = []
+    updates.register("finished", handled.append)
+    thread = threading.Thread(target=updates.post, args=("finished", 1))
+    thread.start()
+    thread.join()
+    fake_root.run_next()
+    assert handled == [1]
+    updates.stop()
+    assert not fake_root.timers
+
+
+def test_events_are_handled_in_order_across_frames(fake_root):
+    updates = UiUpdateQueue(fake_root, max_events_per_frame=2)
+    handled = []
+    updates.register("event", handled.append)
+    for i in range(5):
+        updates.post("event", i)
+    for _ in range(3):
+        fake_root.run_next()
+    assert handled == [0, 1, 2, 3, 4]
+
+
+def test_failing_handler_does_not_stop_the_loop(fake_root):
+    updates = UiUpdateQueue(fake_root)
+    updates.register("bad", lambda: 1 / 0)
+    updates.post("bad")
+    fake_root.run_next()
+    assert len(fake_root.timers) == 1
@@ -0,0 +1,100 @@
+"""Named timing profiles for the sequence engine
+
+A profile sets the fixed waits inside each step:
+    move_duration     mouse move animation (seconds)
+    focus_settle      wait after the click so the target can take focus
+    clipboard_settle  wait after writing the clipboard, before pasting
+    pre_enter         wait between paste and Enter
+    input_pause       pause pyautogui adds after every call (pyautogui.PAUSE)
+    move_speed        if > 0, moves take distance / move_speed seconds (pixels
+                      per second) instead of a fixed move_duration; the first
+                      move of a run still uses move_duration
+
+Profiles live in the config under "timing_profiles" and are merged over the
+built-in ones. A coordinate can override any field with a "timing" object,
+e.g. {"name": "Slow app", ..., "timing": {"focus_settle": 0.5}}.
+"""
+import math
+from collections import namedtuple
+
+TIMING_FIELDS = ("move_duration", "focus_settle", "clipboard_settle", "pre_enter", "input_pause", "move_speed")
+
+# Per-step wait fields (input_pause is global for a run)
+STEP_TIMING_FIELDS = TIMING_FIELDS[:4]
+
+
+class TimingProfile(namedtuple("TimingProfile", TIMING_FIELDS)):
+    """Waits used for every step of a run"""
+
+    __slots__ = ()
+
+    def to_dict(self):
+        return dict(self._asdict())
+
+
+DEFAULT_PROFILE_NAME = "normal"
+
+# "normal" matches the historical hardcoded values
+BUILTIN_PROFILES = {
+    "safe": TimingProfile(move_duration=0.6, focus_settle=0.4, clipboard_settle=0.2, pre_enter=0.2, input_pause=0.1,
+                          move_speed=0.0),
+    "normal": TimingProfile(move_duration=0.5, focus_settle=0.2, clipboard_settle=0.1, pre_enter=0.1, input_pause=0.05,
+                            move_speed=0.0),
+    "turbo": TimingProfile(move_duration=0.0, focus_settle=0.05, clipboard_settle=0.02, pre_enter=0.02, input_pause=0.0,
+                           move_speed=0.0),
+}
+
+
+def _read_seconds(values, field, default, context):
+    value = values.get(field, default)
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        units = "pixels per second" if field == "move_speed" else "seconds"
+        raise ValueError(f"{context}: '{field}' must be a number of {units}")
+    if not math.isfinite(value):
+        raise ValueError(f"{context}: '{field}' must be a finite number")
+    if value < 0:
+        raise ValueError(f"{context}: '{field}' cannot be negative")
+    return value
+
+
+def profile_from_dict(values, base=None, context="timing profile"):
+    """Build a TimingProfile from a dict, filling missing fields from base"""
+    base = base or BUILTIN_PROFILES[DEFAULT_PROFILE_NAME]
+    if not isinstance(values, dict):
+        raise ValueError(f"{context} must be an object")
+    return TimingProfile(*(_read_seconds(values, field, getattr(base, field), context)
+                           for field in TIMING_FIELDS))
+
+
+def load_profiles(config):
+    """Return {name: TimingProfile} with config profiles merged over the built-ins"""
+    profiles = dict(BUILTIN_PROFILES)
+    for name, values in (config.get("timing_profiles") or {}).items():
+        profiles[name] = profile_from_dict(values, profiles.get(name), f"Timing profile '{name}'")
+    return profiles
+
+
+def get_profile(config, name=None):
+    """Return the named (or the config's active) TimingProfile"""
+    profiles = load_profiles(config)
+    name = name or config.get("active_timing_profile") or DEFAULT_PROFILE_NAME
+    if name not in profiles:
+        raise ValueError(f"Unknown timing profile: {name}")
+    return profiles[name]
+
+
+def step_timing(profile, coord, context="coordinate"):
+    """Return the profile with the coordinate's "timing" overrides applied"""
+    overrides = coord.get("timing")
+    if not overrides:
+        return profile
+    return profile_from_dict(overrides, profile, context)
+
+
+def move_time(timing, distance=None):
+    """Seconds a move of distance pixels takes (distance None: unknown start point)"""
+    if timing.move_speed > 0 and distance is not None:
+        return distance / timing.move_speed
+    return timing.move_duration
@@ -0,0 +1,151 @@
+"""Span tracing for sequence runs
+
+A Tracer records spans (name, category, start, end, thread, args) with
+time.perf_counter_ns timestamps and exports them as Chrome trace JSON (open in
+chrome://tracing or https://ui.perfetto.dev) or as JSON Lines. The runner
+records a span for the run, the countdown, every pass of a batch and every
+step, with the step's phases (move, click, paste, ...) nested inside it.
+
+NullTracer has the same interface and records nothing; it is the default, so
+untraced runs pay only an attribute check per step.
+"""
+import json
+import os
+import threading
+import time
+from collections import deque
+
+# Timestamps are integer nanoseconds from this clock
+clock = time.perf_counter_ns
+
+
+class Tracer:
+    """Records spans in memory, keeping the most recent capacity spans"""
+
+    enabled = True
+
+    def __init__(self, capacity=500000):
+        self.capacity = capacity
+        self.origin = clock()
+        self.total = 0
+        self._spans = deque(maxlen=capacity)
+        self._thread_names = {}
+
+    def __len__(self):
+        return len(self._spans)
+
+    @property
+    def dropped(self):
+        """Number of spans discarded because the buffer was full"""
+        return self.total - len(self._spans)
+
+    def add(self, name, start, end, category="step", args=None):
+        """Record a span that ran from start to end (clock() values)"""
+        tid = threading.get_ident()
+        if tid not in self._thread_names:
+            self._thread_names[tid] = threading.current_thread().name
+        self._spans.append((name, category, start, end, tid, args))
+        self.total += 1
+
+    def span(self, name, category="run", **args):
+        """Context manager recording a span around a block"""
+        return _Span(self, name, category, args or None)
+
+    def clear(self):
+        """Forget every recorded span and restart the time origin"""
+        self._spans.clear()
+        self.total = 0
+        self.origin = clock()
+
+    def spans(self):
+        """Return the recorded spans as dicts, oldest first (times in ns from the origin)"""
+        origin = self.origin
+        names = self._thread_names
+        return [{"name": name, "cat": category, "start_ns": start - origin, "duration_ns": end - start,
+                 "thread": names.get(tid, str(tid)), "args": args or {}}
+                for name, category, start, end, tid, args in list(self._spans)]
+
+    def to_chrome_trace(self):
+        """Return the spans as a Chrome trace event dict (complete "X" events, times in µs)"""
+        pid = os.getpid()
+        origin = self.origin
+        events = [{"name": "process_name", "ph": "M", "pid": pid, "tid": 0,
+                   "args": {"name": "Multi Coordinates Clicker"}}]
+        events.extend({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+                      for tid, name in list(self._thread_names.items()))
+        for name, category, start, end, tid, args in list(self._spans):
+            event = {"name": name, "cat": category, "ph": "X", "pid": pid, "tid": tid,
+                     "ts": (start - origin) / 1000, "dur": (end - start) / 1000}
+            if args:
+                event["args"] = args
+            events.append(event)
+        return {"traceEvents": events, "displayTimeUnit": "ms",
+                "otherData": {"clock": "perf_counter_ns", "dropped_spans": self.dropped}}
+
+    def write_chrome_trace(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_chrome_trace(), f)
+
+    def write_jsonl(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            for span in self.spans():
+                f.write(json.dumps(span) + "\n")
+
+    def write(self, path):
+        """Export to path: JSON Lines for .jsonl files, Chrome trace JSON otherwise"""
+        if path.lower().endswith(".jsonl"):
+            self.write_jsonl(path)
+        else:
+            self.write_chrome_trace(path)
+
+
+class NullTracer:
+    """Tracer that records nothing"""
+
+    enabled = False
+    total = 0
+    dropped = 0
+
+    def __len__(self):
+        return 0
+
+    def add(self, name, start, end, category="step", args=None):
+        pass
+
+    def span(self, name, category="run", **args):
+        return _NULL_SPAN
+
+    def clear(self):
+        pass
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "category", "args", "start")
+
+    def __init__(self, tracer, name, category, args):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+        self.start = None
+
+    def __enter__(self):
+        self.start = clock()
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer.add(self.name, self.start, clock(), self.category, self.args)
+        return False
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
@@ -0,0 +1,62 @@
+class TreeSync:
+    """Keeps a flat ttk.Treeview in step with a list of rows keyed by stable ids
+
+    sync() compares the wanted rows with what the tree shows and only
+    inserts, moves, updates or deletes the items that differ, so editing one
+    row of a long list touches one Treeview item instead of rebuilding all of
+    them. Item ids (iids) are the row ids, which also keeps the selection on
+    the same row across moves.
+    """
+
+    def __init__(self, tree, tags=()):
+        self.tree = tree
+        self.tags = tags
+        # iid -> values last written to the tree
+        self._values = {}
+
+    def sync(self, rows):
+        """Make the tree show rows, a sequence of (iid, values); returns change counts"""
+        tree = self.tree
+        known = self._values
+        wanted = {iid for iid, _ in rows}
+        stats = {"inserted": 0, "moved": 0, "updated": 0, "deleted": 0}
+
+        current = tree.get_children()
+        stale = [iid for iid in current if iid not in wanted]
+        if stale:
+            tree.delete(*stale)
+            for iid in stale:
+                known.pop(iid, None)
+            stats["deleted"] = len(stale)
+            current = [iid for iid in current if iid in wanted]
+
+        # Invariant: the first `index` children are rows[:index], followed by the
+        # not yet placed items of `current` in their original order
+        placed = set()
+        position = 0
+        for index, (iid, values) in enumerate(rows):
+            while position < len(current) and current[position] in placed:
+                position += 1
+            if iid in known:
+                if position < len(current) and current[position] == iid:
+                    position += 1
+                else:
+                    tree.move(iid, "", index)
+                    stats["moved"] += 1
+                if known[iid] != values:
+                    tree.item(iid, values=values)
+                    known[iid] = values
+                    stats["updated"] += 1
+            else:
+                tree.insert("", index, iid=iid, values=values, tags=self.tags)
+                known[iid] = values
+                stats["inserted"] += 1
+            placed.add(iid)
+        return stats
+
+    def clear(self):
+        """Remove every row"""
+        children = self.tree.get_children()
+        if children:
+            self.tree.delete(*children)
+        self._values.clear()
@@ -0,0 +1,95 @@
+import queue
+import threading
+
+
+class UiUpdateQueue:
+    """Thread-safe queue of UI updates, drained on the Tk main loop
+
+    Worker threads never touch widgets or make any Tk call. They call post()
+    for events that must all be handled in order (e.g. "sequence finished")
+    and post_latest() for state where only the newest value matters (status
+    text, progress); the latter are coalesced so at most one update per key
+    is rendered per frame.
+
+    The drain loop runs on the Tk thread on a fixed root.after cadence for as
+    long as the queue exists, so a post never has to wake it.
+    """
+
+    def __init__(self, root, interval_ms=50, max_events_per_frame=200):
+        self.root = root
+        self.interval_ms = interval_ms
+        self.max_events_per_frame = max_events_per_frame
+        self._handlers = {}
+        self._drain_hooks = []
+        self._events = queue.Queue()
+        self._latest = {}
+        self._lock = threading.Lock()
+        self._timer = None
+        self.start()
+
+    def register(self, kind, handler):
+        """Set the Tk-thread handler for an update kind"""
+        self._handlers[kind] = handler
+
+    def add_drain_hook(self, hook):
+        """Call hook() on the Tk thread every frame; it returns True if it did work"""
+        self._drain_hooks.append(hook)
+
+    def post(self, kind, *args):
+        """Queue an update; every posted event is handled, in order"""
+        self._events.put((kind, args))
+
+    def post_latest(self, kind, *args):
+        """Queue an update that replaces any not-yet-rendered update of the same kind"""
+        with self._lock:
+            self._latest[kind] = args
+
+    def start(self):
+        """Start the drain loop (Tk thread only)"""
+        if self._timer is None:
+            self._timer = self.root.after(self.interval_ms, self._tick)
+
+    def _tick(self):
+        try:
+            self.drain()
+        finally:
+            self._timer = self.root.after(self.interval_ms, self._tick)
+
+    def drain(self):
+        """Handle pending updates now (Tk thread only); returns True if anything ran"""
+        with self._lock:
+            latest = self._latest
+            self._latest = {}
+        events = []
+        while len(events) < self.max_events_per_frame:
+            try:
+                events.append(self._events.get_nowait())
+            except queue.Empty:
+                break
+
+        did_work = bool(latest or events)
+        for kind, args in latest.items():
+            self._dispatch(kind, args)
+        for kind, args in events:
+            self._dispatch(kind, args)
+        for hook in self._drain_hooks:
+            try:
+                did_work = bool(hook()) or did_work
+            except Exception:
+                pass
+        return did_work
+
+    def _dispatch(self, kind, args):
+        handler = self._handlers.get(kind)
+        if handler is None:
+            return
+        try:
+            handler(*args)
+        except Exception:
+            pass
+
+    def stop(self):
+        """Cancel the drain loop (Tk thread only)"""
+        if self._timer is not None:
+            self.root.after_cancel(self._timer)
+            self._timer = None